@@ -0,0 +1,335 @@
+"""Benchmark ittools' core functions.
+
+Sweeps input size, nesting depth and width of each benchmark, recording the
+wall time (best of several repeats) and the peak memory allocated
+(measured by :mod:`tracemalloc` in a separate run).
+
+Results are compared against a JSON baseline. The run fails if a result
+got slower (or needs more memory) than the baseline by more than the
+threshold. If there is no baseline yet (or ``--save`` is passed), the
+results are saved to the baseline instead, replacing the results of the
+benchmarks run but keeping the others. A warning is printed if the
+baseline was recorded on another python version or machine.
+
+Run it using nox::
+
+    nox -s benchmarks
+    nox -s benchmarks -- --save
+    nox -s benchmarks -- --threshold 0.5 --filter depth
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+
+import ittools
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+# differences below these are considered noise:
+MIN_SECONDS = 1e-4
+MIN_BYTES = 4096
+
+BENCHMARKS = {}
+
+
+def benchmark(**sweep):
+    """Register a benchmark run for each combination of the sweep values.
+
+    Parameters
+    ----------
+    sweep: list
+        Parameter values to be swept over, passed as keyword arguments to
+        the decorated setup function.
+
+    Returns
+    -------
+    ~collections.abc.Callable
+        Decorator registering a setup function, that returns the callable
+        to be measured.
+    """
+
+    def register(setup):
+        names = list(sweep)
+        for values in product(*sweep.values()):
+            params = dict(zip(names, values))
+            label = ",".join(f"{name}={value}" for name, value in params.items())
+            BENCHMARKS[f"{setup.__name__}[{label}]"] = (setup, params)
+        return setup
+
+    return register
+
+
+def nested(depth, width, leaf=0):
+    """Return nested lists of depth, each one holding width items.
+
+    Parameters
+    ----------
+    depth: int
+        The nesting depth.
+    width: int
+        The number of items per list.
+    leaf
+        The innermost items.
+
+    Returns
+    -------
+    list
+        The nested lists.
+    """
+    nest = leaf
+    for _ in range(depth):
+        nest = [nest] * width
+    return nest
+
+
+# (depth, width) combinations of roughly 10**4 to 10**6 leafs:
+SHAPES = [(1, 10**5), (2, 1000), (4, 30), (8, 5), (1000, 1)]
+
+
+@benchmark(shape=SHAPES)
+def depth(shape):
+    """Measure the depth of nested lists."""
+    data = nested(*shape)
+    return lambda: ittools.depth(data)
+
+
+@benchmark(size=[10, 1000], count=[100])
+def depth_arrays(size, count):
+    """Measure the depth of lists of arrays."""
+    data = [np.zeros((size, size)) for _ in range(count)]
+    return lambda: ittools.depth(data)
+
+
+@benchmark(shape=SHAPES)
+def nestify(shape):
+    """Nest nested lists two levels deeper."""
+    data = nested(*shape)
+    return lambda: ittools.nestify(data, shape[0] + 2)
+
+
+@benchmark(size=[10**3, 10**5], passthrough=[False, True])
+def itrify(size, passthrough):
+    """Itrify arrays."""
+    data = np.arange(size)
+    return lambda: ittools.itrify(data, passthrough=passthrough)
+
+
+@benchmark(size=[10**3, 10**5])
+def itrify_many(size):
+    """Itrify many scalars, strings and iterables."""
+    data = [1, "a", (1,), {1}] * (size // 4)
+    return lambda: ittools.itrify_many(data, passthrough=True)
+
+
+@benchmark(shape=SHAPES)
+def is_empty(shape):
+    """Check nested empty lists for emptiness."""
+    data = nested(shape[0] - 1, shape[1], leaf=[]) if shape[0] > 1 else []
+    return lambda: ittools.is_empty(data)
+
+
+@benchmark(size=[10**3, 10**5])
+def stringcrementor(size):
+    """Increment strings."""
+
+    def run():
+        strings = ittools.Stringcrementor("Category")
+        for _ in range(size):
+            next(strings)
+
+    return run
+
+
+@benchmark(size=[10**3, 10**5])
+def stringcrementor_take(size):
+    """Take and materialize ranges of incremented strings."""
+    return lambda: list(ittools.Stringcrementor("Category").take(size))
+
+
+@benchmark(size=[10**3, 10**5])
+def enum_to_2dix(size):
+    """Map enumerations onto 2D indices one by one."""
+    shape = (size // 100, 100)
+    return lambda: [ittools.enum_to_2dix(i, shape) for i in range(size)]
+
+
+@benchmark(size=[10**3, 10**5])
+def index2d(size):
+    """Iterate over all indices of an Index2D."""
+    index = ittools.Index2D((size // 100, 100))
+    return lambda: list(index)
+
+
+@benchmark(size=[10**3, 10**6])
+def enum_to_2dix_batch(size):
+    """Map enumerations onto 2D indices vectorized."""
+    shape = (size // 100, 100)
+    return lambda: ittools.enum_to_2dix_batch(range(size), shape)
+
+
+@benchmark(size=[10**3, 10**5], chunks=[2, 16])
+def zip_split(size, chunks):
+    """Split a list into interleaved chunks."""
+    data = list(range(size))
+    return lambda: [list(chunk) for chunk in ittools.zip_split(data, chunks)]
+
+
+@benchmark(size=[10**3, 10**5], chunks=[2, 16])
+def group(size, chunks):
+    """Split a list into consecutive chunks."""
+    data = list(range(size))
+    return lambda: list(ittools.group(data, chunks))
+
+
+@benchmark(size=[10**3, 10**5])
+def group_stream(size):
+    """Split an iterator into chunks of size 10."""
+    return lambda: list(ittools.group(iter(range(size)), size=10, pad=False))
+
+
+@benchmark(size=[10**3, 10**5], width=[4, 64])
+def window(size, width):
+    """Slide overlapping windows over an iterator."""
+    return lambda: list(ittools.window(iter(range(size)), width))
+
+
+@benchmark(size=[10**3, 10**6], width=[4, 64])
+def window_array(size, width):
+    """Slide overlapping windows over an array."""
+    data = np.arange(size)
+    return lambda: ittools.window(data, width, step=2)
+
+
+def measure(setup, params, repeat):
+    """Measure wall time and peak memory of a benchmark.
+
+    Parameters
+    ----------
+    setup: ~collections.abc.Callable
+        The benchmark's setup function.
+    params: dict
+        Parameters passed to :paramref:`~measure.setup`.
+    repeat: int
+        Number of timed runs, the fastest one is reported.
+
+    Returns
+    -------
+    dict
+        ``seconds`` and peak memory in ``bytes``.
+    """
+    run = setup(**params)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(timings), "bytes": peak}
+
+
+def regressions(results, baseline, threshold):
+    """Compare results against a baseline.
+
+    Parameters
+    ----------
+    results: dict
+        Results per benchmark, as returned by :func:`measure`.
+    baseline: dict
+        Results per benchmark of the baseline.
+    threshold: float
+        Relative increase tolerated.
+
+    Returns
+    -------
+    list
+        Descriptions of the regressions found.
+    """
+    found = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric, noise in (("seconds", MIN_SECONDS), ("bytes", MIN_BYTES)):
+            new, old = result[metric], baseline[name][metric]
+            if new > old * (1 + threshold) and new - old > noise:
+                found.append(f"{name}: {metric} {old:.6g} -> {new:.6g}")
+    return found
+
+
+def main(argv=None):
+    """Run the benchmarks, compare or save them.
+
+    Parameters
+    ----------
+    argv: list, None
+        Command line arguments, defaults to :data:`sys.argv`.
+
+    Returns
+    -------
+    int
+        Exit code, 1 if regressions were found.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--save", action="store_true", help="save results as new baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="tolerated relative increase (default: 0.25)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--filter", default="", help="only run benchmarks containing this"
+    )
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, (setup, params) in BENCHMARKS.items():
+        if args.filter in name:
+            results[name] = measure(setup, params, args.repeat)
+            print(
+                f"{name:<50} {results[name]['seconds'] * 1e3:10.3f} ms"
+                f" {results[name]['bytes'] / 1024:10.1f} KiB"
+            )
+
+    environment = {"python": platform.python_version(), "machine": platform.machine()}
+    saved = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    for key, value in environment.items():
+        if saved.get(key, value) != value:
+            print(f"WARNING baseline was recorded on {key} {saved[key]}, not {value}")
+
+    if args.save or not saved:
+        # keep the results of benchmarks not run (i.e. filtered out)
+        saved = {
+            **environment,
+            "ittools": ittools.__version__,
+            "results": {**saved.get("results", {}), **results},
+        }
+        args.baseline.write_text(json.dumps(saved, indent=2) + "\n")
+        print(f"saved baseline to {args.baseline}")
+        return 0
+
+    found = regressions(results, saved["results"], args.threshold)
+    for regression in found:
+        print(f"REGRESSION {regression}")
+    print(f"{len(found)} regressions (threshold {args.threshold:.0%})")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -49,7 +49,7 @@ def tests(session):
         "not e2e and not con and not slow",
         # append exlcuded markers as "and not ..."
     ]
-    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("poetry", "install", "--no-dev", "--extras", "pandas", external=True)
     session.install(
         "coverage[toml]",
         "pytest",
@@ -59,8 +59,24 @@ def tests(session):
     session.run("pytest", *args)
 
 
+@nox_poetry.session(python="3.10")
+def benchmarks(session):
+    """Run benchmark suite, failing on regressions against the baseline."""
+    session.run(
+        "poetry",
+        "install",
+        "--no-dev",
+        "--extras",
+        "pandas",
+        "--extras",
+        "numpy",
+        external=True,
+    )
+    session.run("python", "benchmarks/run.py", *session.posargs)
+
+
 # locations to run linting and formatting on:
-locations = "src", "tests", "noxfile.py", "docs/conf.py"
+locations = "src", "tests", "benchmarks", "noxfile.py", "docs/conf.py"
 
 
 @nox_poetry.session(python="3.10")
@@ -88,7 +104,7 @@ def lint(session):
 def pylint(session):
     """Lint using pylint."""
     args = session.posargs or locations
-    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("poetry", "install", "--no-dev", "--extras", "pandas", external=True)
     session.install(
         "pytest",
         "requests",
@@ -111,7 +127,7 @@ def black(session):
 def xdoctest(session):
     """Run examples with xdoctest."""
     args = session.posargs or ["all"]
-    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("poetry", "install", "--no-dev", "--extras", "pandas", external=True)
     session.install("xdoctest", "pygments")
     session.run("python", "-m", "xdoctest", "ittools", *args)
 
@@ -119,7 +135,7 @@ def xdoctest(session):
 @nox_poetry.session(python="3.10")
 def docs(session):
     """Build the documentation."""
-    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("poetry", "install", "--no-dev", "--extras", "pandas", external=True)
     session.install(
         "sphinx",
         "sphinx-click",
@@ -135,7 +151,7 @@ def docs(session):
 def docs_live(session):
     """Build and serve the documentation with live reloading on changes."""
     args = session.posargs or ["--open-browser", "docs", "docs/_build"]
-    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("poetry", "install", "--no-dev", "--extras", "pandas", external=True)
     session.install(
         "sphinx",
         "sphinx-autobuild",
@@ -156,7 +172,7 @@ def docs_live(session):
 @nox_poetry.session(python="3.10")
 def docs_rebuild(session):
     """Rebuild the entire sphinx documentation."""
-    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("poetry", "install", "--no-dev", "--extras", "pandas", external=True)
     session.install(
         "sphinx",
         "sphinx-click",
@@ -191,7 +207,7 @@ def codecov(session):
 def precommit(session):
     """Lint using pre-commit."""
     args = session.posargs or ["run", "--all-files", "--show-diff-on-failure"]
-    session.run("poetry", "install", "--no-dev", external=True)
+    session.run("poetry", "install", "--no-dev", "--extras", "pandas", external=True)
     session.install(
         "darglint",
         "black",
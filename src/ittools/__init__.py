@@ -1,18 +1,43 @@
-# src/ittools/__init__.py
 # flake8: noqa
 """ittools - A colletion of iterable utilites."""
-from importlib.metadata import version
-
 from .core import (
+    Batcher,
+    DepthCache,
     Index2D,
+    IndexND,
+    PersistentStringcrementor,
+    SharedStringcrementor,
     Stringcrementor,
+    StringRange,
     depth,
     enum_to_2dix,
+    enum_to_2dix_batch,
+    first_nonempty,
+    flatten,
     group,
+    group_array,
     is_empty,
     itrify,
+    itrify_many,
     nestify,
+    profile,
+    register_depth,
+    register_itrify,
+    unflatten,
+    window,
     zip_split,
+    zip_split_into,
+    zip_split_stream,
 )
+from .parallel import parallel_map_chunks
+
+
+def __getattr__(name):
+    """Determine ``__version__`` lazily, to keep ``import ittools`` fast."""
+    if name == "__version__":
+        # pylint: disable=import-outside-toplevel
+        from importlib.metadata import version
 
-__version__ = version(__name__)
+        globals()["__version__"] = version(__name__)
+        return globals()["__version__"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,327 @@
+"""Asynchronous counterparts of ittools' splitters.
+
+Works on :class:`~collections.abc.AsyncIterable` sources, i.e. async
+generators or database drivers of asyncio based services. Not imported by
+``import ittools`` (to keep :mod:`asyncio` out of the startup time), use
+``from ittools import aio`` instead.
+
+.. autosummary::
+   :nosignatures:
+
+   zip_split
+   group
+   batch
+"""
+
+import asyncio
+import contextlib
+from itertools import cycle
+
+_DONE = object()
+_LATE = object()
+
+
+async def zip_split(aiterable, consumers, maxsize=1):
+    """Fan an async iterable out round-robin onto consumer coroutines.
+
+    Asynchronous counterpart of :func:`ittools.zip_split_stream`: item ``i``
+    of :paramref:`~zip_split.aiterable` is handed to consumer
+    ``i % len(consumers)``. Items are passed through bounded
+    :class:`asyncio.Queue` objects, so slow consumers apply backpressure on
+    the source.
+
+    Consumers returning early stop receiving items (their items are dropped).
+    Once all consumers returned, the source is not read any further. If a
+    consumer raises, all others (and the source) are cancelled.
+
+    Parameters
+    ----------
+    aiterable: ~collections.abc.AsyncIterable
+        The async iterable to be distributed.
+    consumers: ~collections.abc.Sequence
+        Sequence of coroutine functions each called with an async iterator
+        over its share of the items.
+    maxsize: int, default=1
+        Maximum number of items queued per consumer.
+
+    Returns
+    -------
+    list
+        The consumers' return values, in the order of
+        :paramref:`~zip_split.consumers`.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> from ittools import aio
+    >>> async def source():
+    ...     for i in range(10):
+    ...         yield i
+    >>> async def consume(items):
+    ...     return [item async for item in items]
+    >>> asyncio.run(aio.zip_split(source(), [consume, consume, consume]))
+    [[0, 3, 6, 9], [1, 4, 7], [2, 5, 8]]
+    """
+    queues = [asyncio.Queue(maxsize) for _ in consumers]
+    closed = [False] * len(queues)
+    exhausted = [False]
+
+    producer = asyncio.ensure_future(_produce(aiterable, queues, closed, exhausted))
+    tasks = [
+        asyncio.ensure_future(_consume(consumer, queues, closed, index))
+        for index, consumer in enumerate(consumers)
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in (producer, *tasks):
+            task.cancel()
+        raise
+
+    if exhausted[0]:
+        await producer  # raises errors of the source
+    else:  # all consumers returned early
+        producer.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await producer
+    return results
+
+
+async def _produce(aiterable, queues, closed, exhausted):
+    """Distribute the items of an async iterable round-robin onto queues.
+
+    Parameters
+    ----------
+    aiterable: ~collections.abc.AsyncIterable
+        The async iterable to be distributed.
+    queues: list
+        The consumers' :class:`asyncio.Queue` objects.
+    closed: list
+        Flags of the consumers that returned, their items are dropped.
+    exhausted: list
+        Single flag, set once the source is exhausted (or raised).
+    """
+    error = None
+    try:
+        outputs = cycle(range(len(queues)))
+        async for item in aiterable:
+            index = next(outputs)
+            if not closed[index]:
+                await queues[index].put(item)
+    except Exception as exception:  # pylint: disable=broad-except
+        error = exception  # let consumers finish first, raise afterwards
+
+    exhausted[0] = True
+    for index, queue in enumerate(queues):
+        if not closed[index]:
+            await queue.put(_DONE)
+    if error is not None:
+        raise error
+
+
+async def _consume(consumer, queues, closed, index):
+    """Run a consumer on its queue, closing the queue once it returns.
+
+    Parameters
+    ----------
+    consumer: ~collections.abc.Callable
+        Coroutine function called with an async iterator over its items.
+    queues: list
+        The consumers' :class:`asyncio.Queue` objects.
+    closed: list
+        Flags of the consumers that returned.
+    index: int
+        Index of :paramref:`~_consume.consumer`.
+
+    Returns
+    -------
+    object
+        The consumer's return value.
+    """
+    try:
+        return await consumer(_drain(queues[index]))
+    finally:
+        closed[index] = True
+        while not queues[index].empty():  # unblock a waiting producer
+            queues[index].get_nowait()
+
+
+async def _drain(queue):
+    """Yield the items of a queue until the end of the stream is reached.
+
+    Parameters
+    ----------
+    queue: asyncio.Queue
+        Queue to be drained.
+
+    Yields
+    ------
+    object
+        The queued items.
+    """
+    while True:
+        item = await queue.get()
+        if item is _DONE:
+            return
+        yield item
+
+
+async def group(aiterable, size, fillvalue=None, pad=True):
+    """Split an async iterable into chunks of size.
+
+    Asynchronous counterpart of :func:`ittools.group` grouping by chunk size.
+
+    Parameters
+    ----------
+    aiterable: ~collections.abc.AsyncIterable
+        The async iterable to split into groups.
+    size: int
+        The number of items per group.
+    fillvalue: ~numbers.Number, None, default = None
+        The last chunk is filled with this in case the number of items in
+        :paramref:`~group.aiterable` is not an integer multiple of
+        :paramref:`~group.size`
+    pad: bool, default=True
+        If ``False``, the last chunk is left short instead of being filled
+        with :paramref:`~group.fillvalue`.
+
+    Yields
+    ------
+    tuple
+        The groups.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> from ittools import aio
+    >>> async def source():
+    ...     for i in range(10):
+    ...         yield i
+    >>> async def main():
+    ...     return [chunk async for chunk in aio.group(source(), 4)]
+    >>> asyncio.run(main())
+    [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9, None, None)]
+    """
+    chunk = []
+    async for item in aiterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield tuple(chunk)
+            chunk = []
+
+    if chunk:
+        if pad:
+            chunk.extend([fillvalue] * (size - len(chunk)))
+        yield tuple(chunk)
+
+
+async def batch(  # pylint: disable=too-many-arguments
+    aiterable, size, latency, max_weight=None, weigher=len
+):
+    """Split an async iterable into batches bounded by size, weight and latency.
+
+    Asynchronous counterpart of :class:`ittools.Batcher`: a batch is yielded
+    as soon as it holds :paramref:`~batch.size` items, reaches
+    :paramref:`~batch.max_weight` or :paramref:`~batch.latency` seconds
+    passed since its first item arrived, whichever comes first. Waiting for
+    the latency does not cancel reading the source.
+
+    Parameters
+    ----------
+    aiterable: ~collections.abc.AsyncIterable
+        The async iterable to split into batches.
+    size: int
+        Maximum number of items per batch.
+    latency: float
+        Maximum number of seconds an item waits for its batch being yielded.
+    max_weight: ~numbers.Number, None, default=None
+        Maximum total weight of a batch (i.e. a byte budget). An item that
+        would exceed it starts a new batch. If None, weight is not tracked.
+    weigher: ~collections.abc.Callable, default=len
+        Callable returning the weight of an item.
+
+    Yields
+    ------
+    list
+        The batches.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> from ittools import aio
+    >>> async def source():
+    ...     for i in range(5):
+    ...         yield i
+    ...     await asyncio.sleep(0.2)
+    ...     yield 5
+    >>> async def main():
+    ...     return [chunk async for chunk in aio.batch(source(), 3, 0.05)]
+    >>> asyncio.run(main())
+    [[0, 1, 2], [3, 4], [5]]
+    """
+    loop = asyncio.get_running_loop()
+    iterator = aiterable.__aiter__()
+    chunk, weight, deadline = [], 0, None
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            item = await _wait(pending, deadline, loop)
+            if item is _LATE:  # latency exceeded, keep waiting for the item
+                yield chunk
+                chunk, weight, deadline = [], 0, None
+                continue
+
+            pending = None
+            if item is _DONE:
+                break
+
+            item_weight = 0 if max_weight is None else weigher(item)
+            if chunk and max_weight is not None and weight + item_weight > max_weight:
+                yield chunk
+                chunk, weight, deadline = [], 0, None
+
+            chunk.append(item)
+            weight += item_weight
+            if deadline is None:
+                deadline = loop.time() + latency
+            if len(chunk) >= size or (max_weight is not None and weight >= max_weight):
+                yield chunk
+                chunk, weight, deadline = [], 0, None
+
+        if chunk:
+            yield chunk
+    finally:
+        if pending is not None:
+            pending.cancel()
+            with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+                await pending
+
+
+async def _wait(pending, deadline, loop):
+    """Wait for a pending read of an async iterator, at most until deadline.
+
+    Parameters
+    ----------
+    pending: asyncio.Future
+        The pending ``__anext__`` call.
+    deadline: float, None
+        Event loop time to wait until. If None, wait for the read.
+    loop: asyncio.AbstractEventLoop
+        The running event loop.
+
+    Returns
+    -------
+    object
+        The item read, ``_DONE`` if the iterator is exhausted or ``_LATE``
+        if the deadline passed first (the read stays pending).
+    """
+    timeout = None if deadline is None else max(deadline - loop.time(), 0)
+    done, _ = await asyncio.wait({pending}, timeout=timeout)
+    if not done:
+        return _LATE
+    try:
+        return pending.result()
+    except StopAsyncIteration:
+        return _DONE
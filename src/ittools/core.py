@@ -8,32 +8,68 @@ functionalities.
    :nosignatures:
 
    depth
+   register_depth
+   profile
+   flatten
+   unflatten
    nestify
+   DepthCache
    itrify
+   itrify_many
+   register_itrify
    is_empty
+   first_nonempty
    Stringcrementor
+   SharedStringcrementor
+   PersistentStringcrementor
+   StringRange
    enum_to_2dix
+   enum_to_2dix_batch
    Index2D
+   IndexND
    zip_split
+   zip_split_stream
+   zip_split_into
    group
+   group_array
+   window
+   Batcher
 """
 
 import collections
 import logging
 import math
-from itertools import zip_longest
-
-from pandas import Series
+import mmap
+import operator
+import os
+import struct
+import sys
+import threading
+import time
+import weakref
+from itertools import chain, cycle, islice, product, repeat, zip_longest
+
+from .instrument import _METRICS
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # windows, checkpoint files are not locked there
 
 logger = logging.getLogger(__name__)
 
 
-def depth(arg, exclude=None):  # noqa: C901
+def depth(arg, exclude=None, limit=None):
     r"""Powerfull function to determine depth of iterable.
 
-    Credit goes to:
+    Originally inspired by:
     https://stackoverflow.com/a/35698158
 
+    The traversal is iterative (using an explicit work stack instead of
+    recursion), so arbitrarily deep nestings can be measured without hitting
+    the interpreter's recursion limit. Objects referencing one of their own
+    ancestors (cycles) are treated as leafs.
+
     Parameters
     ----------
     arg : ~collections.abc.Iterable
@@ -43,10 +79,16 @@ def depth(arg, exclude=None):  # noqa: C901
         Iterable of iterable types that should be ignored.
         If None, str are excluded.
 
+    limit : int, default=None
+        Stop traversing as soon as a depth of at least ``limit`` is found and
+        return ``limit``. Useful for cheaply asking whether
+        :paramref:`~depth.arg` is nested at least ``limit`` levels deep.
+        If None, the full depth is determined.
+
     Returns
     -------
     int
-        Depth of :paramref:`depth.arg`
+        Depth of :paramref:`depth.arg` (capped at :paramref:`~depth.limit`)
 
     Example
     -------
@@ -57,39 +99,589 @@ def depth(arg, exclude=None):  # noqa: C901
 
     >>> depth([[2, 2], [2, (3, 3)], 1], exclude=(tuple,))
     2
+
+    Self referencing iterables do not loop endlessly:
+
+    >>> cycle = [1, 2]
+    >>> cycle.append(cycle)
+    >>> depth(cycle)
+    1
+
+    Using limit to check for a minimum depth without a full traversal:
+
+    >>> depth([[2, 2], [2, [3, 3]], 1], limit=2)
+    2
+    """
+    if _METRICS.enabled:
+        with _METRICS.record("depth") as call:
+            result, call["nodes"] = _depth(arg, exclude, limit)
+        return result
+    return _depth(arg, exclude, limit)[0]
+
+
+def _depth(arg, exclude, limit):
+    """Determine the depth of arg and the number of containers visited.
+
+    Parameters
+    ----------
+    arg : ~collections.abc.Iterable
+        See :paramref:`depth.arg`.
+    exclude : ~collections.abc.Iterable, None
+        See :paramref:`depth.exclude`.
+    limit : int, None
+        See :paramref:`depth.limit`.
+
+    Returns
+    -------
+    tuple
+        Depth of :paramref:`~_depth.arg` and the number of containers
+        visited.
     """
-    # complexity > 12; tolerable here
     if exclude is None:
         exclude = (str,)
+    exclude = tuple(exclude)
+    if limit is None:
+        limit = math.inf
+
+    children = _children(arg, exclude)
+    if children is None:
+        return 0, 0
+    if isinstance(children, int):
+        return min(children, limit), 0
+    if limit <= 1:
+        return limit, 1
+
+    return _walk_depth(arg, children, exclude, limit)
+
+
+# exact types that are known to not be iterable (so depth 0):
+_SCALAR_TYPES = frozenset((int, float, complex, bool, type(None)))
+# exact container types of which emptiness can be checked using bool():
+_SIZED_TYPES = frozenset((list, tuple, dict, set, frozenset))
+_NOTHING = object()
+# seconds zip_split_stream grants a thread to start reading a lagging output:
+_STREAM_GRACE = 1.0
+
 
-    if isinstance(arg, tuple(exclude)):
+def _children(obj, exclude):
+    """Return an iterator over obj's children, None if empty or its leaf depth.
+
+    Parameters
+    ----------
+    obj
+        Object of which the children are to be iterated over.
+
+    exclude : tuple
+        Tuple of iterable types that should be treated as leafs.
+
+    Returns
+    -------
+    ~collections.abc.Iterator, int, None
+        Iterator over the nested children of :paramref:`~_children.obj`,
+        None if it is an empty iterable (which doesn't add depth) or its
+        depth in case it is a leaf (i.e. as known by :func:`register_depth`).
+    """
+    if isinstance(obj, exclude):
         return 0
 
+    known = _known_depth(obj, exclude)
+    if known is not None:
+        return known
+
     try:
-        if next(iter(arg)) is arg:  # avoid infinite loops
-            return 1
+        iterator = iter(obj)
     except TypeError:
         return 0
 
-    try:  # pragma: no cover
-        # coverage is excluded here, cause this part definetly gets
-        # executed and tested. I might be overlooking something,
-        # or pytest has coverage issues with rersive functions
-        depths_in = map(lambda x: depth(x, exclude), arg.values())
-    except AttributeError:
-        try:
-            depths_in = map(lambda x: depth(x, exclude), arg)
+    first = next(iterator, _NOTHING)
+    if first is _NOTHING:
+        return None
+    if first is obj:  # avoid infinite loops
+        return 1
 
-        except TypeError:  # pragma: no cover
-            # print("Could not provoke this Error!")
-            return 0
+    values = getattr(obj, "values", None)
+    if callable(values):
+        return iter(values())
 
-    try:
-        depth_in = max(depths_in)
-    except ValueError:
-        depth_in = 0
+    # don't loose the first element on one-shot iterators
+    return chain((first,), iterator)
+
+
+def _known_depth(obj, exclude):
+    """Return the depth of obj as registered by :func:`register_depth`.
+
+    Parameters
+    ----------
+    obj
+        Object of which the depth is looked up.
+
+    exclude : tuple
+        Tuple of iterable types that should be treated as leafs.
+
+    Returns
+    -------
+    int, None
+        The depth or None if it is not known without iterating.
+    """
+    handler = _DEPTHS[type(obj)]
+    if handler is None or isinstance(handler, int):
+        return handler
+    return handler(obj, exclude)
+
+
+def _walk_depth(root, children, exclude, limit, survey=None):  # noqa: C901
+    """Determine the depth of root using an explicit work stack.
+
+    Parameters
+    ----------
+    root : ~collections.abc.Iterable
+        Non-empty iterable of which nested depth is to be determined
+
+    children : ~collections.abc.Iterator
+        Iterator over the children of :paramref:`~_walk_depth.root`
+
+    exclude : tuple
+        Tuple of iterable types that should be treated as leafs.
+
+    limit : ~numbers.Number
+        Depth at which the traversal is stopped early.
+
+    survey : _Survey, default=None
+        Reported every leaf, empty iterable and container visited, if given.
+
+    Returns
+    -------
+    tuple
+        Depth of :paramref:`~_walk_depth.root` (capped at
+        :paramref:`~_walk_depth.limit`) and the number of containers
+        visited.
+    """
+    # complexity > 10; tolerable here, since it is the hot loop
+    leafs = set(_SCALAR_TYPES)
+    leafs.update(kind for kind in (str, bytes) if issubclass(kind, exclude))
+    # exact builtin containers not excluded get iterated without further ado
+    plain = {kind for kind in (list, tuple, dict) if not issubclass(kind, exclude)}
+
+    # each frame: [children iterator, id of the iterated object, max depth of
+    # children]. The root's depth is at least the number of frames on stack.
+    stack = [[children, id(root), 0]]
+    active = {id(root)}  # ids on the current path, for cycle detection
+    visited = 1
+
+    while True:
+        frame = stack[-1]
+        deepest = frame[2]
+        for child in frame[0]:
+            kind = type(child)
+            if kind in leafs or id(child) in active:
+                if survey is not None:
+                    survey.leaf(child, len(stack))
+                continue
+
+            if kind in plain:
+                if not child:
+                    if survey is not None:
+                        survey.empty(len(stack))
+                    continue
+                sub = iter(child.values()) if kind is dict else iter(child)
+
+            else:
+                sub = _children(child, exclude)
+                if sub is None:
+                    if survey is not None:
+                        survey.empty(len(stack))
+                    continue
+                if isinstance(sub, int):
+                    if survey is not None:
+                        survey.leaf(child, len(stack), sub)
+                    deepest = max(deepest, sub)
+                    if len(stack) + deepest >= limit:
+                        return limit, visited
+                    continue
+
+            # descend into child
+            frame[2] = deepest
+            active.add(id(child))
+            stack.append([sub, id(child), 0])
+            visited += 1
+            if survey is not None:
+                survey.enter()
+            if len(stack) >= limit:
+                return limit, visited
+            break
+
+        else:  # children exhausted, ascend
+            stack.pop()
+            active.discard(frame[1])
+            if survey is not None:
+                survey.exit(len(stack))
+            result = deepest + 1
+            if not stack:
+                return result, visited
+            stack[-1][2] = max(stack[-1][2], result)
+
+
+Profile = collections.namedtuple(
+    "Profile", ("depth", "empty", "leaves", "regular", "shape", "leaf_types")
+)
+Profile.__doc__ = """Structural properties of a nested object, as returned by :func:`profile`.
+
+Attributes
+----------
+depth: int
+    Depth as returned by :func:`depth`.
+empty: bool
+    ``True`` if there are no leafs at all.
+leaves: int
+    Number of leafs.
+regular: bool
+    ``True`` if the nesting is rectangular, i.e. all containers on the same
+    level have the same length and all leafs are on the same level.
+shape: tuple, None
+    Container lengths per level (like :attr:`numpy.ndarray.shape`), None if
+    not regular.
+leaf_types: frozenset
+    Types of the leafs.
+"""
+
+
+def profile(obj, exclude=None):
+    """Determine depth, emptiness, leaf count and shape in a single pass.
+
+    Equivalent to calling :func:`depth`, checking for leafs, counting them
+    and determining the nested shape, but traverses
+    :paramref:`~profile.obj` only once (iteratively, see :func:`depth`).
+
+    Objects of which the depth is known without iterating (see
+    :func:`register_depth`, i.e. :class:`numpy.ndarray`) are not traversed
+    but count as a single leaf of that depth.
+
+    Parameters
+    ----------
+    obj
+        Object to be profiled.
+
+    exclude : ~collections.abc.Iterable, default=None
+        Iterable of iterable types that should be treated as leafs.
+        If None, str are excluded. See :paramref:`depth.exclude`.
+
+    Returns
+    -------
+    Profile
+        Named tuple of ``depth``, ``empty``, ``leaves``, ``regular``,
+        ``shape`` and ``leaf_types``.
+
+    Examples
+    --------
+    >>> profile([[1, 2, 3], [4, 5, 6]])
+    Profile(depth=2, empty=False, leaves=6, regular=True, shape=(2, 3), leaf_types=frozenset({<class 'int'>}))
+
+    >>> result = profile([[1, 'a'], [2, [3]]])
+    >>> result.depth, result.leaves, result.regular, result.shape
+    (3, 4, False, None)
+
+    Empty containers are regular but don't add to the depth (like
+    :func:`depth`):
+
+    >>> profile([[], []])
+    Profile(depth=1, empty=True, leaves=0, regular=True, shape=(2, 0), leaf_types=frozenset())
+    """
+    if exclude is None:
+        exclude = (str,)
+    exclude = tuple(exclude)
+
+    survey = _Survey()
+    children = _children(obj, exclude)
+    if children is None:
+        survey.empty(0)
+        return survey.profile(0)
+    if isinstance(children, int):
+        survey.leaf(obj, 0, children)
+        return survey.profile(children)
+    return survey.profile(_walk_depth(obj, children, exclude, math.inf, survey)[0])
+
+
+class _Survey:
+    """Leafs and container lengths per level, reported by :func:`_walk_depth`.
+
+    Levels are counted from the outermost object (level 0) inwards.
+    """
+
+    def __init__(self):
+        self.leaves = 0
+        self.leaf_types = set()
+        self.leaf_levels = set()  # (level, depth) pairs of the leafs
+        self.lengths = {}  # container length per level
+        self.regular = True  # False if lengths differ on a level
+        self._containers = 0  # number of (empty) containers entered
+        # per container on the path: [number of leafs and containers when it
+        # was entered, number of those nested in its children so far]
+        self._path = [[0, 0]]
+
+    def leaf(self, leaf, level, known=0):
+        """Count a leaf of depth known on level."""
+        self.leaves += 1
+        self.leaf_types.add(type(leaf))
+        self.leaf_levels.add((level, known))
+
+    def empty(self, level):
+        """Count an empty container on level."""
+        self._containers += 1
+        self._container(0, level)
+
+    def enter(self):
+        """Count a container being descended into."""
+        self._containers += 1
+        self._path.append([self.leaves + self._containers, 0])
+
+    def exit(self, level):
+        """Count the container on level being ascended from."""
+        start, nested = self._path.pop()
+        descendants = self.leaves + self._containers - start
+        self._container(descendants - nested, level)
+        if self._path:
+            self._path[-1][1] += descendants
+
+    def _container(self, length, level):
+        if self.lengths.setdefault(level, length) != length:
+            self.regular = False
+
+    def profile(self, result):
+        """Return the :class:`Profile` of a traversal of depth result."""
+        # all leafs have to be on the level below the deepest containers and
+        # nested equally deep themselves
+        regular = self.regular and (
+            not self.leaf_levels
+            or len(self.leaf_levels) == 1
+            and min(self.leaf_levels)[0] == len(self.lengths)
+        )
+        shape = tuple(self.lengths[level] for level in range(len(self.lengths)))
+        return Profile(
+            depth=result,
+            empty=not self.leaves,
+            leaves=self.leaves,
+            regular=regular,
+            shape=shape if regular else None,
+            leaf_types=frozenset(self.leaf_types),
+        )
+
+
+Flattened = collections.namedtuple("Flattened", ("leaves", "offsets", "types", "keys"))
+Flattened.__doc__ = """Flat representation of nested containers, see :func:`flatten`.
+
+Attributes
+----------
+leaves: ~numpy.ndarray, list
+    The leafs in depth first order.
+offsets: tuple
+    One :class:`numpy.ndarray` of ``int64`` per level. The children of the
+    ``i``-th container of level ``l`` are the items
+    ``offsets[l][i]:offsets[l][i + 1]`` of level ``l + 1`` (or of
+    :attr:`leaves` on the last level).
+types: tuple
+    Per level the container types or None if they are all lists.
+keys: tuple
+    Per level the mapping's keys (None for non mappings) or None if there
+    are no mappings on that level.
+"""
+
+# leaf types of which homogeneous leafs are stored in numpy arrays:
+_ARRAY_LEAF_TYPES = (bool, int, float, complex, str, bytes)
+
+
+def flatten(obj, containers=(list, tuple, dict)):
+    """Flatten nested containers into a flat leaf buffer plus offsets.
+
+    Arrow/awkward style representation of (ragged) nested data: the leafs are
+    stored in a single :class:`numpy.ndarray` (if they are homogeneous
+    scalars, a :class:`list` otherwise) and the nesting in one offsets array
+    per level. The structure is traversed level by level (no recursion).
+    :func:`unflatten` rebuilds the original nesting. Requires :mod:`numpy`.
+
+    Parameters
+    ----------
+    obj
+        Nested containers to be flattened. All leafs have to be nested
+        equally deep.
+    containers: type, tuple, default=(list, tuple, dict)
+        Container types that are flattened. Anything else is a leaf. Of
+        mappings (anything providing ``values()``) the values are flattened,
+        their keys are kept in :attr:`Flattened.keys`.
+
+    Returns
+    -------
+    Flattened
+        Named tuple of ``leaves``, ``offsets``, ``types`` and ``keys``.
+
+    Raises
+    ------
+    ValueError
+        If leafs are nested at different depths or
+        :paramref:`~flatten.obj` contains itself.
+    TypeError
+        If :paramref:`~flatten.obj` contains a
+        :class:`~collections.defaultdict`, which can't be rebuilt from its
+        type.
+
+    Examples
+    --------
+    >>> flat = flatten([[1, 2, 3], [], [4, 5]])
+    >>> flat.leaves
+    array([1, 2, 3, 4, 5])
+    >>> flat.offsets
+    (array([0, 3]), array([0, 3, 3, 5]))
+    >>> unflatten(flat)
+    [[1, 2, 3], [], [4, 5]]
+
+    Tuples and mappings are restored as well:
+
+    >>> unflatten(flatten({'a': (1.0, 2.0), 'b': (3.0,)}))
+    {'a': (1.0, 2.0), 'b': (3.0,)}
+    """
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    offsets, types, keys = [], [], []
+    level = [obj] if isinstance(obj, containers) else []
+    leaves = [obj] if not level else []
+    kinds = {type(obj)}
+    seen = set()  # ids of non empty containers on previous levels (cycles)
+
+    while level:
+        level_keys = None
+        if kinds <= {list, tuple}:
+            children = level
+        else:
+            children, level_keys = _mapping_values(level)
+
+        lengths = np.zeros(len(children) + 1, dtype=np.int64)
+        np.cumsum(list(map(len, children)), out=lengths[1:])
+        offsets.append(lengths)
+        if any(issubclass(kind, collections.defaultdict) for kind in kinds):
+            raise TypeError("can't flatten defaultdicts, their factory is lost")
+        types.append(None if kinds <= {list} else list(map(type, level)))
+        keys.append(level_keys)
+
+        parents, level = level, list(chain.from_iterable(children))
+        kinds = set(map(type, level))
+        nested = [issubclass(kind, containers) for kind in kinds]
+        if not all(nested):
+            if any(nested):
+                raise ValueError("can't flatten leafs nested at different depths")
+            leaves, level = level, []
+        else:
+            # with all leafs nested equally deep, a non empty container can't
+            # recur on a later level than its first one, but in cycles
+            seen.update(map(id, filter(len, parents)))
+            if not seen.isdisjoint(map(id, filter(len, level))):
+                raise ValueError("can't flatten containers containing themselves")
+
+    leaf_types = set(map(type, leaves))
+    if len(leaf_types) == 1 and issubclass(
+        leaf_types.pop(), (*_ARRAY_LEAF_TYPES, np.generic)
+    ):
+        array = np.array(leaves)
+        if not array.dtype.hasobject:  # i.e. python ints too large for int64
+            leaves = array
+
+    return Flattened(
+        leaves=leaves, offsets=tuple(offsets), types=tuple(types), keys=tuple(keys)
+    )
+
+
+def unflatten(flat):
+    """Rebuild the nested containers flattened by :func:`flatten`.
+
+    Parameters
+    ----------
+    flat: Flattened
+        Flat representation as returned by :func:`flatten`.
+
+    Returns
+    -------
+    object
+        The nested containers. Leafs stored in a :class:`numpy.ndarray` are
+        restored as python scalars (using :meth:`numpy.ndarray.tolist`).
+
+    Examples
+    --------
+    >>> flat = flatten([[(1, 2), (3,)], [(4, 5, 6)]])
+    >>> flat.leaves
+    array([1, 2, 3, 4, 5, 6])
+    >>> unflatten(flat._replace(leaves=flat.leaves * 10))
+    [[(10, 20), (30,)], [(40, 50, 60)]]
+    """
+    items = flat.leaves
+    items = items.tolist() if hasattr(items, "tolist") else list(items)
+
+    for offsets, kinds, keys in zip(
+        reversed(flat.offsets), reversed(flat.types), reversed(flat.keys)
+    ):
+        bounds = offsets.tolist()
+        parts = [items[start:stop] for start, stop in zip(bounds, bounds[1:])]
+        if kinds is not None:
+            parts = [
+                _rebuild(kind, part, key)
+                for kind, part, key in zip(
+                    kinds, parts, keys if keys is not None else repeat(None)
+                )
+            ]
+        items = parts
 
-    return 1 + depth_in
+    return items[0]
+
+
+def _mapping_values(level):
+    """Return the children and keys of the containers of a level.
+
+    Parameters
+    ----------
+    level: list
+        The containers of a level.
+
+    Returns
+    -------
+    tuple
+        List of the container's children (the values of mappings) and list
+        of the keys of mappings (None for non mappings) or None if there are
+        no mappings.
+    """
+    children, keys = [], []
+    for container in level:
+        values = getattr(container, "values", None)
+        if callable(values):
+            keys.append(tuple(container.keys()))
+            children.append(values())
+        else:
+            keys.append(None)
+            children.append(container)
+    return children, keys if any(key is not None for key in keys) else None
+
+
+def _rebuild(kind, values, keys):
+    """Rebuild a container of kind from its values (and keys).
+
+    Parameters
+    ----------
+    kind: type
+        Type of the container.
+    values: list
+        The container's values.
+    keys: tuple, None
+        The keys of a mapping, None otherwise.
+
+    Returns
+    -------
+    object
+        The container.
+    """
+    if keys is not None:
+        return kind(zip(keys, values))
+    if kind is list:
+        return values
+    if hasattr(kind, "_make"):  # i.e. named tuples
+        return kind._make(values)
+    return kind(values)
 
 
 def nestify(obj, target_depth, container=list):
@@ -101,7 +693,9 @@ def nestify(obj, target_depth, container=list):
         obj which is to be put in a container
 
     target_depth : ~numbers.Number
-        Keep nesting object until nesting depth >= target_depth
+        Keep nesting object until nesting depth >= target_depth. The depth of
+        :paramref:`~nestify.obj` is only measured once (and only up to
+        ``target_depth``), each nesting then adds one level.
 
     container : ~typing.Container
         Container (list, tuple, ...)  the :paramref:`nestify.obj` is nested
@@ -147,123 +741,832 @@ def nestify(obj, target_depth, container=list):
     frozenset({frozenset({frozenset({1, 2})})})
 
     """
-    while (
-        depth(
-            obj,
-            exclude=(
-                str,
-                Series,
-            ),
-        )
-        < target_depth
-    ):
+    if _METRICS.enabled:
+        with _METRICS.record("nestify") as call:
+
+            def measure(*args, **kwargs):
+                result, call["nodes"] = _depth(*args, **kwargs)
+                return result
+
+            return _nestify(obj, target_depth, container, measure)
+    return _nestify(obj, target_depth, container, depth)
+
+
+def _nestify(obj, target_depth, container, measure):
+    """Nest obj into container until target_depth, using measure as depth.
+
+    Parameters
+    ----------
+    obj
+        obj which is to be put in a container
+    target_depth : ~numbers.Number
+        Keep nesting object until nesting depth >= target_depth.
+    container : ~typing.Container
+        Container the obj is nested with.
+    measure : ~collections.abc.Callable
+        :func:`depth` or a memoized version of it.
+
+    Returns
+    -------
+    ~typing.Container
+        Nested container object with the depth of target_depth.
+    """
+    # measure once (stopping early if deep enough), since each wrap adds 1
+    missing = target_depth - measure(
+        obj,
+        exclude=(
+            str,
+            *_loaded_types("pandas", "Series"),
+        ),
+        limit=target_depth,
+    )
+    while missing > 0:
         obj = container([obj])
+        missing -= 1
     return obj
 
 
-def itrify(obj, container=list):
-    """Turn object into an iterable container if not already.
+CacheInfo = collections.namedtuple(
+    "CacheInfo", ("hits", "misses", "maxsize", "currsize")
+)
+CacheInfo.__doc__ = (
+    """Statistics of a :class:`DepthCache`, like :func:`functools.lru_cache`'s."""
+)
 
-    Strings will be itrified without splitting!
 
-    Only objects that are of type ``str`` or **not** of
-    :class:`collections.abc.Sequence` will be itrified.
+class _Hashed:
+    """Hashable wrapper of a value, hashing it only once.
 
     Parameters
     ----------
-    obj
-        Anything not a :class:`~collections.abc.Sequence` (except for str) will
-        be containered as iterable.
+    value
+        The (hashable) value.
+    """
 
-    container : ~typing.Container, default=list
-        Interable container designed to house :paramref:`itrify.obj`.
+    __slots__ = ("value", "_hash")
 
+    def __init__(self, value):
+        self.value = value
+        self._hash = hash(value)
 
-    Returns
-    -------
-    ~collections.abc.Container
-        containered :paramref:`~itrify.obj`. ( i.e. ``list(obj)``)
+    def __hash__(self):
+        """Return the value's hash, as computed on creation."""
+        return self._hash
+
+    def __eq__(self, other):
+        """Compare the values, identical ones without comparing them."""
+        return self.value is other.value or self.value == other.value
+
+
+class DepthCache:
+    """Opt-in memoization of :func:`depth` and :func:`nestify`.
+
+    Remembers the depth of objects measured repeatedly, i.e. large shared
+    templates. Objects supporting weak references (i.e. frozensets, arrays,
+    custom classes) are remembered by identity, until they are garbage
+    collected. Other hashable objects (i.e. tuples) are remembered by value,
+    so equal objects are assumed to have the same depth. Measuring the
+    remembered object itself again is answered by identity, without hashing
+    it again. Unhashable objects without weak reference support (i.e. lists,
+    dicts) are measured each time.
+
+    Only use it with objects that don't change (in depth) after being
+    measured, there is no way to notice changes without measuring again.
+
+    Parameters
+    ----------
+    maxsize: int, None, default=128
+        Maximum number of remembered depths. The least recently used ones
+        are forgotten first. If None, the cache grows without bounds.
 
     Examples
     --------
-    Pretty much the same as ``list(('String',))``:
+    >>> cache = DepthCache(maxsize=2)
+    >>> template = ((1, 2), (3, (4, 5)))
+    >>> cache.depth(template), cache.depth(template)
+    (3, 3)
+    >>> cache.nestify(template, 4)
+    [((1, 2), (3, (4, 5)))]
+    >>> cache.info()
+    CacheInfo(hits=1, misses=2, maxsize=2, currsize=2)
+    >>> cache.clear()
+    >>> cache.info()
+    CacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
+    """
 
-    >>> itrify('String')
-    ['String']
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        # (id, exclude, limit) of the objects remembered by value -> key
+        self._identities = {}
+        self._lock = threading.RLock()  # weakref callbacks run anywhere
+        self._hits = 0
+        self._misses = 0
 
+    def depth(self, arg, exclude=None, limit=None):
+        """Return the (remembered) :func:`depth` of arg.
 
-    A list is already iterable so this is futile:
+        Parameters
+        ----------
+        arg : ~collections.abc.Iterable
+            See :paramref:`depth.arg`.
+        exclude : ~collections.abc.Iterable, default=None
+            See :paramref:`depth.exclude`.
+        limit : int, default=None
+            See :paramref:`depth.limit`.
 
-    >>> itrify([1, 2, 3], tuple)
-    [1, 2, 3]
+        Returns
+        -------
+        int
+            Depth of :paramref:`~DepthCache.depth.arg`.
+        """
+        exclude = (str,) if exclude is None else tuple(exclude)
+        identity = (id(arg), exclude, limit)
+        with self._lock:
+            # remembered by value, but looked up by identity (no hashing)
+            key = self._identities.get(identity)
+            if key is not None and key[2].value is arg:
+                return self._hit(key)
 
+        try:
+            ref = weakref.ref(arg)
+        except TypeError:
+            ref = None
+            try:
+                key = ("value", type(arg), _Hashed(arg), exclude, limit)
+            except TypeError:  # neither weak referable nor hashable
+                key = None
+        else:
+            key = ("id", *identity)
+
+        with self._lock:
+            entry = None if key is None else self._entries.get(key)
+            if entry is not None and (ref is None or entry[1]() is arg):
+                return self._hit(key)
+            self._misses += 1
+
+        result = depth(arg, exclude, limit)
+        if key is not None and self.maxsize != 0:
+            if ref is not None:  # forget arg, once it gets garbage collected
+                ref = weakref.ref(arg, lambda _ref, key=key: self._discard(key))
+            self._store(key, (result, ref), identity)
+        return result
+
+    def nestify(self, obj, target_depth, container=list):
+        """Return :func:`nestify` of obj, measuring its depth only once.
 
-    Strings although iterable will be itrified as whole:
+        Parameters
+        ----------
+        obj
+            See :paramref:`nestify.obj`.
+        target_depth : ~numbers.Number
+            See :paramref:`nestify.target_depth`.
+        container : ~typing.Container
+            See :paramref:`nestify.container`.
 
-    >>> itrify('String', tuple)
-    ('String',)
+        Returns
+        -------
+        ~typing.Container
+            Nested container object with the depth of
+            :paramref:`~DepthCache.nestify.target_depth`.
+        """
+        return _nestify(obj, target_depth, container, self.depth)
 
+    def info(self):
+        """Return the cache statistics.
 
-    The :paramref:`itrify.container` of course, can be any callable
-    container type:
+        Returns
+        -------
+        CacheInfo
+            Named tuple of ``hits``, ``misses``, ``maxsize`` and ``currsize``.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
 
-    >>> itrify('String', set)
-    {'String'}
+    def clear(self):
+        """Forget all remembered depths and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._identities.clear()
+            self._hits = 0
+            self._misses = 0
 
+    def _hit(self, key):
+        """Return the depth remembered for key, counting the hit (locked).
 
-    Pandas is awesome they support out of the box data type transformation:
+        Parameters
+        ----------
+        key : tuple
+            Key of the remembered depth.
 
-    >>> import pandas as pd
-    >>> itrify(pd.Series([1,2,3]), set)
-    {1, 2, 3}
+        Returns
+        -------
+        int
+            The remembered depth.
+        """
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return self._entries[key][0]
 
-    """
-    if isinstance(obj, str):
-        return container([obj])
-    if not isinstance(obj, collections.abc.Sequence):
-        return container(obj)
-    return obj
+    def _store(self, key, entry, identity):
+        """Remember entry for key, forgetting the least recently used one.
 
+        Parameters
+        ----------
+        key : tuple
+            Key of the depth.
+        entry : tuple
+            The depth and the weak reference to the measured object (if
+            remembered by identity).
+        identity : tuple
+            ``(id, exclude, limit)`` of the measured object.
+        """
+        with self._lock:
+            if key[0] == "value" and key not in self._entries:
+                self._identities[identity] = key
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if self.maxsize is not None and len(self._entries) > self.maxsize:
+                oldest, _ = self._entries.popitem(last=False)
+                if oldest[0] == "value":
+                    self._identities.pop((id(oldest[2].value), *oldest[3:]), None)
 
-def is_empty(lst):
-    """Check if list ist empty.
+    def _discard(self, key):
+        """Forget the depth remembered for key (of a garbage collected object)."""
+        with self._lock:
+            self._entries.pop(key, None)
 
-    ``True`` if :paramref:`~is_empty.lst` is an empty :class:`~typing.List`. ``False``
-    otherwise. Works based on ``bool([]) == True``.
+
+def _loaded_types(module, *names):
+    """Return types of an optional dependency, if it was already imported.
+
+    Objects can only be instances of types whose module got imported, so
+    looking them up in :data:`sys.modules` avoids importing heavy optional
+    dependencies (i.e. pandas) just for an ``isinstance`` check.
 
     Parameters
     ----------
-    lst: list
-        List to be checked for emptiness.
+    module : str
+        Name of the module the types are defined in.
+
+    names : str
+        Names of the types to be looked up.
 
     Returns
     -------
-    bool
-        ``True`` if :paramref:`~is_empty.lst` is an empty :class:`~typing.List`. ``False``
-        otherwise.
+    tuple
+        The types found. Empty if :paramref:`~_loaded_types.module` was not
+        imported (yet).
+    """
+    loaded = sys.modules.get(module)
+    types = (getattr(loaded, name, None) for name in names)
+    return tuple(kind for kind in types if isinstance(kind, type))
 
-    Examples
-    --------
-    >>> is_empty([])
-    True
 
-    >>> is_empty([[], [1,2,3]])
-    False
+class _TypeRegistry(dict):
+    """Map types onto values along their MRO, caching the lookup per type.
 
-    >>> is_empty([[[[]]]])
-    True
+    Looked up like a :class:`dict` (``registry[type(obj)]``), so cached
+    lookups are plain dictionary lookups. Types of optional dependencies can
+    be registered by their qualified name (i.e. ``"numpy.ndarray"``). They
+    are resolved once their module got imported, so registering them does
+    not import it.
 
-    Tuple is not a list (u dont say):
+    Uncached lookups and registrations are serialized by a lock, so
+    threads don't resolve the same names concurrently.
 
-    >>> is_empty(([], []))
-    False
+    Parameters
+    ----------
+    fallback: ~collections.abc.Callable, None, default=None
+        Called with unregistered types, to determine their (cached) value.
+        If None, their value is None.
     """
-    # is lst a list ?
-    if isinstance(lst, list):
-        # ... yes! check if all elements are empty
-        return all(map(is_empty, lst))
-    # ...  no! Not a list
-    return False
+
+    def __init__(self, fallback=None):
+        super().__init__()
+        self._types = {}
+        self._names = {}
+        self._fallback = fallback
+        self._lock = threading.RLock()
+
+    def register(self, kind, value):
+        """Register value for kind and its subclasses.
+
+        Parameters
+        ----------
+        kind: type, str
+            The type or its qualified name.
+        value
+            The value looked up for :paramref:`~_TypeRegistry.register.kind`.
+        """
+        with self._lock:
+            self._resolve()  # keep the registration order
+            if isinstance(kind, str):
+                self._names[kind] = value
+                self._resolve()
+            else:
+                self._types[kind] = value
+            self.clear()
+
+    def __missing__(self, kind):
+        """Look up the value of an uncached type and cache it."""
+        with self._lock:
+            self._resolve()
+            for base in kind.__mro__:
+                if base in self._types:
+                    value = self._types[base]
+                    break
+            else:
+                value = None if self._fallback is None else self._fallback(kind)
+            self[kind] = value
+        return value
+
+    def _resolve(self):
+        """Turn registered names of imported modules into types (locked)."""
+        for name in list(self._names):
+            module, _, attribute = name.rpartition(".")
+            for kind in _loaded_types(module, attribute):
+                self._types[kind] = self._names.pop(name)
+                self.clear()
+
+
+def _shape_depth(shape):
+    """Return the depth of an array like of shape (empty axes add no depth).
+
+    Parameters
+    ----------
+    shape: tuple
+        The shape.
+
+    Returns
+    -------
+    int
+        The number of leading non-empty axes.
+    """
+    for axis, length in enumerate(shape):
+        if not length:
+            return axis
+    return len(shape)
+
+
+def _array_depth(array, exclude):
+    """Determine the depth of a :class:`numpy.ndarray` from its shape.
+
+    Parameters
+    ----------
+    array: ~numpy.ndarray
+        The array.
+    exclude: tuple
+        Tuple of iterable types that should be treated as leafs.
+
+    Returns
+    -------
+    int, None
+        The depth or None if the elements might be iterable themselves
+        (i.e. object arrays).
+    """
+    kind = array.dtype.kind
+    if kind in "biufcmM" or (kind == "U" and issubclass(str, exclude)):
+        return _shape_depth(array.shape)
+    return None
+
+
+def _series_depth(series, exclude):  # pylint: disable=unused-argument
+    """Determine the depth of a :class:`pandas.Series` from its dtype.
+
+    Parameters
+    ----------
+    series: ~pandas.Series
+        The series.
+    exclude: tuple
+        Tuple of iterable types that should be treated as leafs.
+
+    Returns
+    -------
+    int, None
+        The depth or None if the elements might be iterable themselves.
+    """
+    if not len(series):
+        return 0
+    if series.dtype.kind in "biufcmM":
+        return 1
+    return None
+
+
+def _frame_depth(frame, exclude):  # pylint: disable=unused-argument
+    """Determine the depth of a :class:`pandas.DataFrame`, which is 2D.
+
+    Parameters
+    ----------
+    frame: ~pandas.DataFrame
+        The data frame.
+    exclude: tuple
+        Tuple of iterable types that should be treated as leafs.
+
+    Returns
+    -------
+    int
+        The depth.
+    """
+    return _shape_depth(frame.shape[::-1])
+
+
+_DEPTHS = _TypeRegistry()
+_DEPTHS.register("numpy.ndarray", _array_depth)
+_DEPTHS.register("pandas.Series", _series_depth)
+_DEPTHS.register("pandas.DataFrame", _frame_depth)
+
+
+def register_depth(kind, handler):
+    """Register how :func:`depth` measures objects of kind without iterating.
+
+    Registrations apply to subclasses as well and are looked up once per
+    type. Builtin containers (list, tuple, dict) and scalars can't be
+    overridden, excluded types always have depth 0.
+
+    Parameters
+    ----------
+    kind: type, str
+        The type or its qualified name (i.e. ``"numpy.ndarray"``). Names are
+        resolved once their module got imported, so registering does not
+        import optional dependencies.
+    handler: int, ~collections.abc.Callable, None
+        Fixed depth of objects of :paramref:`~register_depth.kind` (i.e. 0
+        for leaf types) or callable taking the object and the excluded types
+        returning its depth or None to iterate it as usual. If None,
+        objects are iterated (i.e. to undo a registration).
+
+    Examples
+    --------
+    >>> class Point(tuple):
+    ...     pass
+    >>> depth([Point((1, 2)), Point((3, 4))])
+    2
+    >>> register_depth(Point, 0)
+    >>> depth([Point((1, 2)), Point((3, 4))])
+    1
+
+    Arrays (of non-object dtypes) are registered by default:
+
+    >>> import numpy as np
+    >>> depth([np.zeros((1000, 1000)), np.zeros((10, 10))])
+    3
+    """
+    _DEPTHS.register(kind, handler)
+
+
+def _wrap(obj, container):
+    """Put obj into container."""
+    return container([obj])
+
+
+def _convert(obj, container):
+    """Turn obj into container."""
+    return container(obj)
+
+
+def _keep(obj, container):  # pylint: disable=unused-argument
+    """Return obj, since it is iterable already."""
+    return obj
+
+
+_ITRIFY = _TypeRegistry(
+    fallback=lambda kind: (
+        _keep if issubclass(kind, collections.abc.Sequence) else _convert
+    )
+)
+_ITRIFY.register(str, _wrap)
+
+# passthrough mode: iterables are kept, scalars and strings wrapped
+_PASSTHROUGH = _TypeRegistry(
+    fallback=lambda kind: (
+        _keep if issubclass(kind, collections.abc.Iterable) else _wrap
+    )
+)
+_PASSTHROUGH.register(str, _wrap)
+_PASSTHROUGH.register(bytes, _wrap)
+
+
+def register_itrify(kind, handler):
+    """Register how :func:`itrify` handles objects of kind.
+
+    Registrations apply to subclasses as well, to both modes of
+    :func:`itrify` (see :paramref:`itrify.passthrough`) and are looked up
+    once per type.
+
+    Parameters
+    ----------
+    kind: type, str
+        The type or its qualified name (i.e. ``"numpy.ndarray"``), see
+        :paramref:`register_depth.kind`.
+    handler: ~collections.abc.Callable
+        Callable taking the object and the container returning the
+        itrified object.
+
+    Examples
+    --------
+    Treat records as single items, instead of iterating their keys:
+
+    >>> class Record(dict):
+    ...     pass
+    >>> itrify(Record(a=1))
+    ['a']
+    >>> register_itrify(Record, lambda obj, container: container([obj]))
+    >>> itrify(Record(a=1))
+    [{'a': 1}]
+    """
+    _ITRIFY.register(kind, handler)
+    _PASSTHROUGH.register(kind, handler)
+
+
+def itrify(obj, container=list, passthrough=False):
+    """Turn object into an iterable container if not already.
+
+    Strings will be itrified without splitting!
+
+    Only objects that are of type ``str`` or **not** of
+    :class:`collections.abc.Sequence` will be itrified.
+
+    Parameters
+    ----------
+    obj
+        Anything not a :class:`~collections.abc.Sequence` (except for str) will
+        be containered as iterable.
+
+    container : ~typing.Container, default=list
+        Interable container designed to house :paramref:`itrify.obj`.
+
+    passthrough : bool, default=False
+        If ``True``, any iterable (except for str and bytes) is returned
+        unchanged, instead of only sequences. Avoids copying i.e.
+        :class:`numpy.ndarray`, :class:`pandas.Series`,
+        :class:`memoryview` or dict views into
+        :paramref:`~itrify.container`. Scalars, strings and bytes get
+        containered.
+
+    Returns
+    -------
+    ~collections.abc.Container
+        containered :paramref:`~itrify.obj`. ( i.e. ``list(obj)``)
+
+    Examples
+    --------
+    Pretty much the same as ``list(('String',))``:
+
+    >>> itrify('String')
+    ['String']
+
+
+    A list is already iterable so this is futile:
+
+    >>> itrify([1, 2, 3], tuple)
+    [1, 2, 3]
+
+
+    Strings although iterable will be itrified as whole:
+
+    >>> itrify('String', tuple)
+    ('String',)
+
+
+    The :paramref:`itrify.container` of course, can be any callable
+    container type:
+
+    >>> itrify('String', set)
+    {'String'}
+
+
+    Pandas is awesome they support out of the box data type transformation:
+
+    >>> import pandas as pd
+    >>> itrify(pd.Series([1,2,3]), set)
+    {1, 2, 3}
+
+
+    Passing iterables through without copying them:
+
+    >>> import numpy as np
+    >>> array = np.arange(3)
+    >>> itrify(array, passthrough=True) is array
+    True
+    >>> itrify(3.0, passthrough=True)
+    [3.0]
+
+    """
+    if type(obj) is str:  # pylint: disable=unidiomatic-typecheck
+        return container([obj])
+    if passthrough:
+        return _PASSTHROUGH[type(obj)](obj, container)
+    return _ITRIFY[type(obj)](obj, container)
+
+
+def itrify_many(objs, container=list, passthrough=False):
+    """Itrify many objects at once.
+
+    Same as ``[itrify(obj, container, passthrough) for obj in objs]``, but
+    without the per call overhead.
+
+    Parameters
+    ----------
+    objs : ~collections.abc.Iterable
+        The objects to be itrified.
+
+    container : ~typing.Container, default=list
+        See :paramref:`itrify.container`.
+
+    passthrough : bool, default=False
+        See :paramref:`itrify.passthrough`.
+
+    Returns
+    -------
+    list
+        The itrified objects.
+
+    Examples
+    --------
+    >>> itrify_many(['a', (1, 2), {3}, range(2)], passthrough=True)
+    [['a'], (1, 2), {3}, range(0, 2)]
+
+    >>> itrify_many(['a', {3}], tuple)
+    [('a',), (3,)]
+    """
+    registry = _PASSTHROUGH if passthrough else _ITRIFY
+    return [registry[type(obj)](obj, container) for obj in objs]
+
+
+def is_empty(lst, containers=(list,)):
+    """Check if list ist empty.
+
+    ``True`` if :paramref:`~is_empty.lst` is an empty :class:`~typing.List`. ``False``
+    otherwise. Works based on ``bool([]) == True``.
+
+    Nested containers are walked using an explicit stack (so arbitrarily
+    deep nesting does not overflow the recursion limit), stopping at the
+    first non-empty element. Use :func:`first_nonempty` to find out where it
+    is.
+
+    Parameters
+    ----------
+    lst: list
+        List to be checked for emptiness.
+    containers: type, tuple, default=(list,)
+        Container types that are descended into. Anything else is a
+        non-empty element. Add :class:`tuple`, :class:`dict` (checking the
+        values), :class:`~collections.abc.Generator` (consuming it) or
+        :class:`numpy.ndarray` (i.e. object arrays) to also treat those as
+        containers.
+
+    Returns
+    -------
+    bool
+        ``True`` if :paramref:`~is_empty.lst` is an empty :class:`~typing.List`. ``False``
+        otherwise.
+
+    Examples
+    --------
+    >>> is_empty([])
+    True
+
+    >>> is_empty([[], [1,2,3]])
+    False
+
+    >>> is_empty([[[[]]]])
+    True
+
+    Tuple is not a list (u dont say):
+
+    >>> is_empty(([], []))
+    False
+
+    ... unless told so:
+
+    >>> is_empty(([], [{'a': []}]), containers=(list, tuple, dict))
+    True
+    """
+    if _METRICS.enabled:
+        with _METRICS.record("is_empty") as call:
+            path, call["nodes"] = _first_nonempty(lst, containers)
+        return path is None
+    return _first_nonempty(lst, containers)[0] is None
+
+
+def first_nonempty(obj, containers=(list,)):
+    """Find the first non-empty element of nested containers.
+
+    Iterative, short-circuiting walk as used by :func:`is_empty`.
+
+    Parameters
+    ----------
+    obj
+        Nested containers to be searched.
+    containers: type, tuple, default=(list,)
+        Container types that are descended into. See
+        :paramref:`is_empty.containers`.
+
+    Returns
+    -------
+    tuple, None
+        Path (indices, keys or :class:`numpy.ndarray` index tuples) leading
+        from :paramref:`~first_nonempty.obj` to its first non-empty element.
+        ``()`` if :paramref:`~first_nonempty.obj` is no container and
+        ``None`` if it is empty.
+
+    Examples
+    --------
+    >>> first_nonempty([[], [[], [[], 0]]])
+    (1, 1, 1)
+
+    >>> first_nonempty({'a': [], 'b': ([], 'x')}, containers=(list, tuple, dict))
+    ('b', 1)
+
+    >>> first_nonempty([[[]], []]) is None
+    True
+
+    >>> import numpy as np
+    >>> first_nonempty([np.array([[], [3]], dtype=object)], (list, np.ndarray))
+    (0, (1,), 0)
+    """
+    return _first_nonempty(obj, containers)[0]
+
+
+def _first_nonempty(obj, containers):
+    """Find the first non-empty element and count the containers visited.
+
+    Parameters
+    ----------
+    obj
+        See :paramref:`first_nonempty.obj`.
+    containers: type, tuple
+        See :paramref:`first_nonempty.containers`.
+
+    Returns
+    -------
+    tuple
+        The path as returned by :func:`first_nonempty` and the number of
+        containers visited.
+    """
+    if not isinstance(obj, containers):
+        return (), 0
+
+    arrays = _loaded_types("numpy", "ndarray")
+    entries, path = _entries(obj, arrays), []
+    stack, active = [], {id(obj)}  # (parent entries, ids) and visited ids
+    visited = 1
+    while True:
+        for key, item in entries:
+            if not isinstance(item, containers):
+                path.append(key)
+                return tuple(path), visited
+            if type(item) in _SIZED_TYPES and not item:
+                continue  # empty, no need to descend
+            if id(item) not in active:  # skip cyclic references
+                active.add(id(item))
+                stack.append((entries, id(item)))
+                visited += 1
+                path.append(key)
+                entries = (
+                    enumerate(item)
+                    if type(item) in (list, tuple)
+                    else _entries(item, arrays)
+                )
+                break
+        else:
+            if not stack:
+                return None, visited
+            entries, ident = stack.pop()
+            active.discard(ident)
+            path.pop()
+
+
+def _entries(container, arrays):
+    """Return an iterator over the (key, item) pairs of a container.
+
+    Parameters
+    ----------
+    container
+        Sequence, mapping, :class:`numpy.ndarray` or other iterable.
+    arrays: tuple
+        The array types, as returned by :func:`_loaded_types`.
+
+    Returns
+    -------
+    ~collections.abc.Iterator
+        Iterator over (key, item) pairs, using index tuples for arrays, keys
+        for mappings (anything providing ``items()``) and positions otherwise.
+    """
+    if type(container) in (list, tuple):
+        return enumerate(container)
+
+    if isinstance(container, arrays):
+        # pylint: disable=import-outside-toplevel
+        import numpy as np
+
+        return np.ndenumerate(container)
+
+    items = getattr(container, "items", None)
+    if callable(items):
+        return iter(items())
+    return enumerate(container)
 
 
 class Stringcrementor:
@@ -314,120 +1617,1148 @@ class Stringcrementor:
         self.value += 1
         return self.string + str(next_value)
 
+    def take(self, count):
+        """Reserve the next count labels at once as a compact :class:`StringRange`.
 
-def enum_to_2dix(number, shape):
-    """Map a 1d range to a 2d index.
+        Parameters
+        ----------
+        count : int
+            Number of labels to be reserved.
+
+        Returns
+        -------
+        StringRange
+            The reserved labels, as if :func:`next` was called
+            :paramref:`~Stringcrementor.take.count` times.
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`~Stringcrementor.take.count` is negative.
+
+        Example
+        -------
+        >>> strementor = Stringcrementor('Category')
+        >>> labels = strementor.take(3)
+        >>> list(labels), next(strementor)
+        (['Category0', 'Category1', 'Category2'], 'Category3')
+        """
+        count = _check_count(count)
+        start = operator.index(self.value)
+        self.value = start + count
+        return StringRange(self.string, range(start, start + count))
+
+
+def _check_count(count):
+    """Return count as integer, making sure labels are not given back.
 
     Parameters
     ----------
-    number : int
-        Number to be mapped to a 2D index. Usually used with in some form of
-        iteration.
-
-    shape : tuple
-        2 dimensional tuple defining an arrays 2d shape as in ``(rows, columns)``.
+    count : int
+        Number of labels to be reserved.
 
     Returns
     -------
-    tuple
+    int
+        :paramref:`~_check_count.count`.
+
+    Raises
+    ------
+    ValueError
+        If :paramref:`~_check_count.count` is negative (which would rewind
+        the counter, handing out labels twice).
+    """
+    count = operator.index(count)
+    if count < 0:
+        raise ValueError(f"count must not be negative, not {count}")
+    return count
+
+
+class _BlockStringcrementor(Stringcrementor):
+    """Stringcrementor handing out labels from reserved blocks of numbers.
+
+    Subclasses define where numbers are reserved from by implementing
+    ``_reserve(count)`` and the ``value`` property.
+
+    Parameters
+    ----------
+    string: str
+        String/tag/label of what you want to be incremented i.e "Category".
+    block_size: int
+        Number of labels reserved at once.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, string, block_size):
+        if block_size < 1:
+            raise ValueError(f"block_size must be positive, not {block_size}")
+
+        self.string = string
+        self.block_size = block_size
+        self._block = iter(())
+
+    def __next__(self):
+        """Hand out the next label, reserving a new block if necessary."""
+        try:
+            number = next(self._block)
+        except StopIteration:
+            # racing threads reserve a block each; unique either way. Take
+            # from the new block before sharing it, so other threads can't
+            # drain it first.
+            block = iter(self._reserve(self.block_size))
+            number = next(block)
+            self._block = block
+        return self.string + str(number)
+
+    def take(self, count):
+        """Reserve the next count labels at once as a compact :class:`StringRange`.
+
+        The labels are reserved directly, bypassing the current block.
+
+        Parameters
+        ----------
+        count : int
+            Number of labels to be reserved.
+
+        Returns
+        -------
+        StringRange
+            The reserved labels.
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`~_BlockStringcrementor.take.count` is negative.
+        """
+        return StringRange(self.string, self._reserve(_check_count(count)))
+
+
+class SharedStringcrementor(_BlockStringcrementor):
+    """Process and thread safe :class:`Stringcrementor`.
+
+    The counter lives in shared memory (:func:`multiprocessing.Value`), so
+    all processes drawing from the same SharedStringcrementor hand out
+    globally unique labels. To keep lock contention off the hot path, each
+    process reserves a block of :paramref:`~SharedStringcrementor.block_size`
+    numbers at once and hands those out locally. Labels are hence unique,
+    but only increasing per process.
+
+    Like all synchronized multiprocessing objects, a SharedStringcrementor
+    can only be shared by inheritance, i.e. by passing it as ``initargs`` to
+    :class:`concurrent.futures.ProcessPoolExecutor` or as argument to
+    :class:`multiprocessing.Process`. Child processes never inherit the
+    parent's partially used block.
+
+    Parameters
+    ----------
+    string: str
+        String/tag/label of what you want to be incremented i.e "Category".
+        Default: ``Stringcrementor``
+    start: int
+        Starting number which is to be incremented. Default: 0
+    block_size: int
+        Number of labels reserved at once per process. Default: 1000
+    context: str, None
+        :mod:`multiprocessing` start method (``"fork"``, ``"spawn"``, ...)
+        the shared counter is created for. Default: None (the default
+        context)
+
+    Example
+    -------
+    >>> strementor = SharedStringcrementor('Worker ', block_size=10)
+    >>> next(strementor), next(strementor)
+    ('Worker 0', 'Worker 1')
+
+    Other processes (or other instances shared the same way) continue
+    with the next block:
+
+    >>> strementor.value
+    10
+    """
+
+    def __init__(
+        self, string="Stringcrementor ", start=0, block_size=1000, context=None
+    ):
+        # pylint: disable=import-outside-toplevel
+        import multiprocessing
+
+        super().__init__(string, block_size)
+        self._counter = multiprocessing.get_context(context).Value("q", start)
+        _SHARED_STRINGCREMENTORS.add(self)
+
+    def __getstate__(self):
+        """Drop the local block, so it is never handed out twice."""
+        state = self.__dict__.copy()
+        del state["_block"]
+        return state
+
+    def __setstate__(self, state):
+        """Restore the shared state, starting with an empty local block."""
+        self.__dict__.update(state)
+        self._block = iter(())
+        _SHARED_STRINGCREMENTORS.add(self)
+
+    @property
+    def value(self):
+        """Next number that is not reserved by any process yet."""
+        return self._counter.value
+
+    def _reserve(self, count):
+        """Reserve count numbers from the shared counter.
+
+        Parameters
+        ----------
+        count : int
+            Number of numbers to be reserved.
+
+        Returns
+        -------
+        range
+            The reserved numbers.
+        """
+        with self._counter.get_lock():
+            start = self._counter.value
+            self._counter.value = start + count
+        return range(start, start + count)
+
+
+_SHARED_STRINGCREMENTORS = weakref.WeakSet()
+
+
+def _drop_inherited_blocks():
+    """Drop blocks of SharedStringcrementors inherited by forking."""
+    for strementor in _SHARED_STRINGCREMENTORS:
+        strementor._block = iter(())  # pylint: disable=protected-access
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_drop_inherited_blocks)
+
+
+class PersistentStringcrementor(_BlockStringcrementor):
+    """Crash resumable :class:`Stringcrementor` checkpointed to a file.
+
+    The counter is stored in a small memory-mapped checkpoint file. Numbers
+    are reserved in blocks of :paramref:`~PersistentStringcrementor.block_size`
+    and the checkpoint is advanced (and flushed to disk) *before* a block is
+    handed out. So the file is only touched once per block and a restarted
+    job continues after the last reserved block: labels stay increasing
+    across restarts, at the cost of skipping the unused rest of a block.
+
+    The checkpoint file is locked exclusively (using :func:`fcntl.flock`)
+    until it is closed, so a restarted job can't hand out the same labels
+    as a still running one. Use :class:`SharedStringcrementor` to share
+    labels across processes.
+
+    Parameters
+    ----------
+    path: str, ~os.PathLike
+        Path of the checkpoint file. Created if not existing, resumed from
+        otherwise.
+    string: str
+        String/tag/label of what you want to be incremented i.e "Category".
+        Default: ``Stringcrementor``
+    start: int
+        Starting number which is to be incremented, if the checkpoint file
+        does not exist yet. Default: 0
+    block_size: int
+        Number of labels reserved per checkpoint update. Default: 1000
+
+    Raises
+    ------
+    ValueError
+        If :paramref:`~PersistentStringcrementor.path` is not a checkpoint
+        file.
+    RuntimeError
+        If the checkpoint file is in use by another PersistentStringcrementor.
+
+    Example
+    -------
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'labels.ckpt')
+    >>> with PersistentStringcrementor(path, 'Id', block_size=100) as strementor:
+    ...     print(next(strementor), next(strementor))
+    Id0 Id1
+
+    Resuming after a restart (or crash) continues after the reserved block:
+
+    >>> with PersistentStringcrementor(path, 'Id', block_size=100) as strementor:
+    ...     print(next(strementor))
+    Id100
+    """
+
+    _MAGIC = b"ittools\x00"
+    _FORMAT = struct.Struct("<8sq")
+
+    def __init__(self, path, string="Stringcrementor ", start=0, block_size=1000):
+        super().__init__(string, block_size)
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+
+        descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        # the descriptor holds the lock, also closed if self is collected
+        self._release = weakref.finalize(self, os.close, descriptor)
+        try:
+            self._lock_file(descriptor)
+            size = os.fstat(descriptor).st_size
+            if size == 0:
+                os.write(descriptor, self._FORMAT.pack(self._MAGIC, start))
+                os.fsync(descriptor)
+                _sync_directory(self.path)
+            elif size != self._FORMAT.size:
+                raise ValueError(f"{self.path!r} is not a checkpoint file")
+
+            self._mmap = mmap.mmap(descriptor, self._FORMAT.size)
+            if self._FORMAT.unpack(self._mmap)[0] != self._MAGIC:
+                self._mmap.close()
+                raise ValueError(f"{self.path!r} is not a checkpoint file")
+        except BaseException:
+            self._release()
+            raise
+
+    def _lock_file(self, descriptor):
+        """Lock the checkpoint file exclusively, failing if it is in use.
+
+        Parameters
+        ----------
+        descriptor : int
+            File descriptor of the checkpoint file.
+
+        Raises
+        ------
+        RuntimeError
+            If the checkpoint file is locked already.
+        """
+        if fcntl is None:  # pragma: no cover
+            return
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError as error:
+            raise RuntimeError(
+                f"{self.path!r} is in use by another PersistentStringcrementor"
+            ) from error
+
+    def __enter__(self):
+        """Use as context manager, closing the checkpoint on exit."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the checkpoint file."""
+        self.close()
+
+    def close(self):
+        """Close the checkpoint file, releasing its lock."""
+        self._mmap.close()
+        self._release()
+
+    @property
+    def value(self):
+        """Next number that is not reserved yet (as stored in the checkpoint)."""
+        return self._FORMAT.unpack(self._mmap)[1]
+
+    def _reserve(self, count):
+        """Reserve count numbers by advancing the checkpoint.
+
+        Parameters
+        ----------
+        count : int
+            Number of numbers to be reserved.
+
+        Returns
+        -------
+        range
+            The reserved numbers.
+        """
+        with self._lock:
+            start = self.value
+            self._FORMAT.pack_into(self._mmap, 0, self._MAGIC, start + count)
+            self._mmap.flush()
+        return range(start, start + count)
+
+
+def _sync_directory(path):
+    """Flush the directory entry of a newly created file to disk.
+
+    Parameters
+    ----------
+    path : str
+        Path of the newly created file.
+    """
+    if os.name != "posix":  # pragma: no cover
+        return  # directories can't be opened (nor synced) on windows
+    descriptor = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class StringRange(collections.abc.Sequence):
+    """Compact sequence of string + integer labels.
+
+    Stores :paramref:`~StringRange.string` once plus a :class:`range` instead
+    of one ``str`` per label. Labels are only created when accessed.
+
+    Parameters
+    ----------
+    string: str
+        String/tag/label prefixing each number i.e "Category".
+
+    numbers: range
+        Range of the numbers appended to :paramref:`~StringRange.string`.
+
+    Example
+    -------
+    >>> labels = StringRange('Category', range(3, 1000))
+    >>> len(labels), labels[0], labels[-1]
+    (997, 'Category3', 'Category999')
+
+    Looking up a label's position in constant time:
+
+    >>> 'Category42' in labels, labels.index('Category42')
+    (True, 39)
+
+    Slicing is lazy as well:
+
+    >>> list(labels[10:40:10])
+    ['Category13', 'Category23', 'Category33']
+    """
+
+    __slots__ = ("_string", "_numbers")
+
+    @property
+    def string(self):
+        """String prefixing each label."""
+        return self._string
+
+    @property
+    def numbers(self):
+        """Range of the numbers appended to :attr:`string`."""
+        return self._numbers
+
+    def __init__(self, string, numbers):
+        self._string = string
+        self._numbers = numbers
+
+    def __repr__(self):
+        """Represent the compact form, not the labels."""
+        return f"{type(self).__name__}({self._string!r}, {self._numbers!r})"
+
+    def __len__(self):
+        """Return the number of labels."""
+        return len(self._numbers)
+
+    def __getitem__(self, key):
+        """Return the label at key (or a lazy :class:`StringRange` if sliced)."""
+        if isinstance(key, slice):
+            return StringRange(self._string, self._numbers[key])
+        return self._string + str(self._numbers[key])
+
+    def __iter__(self):
+        """Iterate over the labels."""
+        return map(self._string.__add__, map(str, self._numbers))
+
+    def __reversed__(self):
+        """Iterate over the labels in reversed order."""
+        return map(self._string.__add__, map(str, reversed(self._numbers)))
+
+    def __contains__(self, label):
+        """Check in constant time whether label is part of the labels."""
+        return self.number(label) is not None
+
+    def number(self, label):
+        """Return the number of a label (reverse lookup) in constant time.
+
+        Parameters
+        ----------
+        label : str
+            Label of which the number is to be determined.
+
+        Returns
+        -------
+        int, None
+            The number of :paramref:`~StringRange.number.label`.
+            ``None`` if :paramref:`~StringRange.number.label` is not part of
+            the labels.
+        """
+        if not isinstance(label, str) or not label.startswith(self._string):
+            return None
+        suffix = label[len(self._string) :]
+        try:
+            number = int(suffix)
+        except ValueError:
+            return None
+        # reject non canonical suffixes like '007' or '+7'
+        if str(number) != suffix or number not in self._numbers:
+            return None
+        return number
+
+    def index(self, value, start=0, stop=None):
+        """Return the position of a label in constant time.
+
+        Parameters
+        ----------
+        value : str
+            The label to be looked up.
+
+        start : int, default=0
+            Position the search starts at.
+
+        stop : int, default=None
+            Position the search stops at.
+
+        Returns
+        -------
+        int
+            The position of :paramref:`~StringRange.index.value`
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`~StringRange.index.value` is not in the searched
+            range.
+        """
+        number = self.number(value)
+        if number is not None:
+            position = self._numbers.index(number)
+            if position in range(len(self))[start:stop]:
+                return position
+        raise ValueError(f"{value!r} is not in {type(self).__name__}")
+
+    def count(self, value):
+        """Return the number of occurrences of value (0 or 1).
+
+        Parameters
+        ----------
+        value : str
+            The label to be counted.
+
+        Returns
+        -------
+        int
+            ``1`` if :paramref:`~StringRange.count.value` is part of the
+            labels, ``0`` otherwise.
+        """
+        return int(value in self)
+
+    def to_numpy(self):
+        """Create all labels at once as :class:`numpy.ndarray`.
+
+        Requires :mod:`numpy`.
+
+        Returns
+        -------
+        ~numpy.ndarray
+            Array of fixed width unicode strings holding the labels.
+
+        Example
+        -------
+        >>> StringRange('Category', range(3)).to_numpy()
+        array(['Category0', 'Category1', 'Category2'], dtype='<U9')
+        """
+        # pylint: disable=import-outside-toplevel
+        import numpy as np
+
+        numbers = self._numbers
+        # only as wide as the longest number, to keep the array compact
+        ends = (numbers[0], numbers[-1]) if numbers else ()
+        width = max((len(str(number)) for number in ends), default=1)
+        numbers = np.arange(numbers.start, numbers.stop, numbers.step)
+        return np.char.add(self._string, numbers.astype(f"<U{width}"))
+
+    def to_index(self, **kwargs):
+        """Create all labels at once as :class:`pandas.Index`.
+
+        Requires :mod:`pandas`.
+
+        Parameters
+        ----------
+        kwargs
+            Keyword arguments passed to :class:`pandas.Index` (i.e ``name``).
+
+        Returns
+        -------
+        ~pandas.Index
+            Index holding the labels.
+
+        Example
+        -------
+        >>> StringRange('Category', range(3)).to_index(name='labels')
+        Index(['Category0', 'Category1', 'Category2'], dtype='object', name='labels')
+        """
+        # pylint: disable=import-outside-toplevel
+        from pandas import Index
+
+        return Index(self.to_numpy(), dtype=object, **kwargs)
+
+
+def enum_to_2dix(number, shape):
+    """Map a 1d range to a 2d index.
+
+    Parameters
+    ----------
+    number : int
+        Number to be mapped to a 2D index. Usually used with in some form of
+        iteration.
+
+    shape : tuple
+        2 dimensional tuple defining an arrays 2d shape as in ``(rows, columns)``.
+
+    Returns
+    -------
+    tuple
         the 1d enumerate numberition mapped to a (row, column) 2d tuple
 
-    Note
-    ----
-    Only the number of columns is actually used. Since this is designed to
-    be used with 2D-Matrices however, it is left as 2D-shape for convenience.
+    Note
+    ----
+    Only the number of columns is actually used. Since this is designed to
+    be used with 2D-Matrices however, it is left as 2D-shape for convenience.
+
+    This implies however, that you can actually use infinite
+    :paramref:`~enum_to_2dix.number` arguments altough your
+    :paramref:`~enum_to_2dix.shape` might imply only 3 rows.
+
+    Examples
+    --------
+    Mapping ``range(6)`` to a 3,2 dimenstion array:
+
+    >>> for i in range(6):
+    ...     print(i, '->', enum_to_2dix(i, (3,2)))
+    0 -> (0, 0)
+    1 -> (0, 1)
+    2 -> (1, 0)
+    3 -> (1, 1)
+    4 -> (2, 0)
+    5 -> (2, 1)
+
+    Mapping ``range(12)`` to a 3,4 dimenstion array:
+
+    >>> for i in range(12):
+    ...     print(i, '->', enum_to_2dix(i, (3,4)))
+    0 -> (0, 0)
+    1 -> (0, 1)
+    2 -> (0, 2)
+    3 -> (0, 3)
+    4 -> (1, 0)
+    5 -> (1, 1)
+    6 -> (1, 2)
+    7 -> (1, 3)
+    8 -> (2, 0)
+    9 -> (2, 1)
+    10 -> (2, 2)
+    11 -> (2, 3)
+    """
+    # integer division keeps large integers exact (unlike float division)
+    return divmod(number, shape[1])
+
+
+def enum_to_2dix_batch(numbers, shape):
+    """Map many 1d positions to 2d indices at once.
+
+    Vectorized counterpart of :func:`enum_to_2dix` using a single
+    :func:`numpy.divmod` pass instead of one python call per number.
+    Requires :mod:`numpy`.
+
+    Parameters
+    ----------
+    numbers : ~numpy.ndarray, range, slice
+        Integer array (or anything :func:`numpy.asarray` accepts), range or
+        slice of the numbers to be mapped to 2D indices. Slices are resolved
+        against the total size of :paramref:`~enum_to_2dix_batch.shape`.
+
+    shape : tuple
+        2 dimensional tuple defining an arrays 2d shape as in ``(rows, columns)``.
+
+    Returns
+    -------
+    tuple
+        2-tuple of integer arrays as in ``(rows, columns)``, each of the same
+        shape as :paramref:`~enum_to_2dix_batch.numbers`.
+
+    Examples
+    --------
+    Mapping ``range(6)`` to a 3,2 dimenstion array:
+
+    >>> rows, columns = enum_to_2dix_batch(range(6), (3, 2))
+    >>> rows.tolist(), columns.tolist()
+    ([0, 0, 1, 1, 2, 2], [0, 1, 0, 1, 0, 1])
+
+    Slices are resolved using the shape:
+
+    >>> rows, columns = enum_to_2dix_batch(slice(None, None, 2), (3, 2))
+    >>> rows.tolist(), columns.tolist()
+    ([0, 1, 2], [0, 0, 0])
+    """
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    numbers = _as_array(numbers, shape[0] * shape[1])
+    return tuple(np.divmod(numbers, shape[1]))
+
+
+def _as_array(numbers, size=0):
+    """Turn numbers into a :class:`numpy.ndarray`, without boxing ranges.
+
+    Parameters
+    ----------
+    numbers : ~numpy.ndarray, range, slice
+        Array (or anything :func:`numpy.asarray` accepts), range or
+        slice to be turned into an array.
+
+    size : int, default=0
+        Size of the sequence :paramref:`~_as_array.numbers` is
+        resolved against, in case it is a slice.
+
+    Returns
+    -------
+    ~numpy.ndarray
+        Array of the numbers.
+    """
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    if isinstance(numbers, slice):
+        numbers = range(*numbers.indices(size))
+    if isinstance(numbers, range):
+        return np.arange(numbers.start, numbers.stop, numbers.step)
+    return np.asarray(numbers)
+
+
+class Index2D(collections.abc.Sequence):
+    """Construct a callable object that maps a number to a 2d index.
+
+    Also acts as a lazy :class:`~collections.abc.Sequence` of all 2d indices
+    of its shape (in row-major order), without allocating them up front.
+
+    Parameters
+    ----------
+    shape : 2-tuple
+        tuple defining an array's 2d shape as in ``(rows, columns)``
+
+    Returns
+    -------
+    tuple
+        the 1d enumerate position mapped to a (row, column) 2d tuple
+
+    Examples
+    --------
+    >>> idx2d = Index2D((3, 2))
+    >>> for i in range(6):
+    ...     print(i, '->', idx2d(i))
+    ...
+    0 -> (0, 0)
+    1 -> (0, 1)
+    2 -> (1, 0)
+    3 -> (1, 1)
+    4 -> (2, 0)
+    5 -> (2, 1)
+
+    Iterating over the indices directly is cheaper than calling:
+
+    >>> for i, index in enumerate(idx2d):
+    ...     print(i, '->', index)
+    ...
+    0 -> (0, 0)
+    1 -> (0, 1)
+    2 -> (1, 0)
+    3 -> (1, 1)
+    4 -> (2, 0)
+    5 -> (2, 1)
+
+    Sequence like access:
+
+    >>> len(idx2d), idx2d[-1], (1, 1) in idx2d, idx2d.index((2, 0))
+    (6, (2, 1), True, 4)
+
+    >>> list(idx2d[1::2])
+    [(0, 1), (1, 1), (2, 1)]
+    """
+
+    __slots__ = ("_shape", "_rows", "_columns")
+
+    @property
+    def shape(self):
+        """Tuple representing the shape of the Index2D object."""
+        return self._shape
+
+    def __init__(self, shape):
+        self._shape = shape
+        self._rows, self._columns = shape
+
+    def __call__(self, number):
+        """Make the :class:`~ittools.Index2D` objects callable.
+
+        Parameters
+        ----------
+        number : ~numbers.Number
+            The 1 d index/number to be mapped to a 2d index.
+
+        Returns
+        -------
+        tuple
+            the 1d enumerate position mapped to a (row, column) 2d tuple
+
+        """
+        return divmod(number, self._columns)
+
+    def __len__(self):
+        """Return the number of 2d indices covered by the shape."""
+        return self._rows * self._columns
+
+    def __getitem__(self, key):
+        """Return the 2d index at position key (or a lazy view if sliced)."""
+        if isinstance(key, slice):
+            return _MappedRange(range(len(self))[key], self)
+
+        position = operator.index(key)
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(f"position {key} out of range for {self._shape}")
+        return divmod(position, self._columns)
+
+    def __iter__(self):
+        """Step through the 2d indices without dividing."""
+        return product(range(self._rows), range(self._columns))
+
+    def __reversed__(self):
+        """Step through the 2d indices in reversed order without dividing."""
+        return product(reversed(range(self._rows)), reversed(range(self._columns)))
+
+    def __contains__(self, index):
+        """Check in constant time whether index is a 2d index of the shape."""
+        return self._coordinates(index) is not None
+
+    def _coordinates(self, index):
+        """Return index as (row, column) integers, None if not of the shape.
+
+        Parameters
+        ----------
+        index : tuple
+            The (row, column) 2d index to be checked.
+
+        Returns
+        -------
+        tuple, None
+            The row and column as :class:`int` or None if
+            :paramref:`~Index2D._coordinates.index` is no 2d index of the
+            shape (i.e. out of range or not integral).
+        """
+        try:
+            row, column = map(operator.index, index)
+        except (TypeError, ValueError):
+            return None
+        if 0 <= row < self._rows and 0 <= column < self._columns:
+            return row, column
+        return None
+
+    def index(self, value, start=0, stop=None):
+        """Return the 1d position of a 2d index in constant time.
+
+        Parameters
+        ----------
+        value : tuple
+            The (row, column) 2d index to be looked up.
+
+        start : int, default=0
+            Position the search starts at.
+
+        stop : int, default=None
+            Position the search stops at.
+
+        Returns
+        -------
+        int
+            The 1d position of :paramref:`~Index2D.index.value`
+
+        Raises
+        ------
+        ValueError
+            If :paramref:`~Index2D.index.value` is not in the searched range.
+        """
+        coordinates = self._coordinates(value)
+        if coordinates is not None:
+            position = coordinates[0] * self._columns + coordinates[1]
+            if position in range(len(self))[start:stop]:
+                return position
+        raise ValueError(f"{value!r} is not in {type(self).__name__}")
+
+    def count(self, value):
+        """Return the number of occurrences of value (0 or 1).
+
+        Parameters
+        ----------
+        value : tuple
+            The (row, column) 2d index to be counted.
+
+        Returns
+        -------
+        int
+            ``1`` if :paramref:`~Index2D.count.value` is a 2d index of the
+            shape, ``0`` otherwise.
+        """
+        return int(value in self)
+
+    def batch(self, numbers):
+        """Map many 1d positions to 2d indices at once.
+
+        See :func:`~ittools.enum_to_2dix_batch` for details.
+
+        Parameters
+        ----------
+        numbers : ~numpy.ndarray, range, slice
+            Integer array, range or slice of the 1d positions to be mapped.
+
+        Returns
+        -------
+        tuple
+            2-tuple of integer arrays as in ``(rows, columns)``
+
+        Examples
+        --------
+        >>> rows, columns = Index2D((3, 2)).batch(range(1, 6, 2))
+        >>> rows.tolist(), columns.tolist()
+        ([0, 1, 2], [1, 1, 1])
+        """
+        return enum_to_2dix_batch(numbers, self.shape)
+
+
+class _MappedRange(collections.abc.Sequence):
+    """Lazy sequence of a callable mapped onto a range.
+
+    Parameters
+    ----------
+    positions : range
+        Range of the positions to be mapped.
+
+    func : ~collections.abc.Callable
+        Callable mapping a position onto the item.
+    """
+
+    __slots__ = ("_positions", "_func")
+
+    def __init__(self, positions, func):
+        self._positions = positions
+        self._func = func
 
-    This implies however, that you can actually use infinite
-    :paramref:`~enum_to_2dix.number` arguments altough your
-    :paramref:`~enum_to_2dix.shape` might imply only 3 rows.
+    def __len__(self):
+        """Return the number of mapped positions."""
+        return len(self._positions)
 
-    Examples
-    --------
-    Mapping ``range(6)`` to a 3,2 dimenstion array:
+    def __getitem__(self, key):
+        """Return the mapped item at key (or a lazy view if sliced)."""
+        if isinstance(key, slice):
+            return _MappedRange(self._positions[key], self._func)
+        return self._func(self._positions[key])
 
-    >>> for i in range(6):
-    ...     print(i, '->', enum_to_2dix(i, (3,2)))
-    0 -> (0, 0)
-    1 -> (0, 1)
-    2 -> (1, 0)
-    3 -> (1, 1)
-    4 -> (2, 0)
-    5 -> (2, 1)
+    def __iter__(self):
+        """Iterate over the mapped items."""
+        return map(self._func, self._positions)
 
-    Mapping ``range(12)`` to a 3,4 dimenstion array:
+    def __reversed__(self):
+        """Iterate over the mapped items in reversed order."""
+        return map(self._func, reversed(self._positions))
 
-    >>> for i in range(12):
-    ...     print(i, '->', enum_to_2dix(i, (3,4)))
-    0 -> (0, 0)
-    1 -> (0, 1)
-    2 -> (0, 2)
-    3 -> (0, 3)
-    4 -> (1, 0)
-    5 -> (1, 1)
-    6 -> (1, 2)
-    7 -> (1, 3)
-    8 -> (2, 0)
-    9 -> (2, 1)
-    10 -> (2, 2)
-    11 -> (2, 3)
-    """
-    column = shape[1]
-    return (math.floor(number / column), number % column)
 
+class IndexND:
+    """Construct a callable object that maps a number to a n-dimensional index.
 
-class Index2D:
-    """Construct a callable object that maps a number to a 2d index.
+    N-dimensional generalization of :class:`Index2D` using pure integer
+    arithmetic, so arbitrarily large positions are mapped exactly.
 
     Parameters
     ----------
-    shape : 2-tuple
-        tuple defining an array's 2d shape as in ``(rows, columns)``
+    shape : tuple
+        tuple defining an array's shape as in ``(rows, columns, ...)``
 
-    Returns
-    -------
-    tuple
-        the 1d enumerate position mapped to a (row, column) 2d tuple
+    order : str, default="C"
+        ``"C"`` for row-major (last index varies fastest) or ``"F"`` for
+        column-major (first index varies fastest) memory layout.
+
+    check_bounds : bool, default=False
+        If ``True`` an :class:`IndexError` is raised for positions and
+        indices outside of :paramref:`~IndexND.shape`. If ``False``, the
+        slowest varying dimension is treated as unbounded (as done by
+        :func:`enum_to_2dix`).
+
+    Raises
+    ------
+    ValueError
+        If :paramref:`~IndexND.order` is unknown or any but the slowest
+        varying dimension of :paramref:`~IndexND.shape` is of length zero
+        (positions could not be mapped).
 
     Examples
     --------
-    >>> idx2d = Index2D((3, 2))
-    >>> for i in range(6):
-    ...     print(i, '->', idx2d(i))
+    >>> idxnd = IndexND((2, 2, 3))
+    >>> for i in (0, 1, 3, 11):
+    ...     print(i, '->', idxnd(i))
     ...
-    0 -> (0, 0)
-    1 -> (0, 1)
-    2 -> (1, 0)
-    3 -> (1, 1)
-    4 -> (2, 0)
-    5 -> (2, 1)
+    0 -> (0, 0, 0)
+    1 -> (0, 0, 1)
+    3 -> (0, 1, 0)
+    11 -> (1, 1, 2)
+
+    Using fortran (column-major) order:
+
+    >>> IndexND((2, 2, 3), order="F")(3)
+    (1, 1, 0)
+
+    Mapping an index back to its position:
+
+    >>> idxnd.ravel((1, 1, 2))
+    11
     """
 
     @property
     def shape(self):
-        """Tuple representing the shape of the Index2D object."""
+        """Tuple representing the shape of the IndexND object."""
         return self._shape
 
-    def __init__(self, shape):
-        self._shape = shape
+    @property
+    def order(self):
+        """Memory layout order of the IndexND object (``"C"`` or ``"F"``)."""
+        return self._order
+
+    @property
+    def strides(self):
+        """Tuple of the position increment per step along each dimension."""
+        return self._strides
+
+    @property
+    def size(self):
+        """Number of positions covered by the IndexND object's shape."""
+        return self._size
+
+    def __init__(self, shape, order="C", check_bounds=False):
+        if order not in ("C", "F"):
+            raise ValueError(f"order must be 'C' or 'F', not {order!r}")
+
+        self._shape = tuple(operator.index(dim) for dim in shape)
+        self._order = order
+        self.check_bounds = check_bounds
+
+        # axes sorted from the slowest to the fastest varying one:
+        axes = list(range(len(self._shape)))
+        if order == "F":
+            axes.reverse()
+
+        strides = [0] * len(self._shape)
+        stride = 1
+        for axis in reversed(axes):
+            strides[axis] = stride
+            stride *= self._shape[axis]
+
+        if 0 in strides:
+            raise ValueError(
+                f"only the slowest varying axis of {self._shape} may be empty"
+            )
+
+        self._strides = tuple(strides)
+        self._size = stride
+        # (axis, stride) pairs from the slowest to the fastest varying axis
+        self._digits = [(axis, strides[axis]) for axis in axes]
 
     def __call__(self, number):
-        """Make the :class:`~ittools.Index2D` objects callable.
+        """Map a position to its n-dimensional index.
 
         Parameters
         ----------
-        number : ~numbers.Number
-            The 1 d index/number to be mapped to a 2d index.
+        number : int
+            The 1 d index/number to be mapped to a n-dimensional index.
 
         Returns
         -------
         tuple
-            the 1d enumerate position mapped to a (row, column) 2d tuple
+            the 1d enumerate position mapped to a n-dimensional index tuple
+
+        Raises
+        ------
+        IndexError
+            If :attr:`check_bounds` is set and
+            :paramref:`~IndexND.__call__.number` is out of bounds.
+        """
+        number = operator.index(number)
+        if self.check_bounds and not 0 <= number < self._size:
+            raise IndexError(f"position {number} out of bounds for {self._shape}")
+
+        index = [0] * len(self._shape)
+        for axis, stride in self._digits:
+            index[axis], number = divmod(number, stride)
+        return tuple(index)
+
+    def ravel(self, index):
+        """Map a n-dimensional index to its position (inverse of calling).
+
+        Parameters
+        ----------
+        index : tuple
+            The n-dimensional index to be mapped to its 1d position.
+
+        Returns
+        -------
+        int
+            the n-dimensional index mapped to its 1d enumerate position
+
+        Raises
+        ------
+        IndexError
+            If :attr:`check_bounds` is set and
+            :paramref:`~IndexND.ravel.index` is out of bounds.
+        """
+        if len(index) != len(self._shape):
+            raise IndexError(f"index {index} does not match shape {self._shape}")
+        if self.check_bounds and not all(
+            0 <= i < dim for i, dim in zip(index, self._shape)
+        ):
+            raise IndexError(f"index {index} out of bounds for {self._shape}")
+
+        return sum(
+            operator.index(i) * stride for i, stride in zip(index, self._strides)
+        )
+
+    def batch(self, numbers):
+        """Map many positions to n-dimensional indices at once.
+
+        Vectorized counterpart of calling the IndexND object. Requires
+        :mod:`numpy`. Note that numpy's fixed width integers limit the
+        positions to the int64 range.
+
+        Parameters
+        ----------
+        numbers : ~numpy.ndarray, range, slice
+            Integer array, range or slice of the positions to be mapped.
+            Slices are resolved against :attr:`size`.
 
+        Returns
+        -------
+        tuple
+            Tuple of integer arrays, one per dimension.
+
+        Raises
+        ------
+        IndexError
+            If :attr:`check_bounds` is set and any of
+            :paramref:`~IndexND.batch.numbers` is out of bounds.
+
+        Examples
+        --------
+        >>> rows, columns = IndexND((2, 3), order="F").batch(range(6))
+        >>> rows.tolist(), columns.tolist()
+        ([0, 1, 0, 1, 0, 1], [0, 0, 1, 1, 2, 2])
         """
-        return enum_to_2dix(number, self.shape)
+        numbers = _as_array(numbers, self._size)
+        if self.check_bounds and numbers.size:
+            if numbers.min() < 0 or numbers.max() >= self._size:
+                raise IndexError(f"positions out of bounds for {self._shape}")
+
+        index = [None] * len(self._shape)
+        for axis, stride in self._digits:
+            index[axis], numbers = divmod(numbers, stride)
+        return tuple(index)
 
 
-def zip_split(sequence, chunks):
+def zip_split(sequence, chunks, copy=True):
     r"""Split sequence into chunks returning a zipped-like order of elements.
 
     The last :math:`n` chunks will be one item short of the rest, if the
@@ -448,6 +2779,15 @@ def zip_split(sequence, chunks):
         The sequence to split into chunks.
     chunks: int
         The number of splitted sequences created.
+    copy: bool, default=True
+        If ``False``, the chunks are zero-copy strided views of
+        :paramref:`~zip_split.sequence`: :class:`numpy.ndarray` views for
+        arrays, :class:`memoryview` objects for anything supporting the
+        buffer protocol (:class:`bytes`, :class:`bytearray`,
+        :class:`array.array`, ...) and lazy :class:`~collections.abc.Sequence`
+        views for any other :class:`~collections.abc.Sequence` (i.e. lists).
+        Other sliceable objects (i.e. :class:`pandas.Series`) are sliced as
+        when copying.
 
     Yields
     ------
@@ -473,36 +2813,252 @@ def zip_split(sequence, chunks):
     hi hi hi   hi
     hi hi hi None
     hi hi hi None
+
+    Splitting without copying:
+
+    >>> chunks = list(ittools.zip_split(bytearray(b'abcdefg'), 3, copy=False))
+    >>> chunks[0]
+    <memory at 0x...>
+    >>> [bytes(chunk) for chunk in chunks]
+    [b'adg', b'be', b'cf']
+    """
+    if _METRICS.enabled:
+        return _METRICS.count("zip_split", _zip_split(sequence, chunks, copy))
+    return _zip_split(sequence, chunks, copy)
+
+
+def _zip_split(sequence, chunks, copy):
+    """Yield the chunks of :func:`zip_split`.
+
+    Parameters
+    ----------
+    sequence: ~collections.abc.Sequence
+        See :paramref:`zip_split.sequence`.
+    chunks: int
+        See :paramref:`zip_split.chunks`.
+    copy: bool
+        See :paramref:`zip_split.copy`.
+
+    Yields
+    ------
+    ~collections.abc.Sequence
+        The chunks.
     """
+    if copy:
+        for i in range(chunks):
+            yield sequence[i::chunks]
+        return
+
+    if isinstance(sequence, _loaded_types("numpy", "ndarray")):
+        view = sequence  # slicing arrays creates views already
+    else:
+        try:
+            view = memoryview(sequence)
+        except TypeError:
+            if isinstance(sequence, collections.abc.Sequence):
+                view = _MappedRange(range(len(sequence)), sequence.__getitem__)
+            else:  # i.e. pandas objects, indexing them by label not position
+                view = sequence
+
     for i in range(chunks):
-        yield sequence[i::chunks]
+        yield view[i::chunks]
+
+
+def _await_reader(owners, index, thread, drained):
+    """Wait for another thread to read output index of zip_split_stream.
+
+    Parameters
+    ----------
+    owners: list
+        Threads that read the outputs last, None for outputs yet to be read.
+    index: int
+        Index of the output whose buffer is full.
+    thread: ~threading.Thread
+        The thread waiting for the output to be read.
+    drained: ~threading.Condition
+        Condition notified whenever an output consumed an item. Must be held.
+
+    Returns
+    -------
+    bool
+        False if no other thread is going to read the output, True after
+        waiting for it.
+    """
+    owner = owners[index]
+    if owner is None:  # maybe its thread is yet to start reading
+        return drained.wait(_STREAM_GRACE) or owners[index] is not None
+    if owner is thread or not owner.is_alive():
+        return False
+    drained.wait(_STREAM_GRACE)  # recheck whether owner is still alive
+    return True
+
+
+def zip_split_stream(iterable, chunks, maxsize=None):
+    """Split any iterable into lazy iterators of zipped-like order in one pass.
+
+    Streaming counterpart of :func:`zip_split`, working on one-shot
+    iterators, generators and unbounded streams without materializing them.
+    Item ``i`` of :paramref:`~zip_split_stream.iterable` is handed to output
+    ``i % chunks``. Items pulled from the source on behalf of other outputs
+    are buffered until those outputs consume them. The outputs may be
+    consumed by different threads.
+
+    Parameters
+    ----------
+    iterable: ~collections.abc.Iterable
+        The iterable to split into chunks.
+    chunks: int
+        The number of lazy iterators created.
+    maxsize: int, None, default=None
+        Maximum number of items buffered per output. An output pulling an
+        item for a full buffer waits while the buffer's output is consumed
+        by another live thread. If that output was last consumed by the
+        same thread or by a thread that has finished, it can't catch up and
+        a :class:`RuntimeError` is raised instead. An output nobody has
+        consumed yet is given a short grace period to be picked up by
+        another thread before raising. If None, buffers are unbounded.
+        Outputs consumed in lockstep (i.e. using :func:`zip`) never buffer
+        more than one item.
+
+    Returns
+    -------
+    list
+        List of :paramref:`~zip_split_stream.chunks` lazy iterators.
 
+    Examples
+    --------
+    >>> import itertools
+    >>> evens, odds = zip_split_stream(itertools.count(), 2, maxsize=10)
+    >>> next(evens), next(evens), next(odds)
+    (0, 2, 1)
+
+    >>> [list(chunk) for chunk in zip_split_stream(iter(range(10)), 3)]
+    [[0, 3, 6, 9], [1, 4, 7], [2, 5, 8]]
+    """
+    source = iter(iterable)
+    buffers = [collections.deque() for _ in range(chunks)]
+    owners = [None] * chunks  # threads that consumed the outputs last
+    turn = [0]  # index of the output the next source item belongs to
+    drained = threading.Condition()
+
+    def full(index, thread):
+        """Return whether output index's buffer is full, waiting if possible."""
+        if maxsize is None or len(buffers[index]) < maxsize:
+            return False
+        if not _await_reader(owners, index, thread, drained):
+            raise RuntimeError(f"output {index} lags more than {maxsize} items")
+        return True
+
+    def output(index):
+        buffer = buffers[index]
+        while True:
+            with drained:
+                thread = owners[index] = threading.current_thread()
+                while not buffer:
+                    if turn[0] != index and full(turn[0], thread):
+                        continue
+                    item = next(source, _NOTHING)
+                    if item is _NOTHING:
+                        return
+                    buffers[turn[0]].append(item)
+                    turn[0] = (turn[0] + 1) % chunks
+                item = buffer.popleft()
+                if maxsize is not None:
+                    drained.notify_all()
+            yield item
+
+    return [output(index) for index in range(chunks)]
+
+
+def zip_split_into(iterable, sinks):
+    """Distribute any iterable round-robin onto sinks in a single pass.
+
+    Push counterpart of :func:`zip_split_stream`: item ``i`` of
+    :paramref:`~zip_split_into.iterable` is passed to
+    ``sinks[i % len(sinks)]``. Nothing is buffered. Passing the ``put``
+    method of bounded :class:`queue.Queue` objects lets slow consumers
+    apply backpressure on the source.
+
+    Parameters
+    ----------
+    iterable: ~collections.abc.Iterable
+        The iterable to be distributed.
+    sinks: ~collections.abc.Sequence
+        Sequence of callables each being called with one item at a time
+        (i.e. ``list.append`` or ``queue.Queue.put``).
+
+    Returns
+    -------
+    int
+        Number of items distributed.
+
+    Examples
+    --------
+    >>> shards = [[], [], []]
+    >>> zip_split_into(iter(range(10)), [shard.append for shard in shards])
+    10
+    >>> shards
+    [[0, 3, 6, 9], [1, 4, 7], [2, 5, 8]]
+    """
+    count = 0
+    for count, (sink, item) in enumerate(zip(cycle(sinks), iterable), start=1):
+        sink(item)
+    return count
 
-def group(iterable, chunks, fillvalue=None):
+
+def group(  # pylint: disable=too-many-arguments
+    iterable, chunks=None, fillvalue=None, size=None, total=None, pad=True
+):
     """Split iterable into chunks.
 
     If the number of items in :paramref:`~group.iterable` is not an integer
     multiple of :paramref:`~group.chunks`, the
     last chunk is filled using :paramref:`~group.fillvalue`.
 
+    Items are pulled from :paramref:`~group.iterable` lazily, one chunk at a
+    time. So database cursors, generators and alike are grouped in constant
+    memory, given either the chunk :paramref:`~group.size` or the
+    :paramref:`~group.total` number of items is known.
+
     Parameters
     ----------
     iterable: ~collections.abc.Iterable
         The iterable to split into groups.
 
-    chunks: int
-        The number of groups created
+    chunks: int, None, default=None
+        The number of groups created. Requires the number of items to be
+        known, either by :func:`len`, :func:`operator.length_hint` or
+        :paramref:`~group.total`. Mutually exclusive with
+        :paramref:`~group.size`.
 
     fillvalue: ~numbers.Number, None, default = None
         The last chunk is filled with this in case the number of items in
         :paramref:`~group.iterable` is not an integer multiple of
         :paramref:`~group.chunks`
 
+    size: int, None, default=None
+        The number of items per group. Works without knowing the number of
+        items. Mutually exclusive with :paramref:`~group.chunks`.
+
+    total: int, None, default=None
+        The number of items in :paramref:`~group.iterable`, for unsized
+        streams grouped into :paramref:`~group.chunks`.
+
+    pad: bool, default=True
+        If ``False``, the last chunk is left short instead of being filled
+        with :paramref:`~group.fillvalue`.
+
     Returns
     -------
     :class:`~collections.abc.Generator`
         A generator object yielding the groups.
 
+    Raises
+    ------
+    TypeError
+        If the number of items can not be determined when grouping into
+        :paramref:`~group.chunks`.
+
     Note
     ----
     Credit to https://stackoverflow.com/a/434411
@@ -527,7 +3083,525 @@ def group(iterable, chunks, fillvalue=None):
     1 5 9.0
     2 6 NaN
     3 7 NaN
+
+    See :func:`group_array` for grouping arrays into 2D arrays instead of
+    tuples.
+
+    Grouping a stream of unknown length by chunk size, leaving the last
+    chunk short:
+
+    >>> stream = (i for i in range(10))
+    >>> print(list(ittools.group(stream, size=4, pad=False)))
+    [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9)]
+
+    Grouping a stream of known length into chunks:
+
+    >>> stream = (i for i in range(10))
+    >>> print(list(ittools.group(stream, chunks=3, total=10, fillvalue=-1)))
+    [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9, -1, -1)]
+    """
+    if (chunks is None) == (size is None):
+        raise TypeError("group requires either chunks or size")
+
+    if size is None:
+        if total is None:
+            total = operator.length_hint(iterable, -1)
+            if total < 0:
+                raise TypeError(
+                    f"can't determine the length of {type(iterable).__name__!r}"
+                    ", pass total or size"
+                )
+        size = math.ceil(total / chunks)
+
+    if pad:
+        args = [iter(iterable)] * size
+        groups = zip_longest(*args, fillvalue=fillvalue)
+    else:
+        iterator = iter(iterable)
+        groups = iter(lambda: tuple(islice(iterator, size)), ())
+
+    if _METRICS.enabled:
+        return _METRICS.count("group", groups)
+    return groups
+
+
+def window(iterable, size, step=1):
+    """Return overlapping windows of size, every step items.
+
+    Overlapping counterpart of :func:`group`. Iterables are read once
+    through a ring buffer (a :class:`~collections.deque`), so windows are
+    not re-sliced from the source and unbounded streams can be windowed.
+    :class:`numpy.ndarray` are windowed along the first axis using
+    :func:`~numpy.lib.stride_tricks.sliding_window_view`, returning a
+    (read-only) view without copying.
+
+    Only complete windows are returned, trailing items not filling a window
+    are dropped.
+
+    Parameters
+    ----------
+    iterable: ~collections.abc.Iterable, ~numpy.ndarray
+        The iterable to be windowed.
+    size: int
+        The number of items per window.
+    step: int, default=1
+        The number of items the windows are apart. Windows overlap if
+        :paramref:`~window.step` is smaller than :paramref:`~window.size`
+        and skip items if it is larger.
+
+    Returns
+    -------
+    ~collections.abc.Iterator, ~numpy.ndarray
+        Iterator of tuples or, for arrays, a view of shape
+        ``(windows, size, ...)``.
+
+    Raises
+    ------
+    ValueError
+        If :paramref:`~window.size` or :paramref:`~window.step` are not
+        positive.
+
+    Examples
+    --------
+    >>> list(window(range(6), 3))
+    [(0, 1, 2), (1, 2, 3), (2, 3, 4), (3, 4, 5)]
+
+    >>> list(window(iter(range(7)), 2, step=3))
+    [(0, 1), (3, 4)]
+
+    Arrays are windowed without copying:
+
+    >>> import numpy as np
+    >>> signal = np.arange(6)
+    >>> windows = window(signal, 4, step=2)
+    >>> windows
+    array([[0, 1, 2, 3],
+           [2, 3, 4, 5]])
+    >>> np.shares_memory(windows, signal)
+    True
+    """
+    if size < 1 or step < 1:
+        raise ValueError(f"size and step must be positive, not {size} and {step}")
+
+    if isinstance(iterable, _loaded_types("numpy", "ndarray")):
+        return _window_array(iterable, size, step)
+
+    windows = _window_iterator(iter(iterable), size, step)
+    if _METRICS.enabled:
+        return _METRICS.count("window", windows)
+    return windows
+
+
+def _window_array(array, size, step):
+    """Return a view of the windows of an array along its first axis.
+
+    Parameters
+    ----------
+    array: ~numpy.ndarray
+        The array to be windowed.
+    size: int
+        The number of items per window.
+    step: int
+        The number of items the windows are apart.
+
+    Returns
+    -------
+    ~numpy.ndarray
+        View of shape ``(windows, size, ...)``.
+    """
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    if len(array) < size:
+        return np.empty((0, size, *array.shape[1:]), dtype=array.dtype)
+    # the window axis is appended last, move it next to the windows
+    return np.moveaxis(sliding_window_view(array, size, axis=0)[::step], -1, 1)
+
+
+def _window_iterator(iterator, size, step):
+    """Yield the windows of an iterator using a ring buffer.
+
+    Parameters
+    ----------
+    iterator: ~collections.abc.Iterator
+        The iterator to be windowed.
+    size: int
+        The number of items per window.
+    step: int
+        The number of items the windows are apart.
+
+    Yields
+    ------
+    tuple
+        The windows.
+    """
+    ring = collections.deque(islice(iterator, size), maxlen=size)
+    if len(ring) < size:
+        return
+    yield tuple(ring)
+
+    if step == 1:
+        append = ring.append
+        for item in iterator:
+            append(item)
+            yield tuple(ring)
+        return
+
+    while True:
+        items = tuple(islice(iterator, step))
+        if len(items) < step:
+            return
+        ring.extend(items)  # drops the items that left the window
+        yield tuple(ring)
+
+
+def group_array(  # pylint: disable=too-many-arguments
+    data, chunks=None, fillvalue=None, size=None, masked=False, dtype=None
+):
+    """Split an array into a padded 2D array of chunks.
+
+    Array counterpart of :func:`group` grouping along the first axis. Returns
+    a view of :paramref:`~group_array.data` reshaped to ``(chunks, size)``
+    if no padding is needed. Otherwise copies once into an array of the
+    same dtype padded with :paramref:`~group_array.fillvalue` or masked.
+    Requires :mod:`numpy`.
+
+    Parameters
+    ----------
+    data: ~numpy.ndarray, range, ~collections.abc.Sequence
+        Array (or anything :func:`numpy.asarray` accepts) to be grouped.
+
+    chunks: int, None, default=None
+        The number of groups created. Mutually exclusive with
+        :paramref:`~group_array.size`.
+
+    fillvalue: ~numbers.Number, None, default = None
+        Used to fill the last chunk in case the number of items is not an
+        integer multiple of :paramref:`~group_array.chunks`. Cast to
+        :paramref:`~group_array.dtype`. If None, inexact dtypes are filled
+        with ``NaN`` (``NaT`` for datetimes, ``None`` for objects), other
+        dtypes require either a fillvalue or :paramref:`~group_array.masked`.
+
+    size: int, None, default=None
+        The number of items per group. Mutually exclusive with
+        :paramref:`~group_array.chunks`.
+
+    masked: bool, default=False
+        If ``True``, a :class:`numpy.ma.MaskedArray` is returned with the
+        padding being masked.
+
+    dtype: ~numpy.dtype, None, default=None
+        Dtype of the returned array. Defaults to the dtype of
+        :paramref:`~group_array.data`.
+
+    Returns
+    -------
+    ~numpy.ndarray
+        Array of shape ``(chunks, size, ...)``.
+
+    Raises
+    ------
+    TypeError
+        If neither or both of :paramref:`~group_array.chunks` and
+        :paramref:`~group_array.size` are given.
+
+    ValueError
+        If padding is needed but no fillvalue is known for the dtype.
+
+    Examples
+    --------
+    Integer multiples are reshaped without copying:
+
+    >>> group_array(range(6), chunks=3)
+    array([[0, 1],
+           [2, 3],
+           [4, 5]])
+
+    Padding keeps the dtype:
+
+    >>> group_array(range(5), size=2, fillvalue=-1)
+    array([[ 0,  1],
+           [ 2,  3],
+           [ 4, -1]])
+
+    >>> group_array(range(5), size=2, masked=True)
+    masked_array(
+      data=[[0, 1],
+            [2, 3],
+            [4, --]],
+      mask=[[False, False],
+            [False, False],
+            [False,  True]],
+      fill_value=999999)
+
+    Columns of a table, as with :func:`group`:
+
+    >>> group_array(range(10), 3, dtype=float).T
+    array([[ 0.,  4.,  8.],
+           [ 1.,  5.,  9.],
+           [ 2.,  6., nan],
+           [ 3.,  7., nan]])
+    """
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    if (chunks is None) == (size is None):
+        raise TypeError("group_array requires either chunks or size")
+
+    data = _as_array(data)
+    if dtype is not None:
+        data = data.astype(dtype, copy=False)
+
+    length = len(data)
+    if size is None:
+        size = math.ceil(length / chunks)
+    rows = math.ceil(length / size) if size else 0
+    padding = rows * size - length
+
+    if not padding:
+        grouped = data.reshape(rows, size, *data.shape[1:])
+        return np.ma.MaskedArray(grouped) if masked else grouped
+
+    if fillvalue is None:
+        # masked padding just needs some valid value of the dtype
+        fillvalue = np.zeros((), data.dtype) if masked else _missing_value(data.dtype)
+
+    padded = np.empty((rows * size, *data.shape[1:]), dtype=data.dtype)
+    padded[:length] = data
+    padded[length:] = fillvalue
+    padded = padded.reshape(rows, size, *data.shape[1:])
+
+    if masked:
+        mask = np.zeros(padded.shape, dtype=bool)
+        mask.reshape(rows * size, -1)[length:] = True
+        return np.ma.MaskedArray(padded, mask=mask)
+    return padded
+
+
+def _missing_value(dtype):
+    """Return the value representing missing data for a dtype.
+
+    Parameters
+    ----------
+    dtype : ~numpy.dtype
+        Dtype of which the missing value is to be returned.
+
+    Returns
+    -------
+    object
+        ``NaN`` for inexact, ``NaT`` for datetime and ``None`` for object
+        dtypes.
+
+    Raises
+    ------
+    ValueError
+        If the dtype has no value representing missing data.
     """
-    length = math.ceil(len(iterable) / chunks)
-    args = [iter(iterable)] * length
-    return zip_longest(*args, fillvalue=fillvalue)
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+
+    if dtype.kind in "fc":
+        return np.nan
+    if dtype.kind in "mM":
+        return np.datetime64("NaT") if dtype.kind == "M" else np.timedelta64("NaT")
+    if dtype.kind == "O":
+        return None
+    raise ValueError(
+        f"{dtype} has no missing value, pass a fillvalue or use masked=True"
+    )
+
+
+class Batcher:
+    """Collect items into batches flushed by size, weight or latency.
+
+    Latency bounded counterpart of :func:`group` for streaming services:
+    a batch is flushed as soon as it holds :paramref:`~Batcher.size` items,
+    reaches :paramref:`~Batcher.max_weight` or :paramref:`~Batcher.latency`
+    seconds passed since its first item was added, whichever comes first.
+
+    Batches are passed to :paramref:`~Batcher.flush` in order by a
+    background thread, so :meth:`add` does not wait for flushing, unless
+    more than :paramref:`~Batcher.max_pending` batches wait for being
+    flushed (backpressure). Errors raised by :paramref:`~Batcher.flush`
+    stop the Batcher and are re-raised by the next call to :meth:`add` or
+    :meth:`close`.
+
+    Parameters
+    ----------
+    flush: ~collections.abc.Callable
+        Callable each batch (a :class:`list`) is passed to, i.e. a bulk
+        write to a database.
+    size: int
+        Maximum number of items per batch.
+    latency: float
+        Maximum number of seconds an item waits for its batch being flushed.
+    max_weight: ~numbers.Number, None, default=None
+        Maximum total weight of a batch (i.e. a byte budget). An item that
+        would exceed it starts a new batch. If None, weight is not tracked.
+    weigher: ~collections.abc.Callable, default=len
+        Callable returning the weight of an item.
+    max_pending: int, default=2
+        Maximum number of batches waiting for being flushed, before
+        :meth:`add` blocks.
+
+    Example
+    -------
+    >>> batches = []
+    >>> with Batcher(batches.append, size=3, latency=60) as batcher:
+    ...     for i in range(7):
+    ...         batcher.add(i)
+    >>> batches
+    [[0, 1, 2], [3, 4, 5], [6]]
+
+    Using a byte budget:
+
+    >>> batches = []
+    >>> with Batcher(batches.append, size=10, latency=60, max_weight=6) as batcher:
+    ...     for word in (b'ab', b'cde', b'fg', b'hijklmn', b'o'):
+    ...         batcher.add(word)
+    >>> batches
+    [[b'ab', b'cde'], [b'fg'], [b'hijklmn'], [b'o']]
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, flush, size, latency, max_weight=None, weigher=len, max_pending=2
+    ):
+        self._flush = flush
+        self.size = size
+        self.latency = latency
+        self.max_weight = max_weight
+        self._weigher = weigher
+        self._max_pending = max_pending
+
+        self._condition = threading.Condition()
+        self._batch = []
+        self._weight = 0
+        self._deadline = None
+        self._pending = collections.deque()
+        self._closed = False
+        self._error = None
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"{type(self).__name__}-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self):
+        """Use as context manager, closing (and flushing) on exit."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the Batcher, flushing the remaining items."""
+        self.close()
+
+    def add(self, item):
+        """Add an item to the current batch.
+
+        Parameters
+        ----------
+        item
+            Item to be added.
+
+        Raises
+        ------
+        RuntimeError
+            If the Batcher is closed.
+        """
+        with self._condition:
+            self._check()
+            weight = 0 if self.max_weight is None else self._weigher(item)
+            if self._batch and self.max_weight is not None:
+                if self._weight + weight > self.max_weight:
+                    self._cut()
+
+            self._batch.append(item)
+            self._weight += weight
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.latency
+                self._condition.notify_all()  # flusher waits for the deadline
+
+            if len(self._batch) >= self.size or (
+                self.max_weight is not None and self._weight >= self.max_weight
+            ):
+                self._cut()
+
+            while len(self._pending) > self._max_pending and self._error is None:
+                self._condition.wait()
+            self._check()
+
+    def flush(self):
+        """Hand the current batch over to be flushed, regardless of its size."""
+        with self._condition:
+            self._check()
+            if self._batch:
+                self._cut()
+
+    def close(self):
+        """Flush the remaining items and stop the Batcher.
+
+        Raises
+        ------
+        Exception
+            Whatever the last call of :paramref:`~Batcher.flush` raised.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _check(self):
+        """Raise if the Batcher can't take items anymore (lock held)."""
+        if self._error is not None:
+            raise self._error
+        if self._closed:
+            raise RuntimeError(f"{type(self).__name__} is closed")
+
+    def _cut(self):
+        """Move the current batch to the pending ones (lock held)."""
+        self._pending.append(self._batch)
+        self._batch = []
+        self._weight = 0
+        self._deadline = None
+        self._condition.notify_all()
+
+    def _next_batch(self):
+        """Wait for the next batch to be flushed (lock held).
+
+        Returns
+        -------
+        list, None
+            The next batch or None, if closed and everything is flushed.
+        """
+        while True:
+            if self._pending:
+                batch = self._pending.popleft()
+                self._condition.notify_all()  # make room for waiting adders
+                return batch
+            if self._batch and (self._closed or time.monotonic() >= self._deadline):
+                self._cut()
+            elif self._closed:
+                return None
+            elif self._batch:
+                self._condition.wait(self._deadline - time.monotonic())
+            else:
+                self._condition.wait()
+
+    def _run(self):
+        """Flush the batches in order (runs in the background thread)."""
+        while True:
+            with self._condition:
+                batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._flush(batch)
+            except BaseException as error:  # pylint: disable=broad-except
+                with self._condition:
+                    self._error = error
+                    self._closed = True
+                    self._pending.clear()
+                    self._condition.notify_all()
+                return
@@ -0,0 +1,189 @@
+"""Opt-in instrumentation of ittools' functions.
+
+Records call counts and cumulative time of :func:`~ittools.depth`,
+:func:`~ittools.nestify` and :func:`~ittools.is_empty` (plus the number of
+containers they visited) as well as the number of items and the time spent
+producing them of the iterators returned by :func:`~ittools.group`,
+:func:`~ittools.window` and :func:`~ittools.zip_split`. Switched off by
+default, costing a single attribute lookup per call then.
+
+.. autosummary::
+   :nosignatures:
+
+   enable
+   disable
+   snapshot
+   reset
+
+Examples
+--------
+>>> import ittools
+>>> from ittools import instrument
+>>> instrument.enable()
+>>> ittools.depth([[1, 2], [3, [4]]])
+3
+>>> chunks = list(ittools.group(range(10), size=5))
+>>> instrument.disable()
+>>> stats = instrument.snapshot()
+>>> stats['depth']['calls'], stats['depth']['nodes']
+(1, 4)
+>>> stats['group']['items']
+2
+>>> instrument.reset()
+"""
+
+import threading
+import time
+
+
+class _Metrics:
+    """Switch and storage of the recorded metrics."""
+
+    def __init__(self):
+        self.enabled = False
+        self.callback = None
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def record(self, name):
+        """Record a call of name, timing the ``with`` block.
+
+        Parameters
+        ----------
+        name: str
+            Name of the function called.
+
+        Returns
+        -------
+        _Recording
+            Context manager returning a dictionary, further metrics of the
+            call can be added to.
+        """
+        return _Recording(self, name)
+
+    def count(self, name, iterator):
+        """Yield the items of iterator, recording their number and time.
+
+        Parameters
+        ----------
+        name: str
+            Name of the function that returned the iterator.
+        iterator: ~collections.abc.Iterator
+            The iterator to be counted.
+
+        Yields
+        ------
+        object
+            The items of :paramref:`~_Metrics.count.iterator`.
+        """
+        items, seconds = 0, 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    seconds += time.perf_counter() - start
+                items += 1
+                yield item
+        finally:
+            self.add(name, {"items": items, "seconds": seconds})
+
+    def add(self, name, record):
+        """Add the metrics of a call to the totals and pass them on.
+
+        Parameters
+        ----------
+        name: str
+            Name of the function called.
+        record: dict
+            The call's metrics.
+        """
+        with self._lock:
+            totals = self._totals.setdefault(name, {"calls": 0})
+            totals["calls"] += 1
+            for key, value in record.items():
+                totals[key] = totals.get(key, 0) + value
+        callback = self.callback
+        if callback is not None:
+            callback(name, record)
+
+    def snapshot(self):
+        """Return a copy of the totals, see :func:`snapshot`."""
+        with self._lock:
+            totals = {name: dict(metrics) for name, metrics in self._totals.items()}
+        for metrics in totals.values():
+            if "items" in metrics and metrics["seconds"] > 0:
+                metrics["items_per_second"] = metrics["items"] / metrics["seconds"]
+        return totals
+
+    def reset(self):
+        """Forget the totals."""
+        with self._lock:
+            self._totals.clear()
+
+
+class _Recording:
+    """Context manager timing a call, see :meth:`_Metrics.record`."""
+
+    __slots__ = ("_metrics", "_name", "_start", "_record")
+
+    def __init__(self, metrics, name):
+        self._metrics = metrics
+        self._name = name
+        self._record = {}
+        self._start = None
+
+    def __enter__(self):
+        """Start timing."""
+        self._start = time.perf_counter()
+        return self._record
+
+    def __exit__(self, *exc_info):
+        """Stop timing and add the call's metrics."""
+        self._record["seconds"] = time.perf_counter() - self._start
+        self._metrics.add(self._name, self._record)
+
+
+_METRICS = _Metrics()
+
+
+def enable(callback=None):
+    """Start recording metrics.
+
+    Parameters
+    ----------
+    callback: ~collections.abc.Callable, None, default=None
+        Called with the function's name and a dictionary of the call's
+        metrics (i.e. ``seconds`` and ``nodes`` or ``items``) after each
+        recorded call, i.e. to forward them to a metrics system. For
+        iterators the call is recorded once they are exhausted (or closed).
+    """
+    _METRICS.callback = callback
+    _METRICS.enabled = True
+
+
+def disable():
+    """Stop recording metrics (the recorded ones are kept)."""
+    _METRICS.enabled = False
+    _METRICS.callback = None
+
+
+def snapshot():
+    """Return the metrics recorded so far.
+
+    Returns
+    -------
+    dict
+        Dictionary of function names and their metrics: ``calls``,
+        cumulative ``seconds`` and ``nodes`` (containers visited) or
+        ``items`` (items produced) and ``items_per_second``.
+    """
+    return _METRICS.snapshot()
+
+
+def reset():
+    """Forget the metrics recorded so far."""
+    _METRICS.reset()
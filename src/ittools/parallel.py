@@ -0,0 +1,309 @@
+"""Run work split by ittools' splitters in parallel.
+
+Dispatches the chunks created by :func:`~ittools.core.group` or
+:func:`~ittools.core.zip_split` to a pool of workers and reassembles the
+results in the original element order.
+
+.. autosummary::
+   :nosignatures:
+
+   parallel_map_chunks
+"""
+
+import math
+from itertools import chain
+
+from .core import _loaded_types, group, zip_split
+
+_SPLITS = ("group", "zip")
+
+
+def parallel_map_chunks(  # pylint: disable=too-many-arguments
+    func, data, chunks, executor="process", split="group", max_workers=None
+):
+    """Map func onto chunks of data in parallel and reassemble the results.
+
+    :paramref:`~parallel_map_chunks.data` is split into
+    :paramref:`~parallel_map_chunks.chunks` using :func:`~ittools.group`
+    (consecutive chunks) or :func:`~ittools.zip_split` (interleaved chunks).
+    Each chunk is passed to :paramref:`~parallel_map_chunks.func`, which has
+    to return one result per element of its chunk. The results are
+    reassembled in the original element order.
+
+    :class:`numpy.ndarray` input dispatched to processes is passed through
+    :mod:`multiprocessing.shared_memory` instead of being pickled. Workers
+    receive (read-only by convention) views of their chunk.
+
+    Parameters
+    ----------
+    func: ~collections.abc.Callable
+        Callable mapping a chunk onto a sequence of the same length. Needs
+        to be picklable (i.e. a module level function) when using processes.
+    data: ~collections.abc.Iterable
+        Data to be split into chunks. Iterables that are not sequences are
+        materialized first.
+    chunks: int
+        The number of chunks created.
+    executor: str, ~concurrent.futures.Executor, default="process"
+        ``"process"`` or ``"thread"`` to run the chunks on a new
+        :class:`~concurrent.futures.ProcessPoolExecutor` or
+        :class:`~concurrent.futures.ThreadPoolExecutor`. An existing executor
+        is used as is (and not shut down).
+    split: str, default="group"
+        ``"group"`` for consecutive chunks as created by
+        :func:`~ittools.group` or ``"zip"`` for interleaved chunks as created
+        by :func:`~ittools.zip_split`.
+    max_workers: int, None, default=None
+        Maximum number of workers of a newly created executor.
+
+    Returns
+    -------
+    list, ~numpy.ndarray
+        The results in the order of :paramref:`~parallel_map_chunks.data`.
+        A :class:`numpy.ndarray` if all chunk results are arrays, a
+        :class:`list` otherwise.
+
+    Raises
+    ------
+    ValueError
+        If :paramref:`~parallel_map_chunks.split` or
+        :paramref:`~parallel_map_chunks.executor` are unknown, or if a
+        chunk's result does not match the chunk's length.
+
+    Examples
+    --------
+    >>> from ittools.parallel import parallel_map_chunks
+    >>> parallel_map_chunks(sorted, [3, 1, 2, 6, 5, 4], 2, executor="thread")
+    [1, 2, 3, 4, 5, 6]
+
+    Interleaved chunks are reassembled in their original order as well:
+
+    >>> import numpy as np
+    >>> parallel_map_chunks(
+    ...     np.negative, np.arange(7), 3, executor="thread", split="zip")
+    array([ 0, -1, -2, -3, -4, -5, -6])
+    """
+    # pylint: disable=import-outside-toplevel
+    from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+    if split not in _SPLITS:
+        raise ValueError(f"split must be one of {_SPLITS}, not {split!r}")
+
+    if isinstance(executor, Executor):
+        return _map_chunks(func, data, chunks, executor, split)
+
+    pools = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+    if executor not in pools:
+        raise ValueError(f"executor must be one of {tuple(pools)}, not {executor!r}")
+
+    with pools[executor](max_workers=max_workers) as pool:
+        return _map_chunks(func, data, chunks, pool, split)
+
+
+def _map_chunks(func, data, chunks, executor, split):
+    """Dispatch the chunks of data to executor and reassemble the results.
+
+    Parameters
+    ----------
+    func: ~collections.abc.Callable
+        Callable mapping a chunk onto a sequence of the same length.
+    data: ~collections.abc.Iterable
+        Data to be split into chunks.
+    chunks: int
+        The number of chunks created.
+    executor: ~concurrent.futures.Executor
+        Executor the chunks are dispatched to.
+    split: str
+        ``"group"`` or ``"zip"``.
+
+    Returns
+    -------
+    list, ~numpy.ndarray
+        The results in the order of :paramref:`~_map_chunks.data`.
+    """
+    # pylint: disable=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor
+
+    if isinstance(data, _loaded_types("numpy", "ndarray")):
+        selections = _selections(len(data), chunks, split)
+        lengths = [len(range(len(data))[sel]) for sel in selections]
+        if isinstance(executor, ProcessPoolExecutor) and not data.dtype.hasobject:
+            results = _map_shared(func, data, selections, executor)
+        else:
+            futures = [executor.submit(func, data[sel]) for sel in selections]
+            results = [future.result() for future in futures]
+        return _reassemble(results, lengths, split)
+
+    if not hasattr(data, "__getitem__") or not hasattr(data, "__len__"):
+        data = list(data)
+
+    if split == "zip":
+        parts = list(zip_split(data, chunks))
+    else:
+        parts = list(group(data, chunks, pad=False))
+    futures = [executor.submit(func, part) for part in parts]
+    results = [future.result() for future in futures]
+    return _reassemble(results, [len(part) for part in parts], split)
+
+
+def _selections(length, chunks, split):
+    """Return the slices selecting the chunks, matching the splitters.
+
+    Parameters
+    ----------
+    length: int
+        Number of elements to be split.
+    chunks: int
+        The number of chunks created.
+    split: str
+        ``"group"`` or ``"zip"``.
+
+    Returns
+    -------
+    list
+        List of :class:`slice` objects, one per chunk.
+    """
+    if split == "zip":
+        return [slice(i, None, chunks) for i in range(chunks)]
+    size = math.ceil(length / chunks)
+    return [slice(start, start + size) for start in range(0, length, size or 1)]
+
+
+def _map_shared(func, data, selections, executor):
+    """Map func onto array chunks passed to processes via shared memory.
+
+    Parameters
+    ----------
+    func: ~collections.abc.Callable
+        Callable mapping a chunk onto a sequence of the same length.
+    data: ~numpy.ndarray
+        Array to be split into chunks.
+    selections: list
+        List of :class:`slice` objects, one per chunk.
+    executor: ~concurrent.futures.ProcessPoolExecutor
+        Executor the chunks are dispatched to.
+
+    Returns
+    -------
+    list
+        The chunk's results.
+    """
+    # pylint: disable=import-outside-toplevel
+    from multiprocessing.shared_memory import SharedMemory
+
+    import numpy as np
+
+    memory = SharedMemory(create=True, size=max(data.nbytes, 1))
+    try:
+        shared = np.ndarray(data.shape, dtype=data.dtype, buffer=memory.buf)
+        shared[...] = data
+        del shared  # release the buffer, so memory can be closed
+
+        futures = [
+            executor.submit(
+                _map_shared_chunk, func, memory.name, data.shape, data.dtype, sel
+            )
+            for sel in selections
+        ]
+        return [future.result() for future in futures]
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def _map_shared_chunk(  # pylint: disable=too-many-arguments
+    func, name, shape, dtype, selection
+):
+    """Call func on a chunk of an array in shared memory (in a worker).
+
+    Parameters
+    ----------
+    func: ~collections.abc.Callable
+        Callable mapping a chunk onto a sequence of the same length.
+    name: str
+        Name of the shared memory block.
+    shape: tuple
+        Shape of the shared array.
+    dtype: ~numpy.dtype
+        Dtype of the shared array.
+    selection: slice
+        Slice selecting the chunk.
+
+    Returns
+    -------
+    object
+        The chunk's result, copied if it is a view of the shared array.
+    """
+    # pylint: disable=import-outside-toplevel
+    from multiprocessing.shared_memory import SharedMemory
+
+    import numpy as np
+
+    memory = SharedMemory(name=name)
+    shared = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+    try:
+        result = func(shared[selection])
+        if isinstance(result, np.ndarray) and np.shares_memory(result, shared):
+            result = result.copy()
+    finally:
+        del shared
+        try:
+            memory.close()
+        except BufferError:  # pragma: no cover
+            pass  # views are still referenced by a raised exception
+    return result
+
+
+def _reassemble(results, lengths, split):
+    """Reassemble the chunk's results in the original element order.
+
+    Parameters
+    ----------
+    results: list
+        The chunk's results in chunk order.
+    lengths: list
+        The chunk's lengths in chunk order.
+    split: str
+        ``"group"`` or ``"zip"``.
+
+    Returns
+    -------
+    list, ~numpy.ndarray
+        The reassembled results.
+
+    Raises
+    ------
+    ValueError
+        If the result lengths don't match the chunk lengths.
+    """
+    if [len(result) for result in results] != lengths:
+        raise ValueError("chunk results don't match the chunk lengths")
+
+    arrays = results and all(
+        isinstance(result, _loaded_types("numpy", "ndarray")) for result in results
+    )
+
+    if split == "group":
+        if arrays:
+            # pylint: disable=import-outside-toplevel
+            import numpy as np
+
+            return np.concatenate(results)
+        return list(chain.from_iterable(results))
+
+    total = sum(lengths)
+    if arrays:
+        # pylint: disable=import-outside-toplevel
+        import numpy as np
+
+        dtypes = {result.dtype for result in results}
+        reassembled = np.empty(
+            (total, *results[0].shape[1:]), dtype=np.result_type(*dtypes)
+        )
+    else:
+        reassembled = [None] * total
+        results = [list(result) for result in results]
+
+    for i, result in enumerate(results):
+        reassembled[i :: len(results)] = result
+    return reassembled
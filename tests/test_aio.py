@@ -0,0 +1,200 @@
+"""Test asynchronous splitters."""
+import asyncio
+from itertools import count
+
+import pytest
+
+import ittools
+from ittools import aio
+
+
+async def _source(iterable, produced=None):
+    """Yield the items of iterable asynchronously, recording them."""
+    for item in iterable:
+        if produced is not None:
+            produced.append(item)
+        await asyncio.sleep(0)
+        yield item
+
+
+async def _collect(items):
+    """Collect the items of an async iterator."""
+    return [item async for item in items]
+
+
+@pytest.mark.parametrize(("length", "consumers"), [(10, 3), (2, 4), (0, 2)])
+def test_zip_split(length, consumers):
+    """Test ittools.aio.zip_split matching ittools.zip_split."""
+    results = asyncio.run(
+        aio.zip_split(_source(range(length)), consumers * [_collect], maxsize=2)
+    )
+    assert results == list(ittools.zip_split(list(range(length)), consumers))
+
+
+def test_zip_split_backpressure():
+    """Test ittools.aio.zip_split not reading ahead of slow consumers."""
+    produced, lags = [], []
+
+    async def slow(items):
+        consumed = 0
+        async for _item in items:
+            consumed += 1
+            lags.append(len(produced) - 2 * consumed)
+            await asyncio.sleep(0.001)
+        return consumed
+
+    results = asyncio.run(aio.zip_split(_source(range(40), produced), [slow, slow]))
+    assert results == [20, 20]
+    assert max(lags) <= 4
+
+
+def test_zip_split_early_return():
+    """Test ittools.aio.zip_split coping with consumers returning early."""
+
+    async def first(items):
+        async for item in items:
+            return item
+        return None  # pragma: no cover
+
+    async def main():
+        endless = aio.zip_split(_source(count()), [first, _collect, first])
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(endless, timeout=0.05)
+        return await aio.zip_split(_source(count()), [first, first])
+
+    assert asyncio.run(main()) == [0, 1]
+    assert asyncio.run(aio.zip_split(_source(range(7)), [first, _collect])) == [
+        0,
+        [1, 3, 5],
+    ]
+
+
+def test_zip_split_early_return_pending_items():
+    """Test ittools.aio.zip_split dropping items queued for returned consumers."""
+    produced = []
+
+    async def first(items):
+        async for item in items:
+            await asyncio.sleep(0)  # let the producer queue the next item
+            return item
+        return None  # pragma: no cover
+
+    assert asyncio.run(aio.zip_split(_source(count(), produced), [first])) == [0]
+    assert produced[:2] == [0, 1]
+
+
+def test_zip_split_consumer_error():
+    """Test ittools.aio.zip_split propagating consumer errors."""
+    cancelled = []
+
+    async def failing(items):
+        async for _item in items:
+            raise KeyError("failed")
+
+    async def patient(items):
+        try:
+            return await _collect(items)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(KeyError, match="failed"):
+        asyncio.run(aio.zip_split(_source(count()), [patient, failing]))
+    assert cancelled == [True]
+
+
+def test_zip_split_source_error():
+    """Test ittools.aio.zip_split propagating source errors."""
+    received = []
+
+    async def source():
+        yield 1
+        yield 2
+        raise KeyError("broken")
+
+    async def collect(items):
+        received.extend(await _collect(items))
+
+    with pytest.raises(KeyError, match="broken"):
+        asyncio.run(aio.zip_split(source(), [collect, collect]))
+    assert sorted(received) == [1, 2]
+
+
+@pytest.mark.parametrize(
+    ("length", "kwargs", "expected_result"),
+    [
+        (10, {"size": 4}, [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9, None, None)]),
+        (10, {"size": 4, "pad": False}, [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9)]),
+        (4, {"size": 2, "fillvalue": 0}, [(0, 1), (2, 3)]),
+        (0, {"size": 2}, []),
+    ],
+)
+def test_group(length, kwargs, expected_result):
+    """Test correct ittools.aio.group functionaility."""
+    chunks = asyncio.run(_collect(aio.group(_source(range(length)), **kwargs)))
+    assert chunks == expected_result
+
+
+@pytest.mark.parametrize(
+    ("items", "kwargs", "expected_result"),
+    [
+        (range(7), {"size": 3}, [[0, 1, 2], [3, 4, 5], [6]]),
+        ([], {"size": 3}, []),
+        (
+            ["ab", "cde", "fg", "hijklmn", "o"],
+            {"size": 10, "max_weight": 6},
+            [["ab", "cde"], ["fg"], ["hijklmn"], ["o"]],
+        ),
+    ],
+)
+def test_batch(items, kwargs, expected_result):
+    """Test ittools.aio.batch batching by size and weight."""
+    batches = asyncio.run(_collect(aio.batch(_source(items), latency=60, **kwargs)))
+    assert batches == expected_result
+
+
+def test_batch_latency():
+    """Test ittools.aio.batch yielding incomplete batches after latency."""
+
+    async def source():
+        yield 1
+        yield 2
+        await asyncio.sleep(0.2)
+        yield 3
+
+    batches = asyncio.run(_collect(aio.batch(source(), size=100, latency=0.05)))
+    assert batches == [[1, 2], [3]]
+
+
+def test_batch_closed_early():
+    """Test ittools.aio.batch cancelling the pending read when closed."""
+    cancelled = []
+
+    async def source():
+        yield 1
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        yield 2  # pragma: no cover
+
+    async def main():
+        batches = aio.batch(source(), size=100, latency=0.01)
+        first = await batches.__anext__()
+        await batches.aclose()
+        return first
+
+    assert asyncio.run(main()) == [1]
+    assert cancelled == [True]
+
+
+def test_batch_source_error():
+    """Test ittools.aio.batch propagating source errors."""
+
+    async def source():
+        yield 1
+        raise KeyError("broken")
+
+    with pytest.raises(KeyError, match="broken"):
+        asyncio.run(_collect(aio.batch(source(), size=2, latency=60)))
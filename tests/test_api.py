@@ -1,7 +1,22 @@
 # tests/test_api.py
 """Test core API."""
+import copy
+import gc
+import multiprocessing
+import sys
+import threading
+import time
+import types
+from array import array
+from collections import defaultdict, deque, namedtuple
+from collections.abc import Generator, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, count, islice
+from queue import Queue
+
+import numpy as np
 import pytest
-from pandas import Series
+from pandas import DataFrame, Series
 
 import ittools
 
@@ -29,6 +44,12 @@ class EndlessIterator:
         (list, None, 0),  # test infinite type error
         (EndlessIterator(), None, 1),  # test infinite
         ([[[[[]]]]], None, 4),  # test max() value error
+        ({"a": [1, {"b": (2,)}]}, None, 4),  # test dict values
+        ({"a": [1, {"b": (2,)}]}, (tuple,), 3),  # test excluded fast path
+        ((x for x in [[1], [2, [3]]]), None, 3),  # test one-shot iterators
+        (Series([1, 2]), None, 1),  # test non callable values attribute
+        ("ab", (), 2),  # test non excluded strings
+        ([set(), {1}], None, 2),  # test empty non plain iterables
     ],
 )
 def test_depth(arg, exclude, expected_result):
@@ -36,6 +57,361 @@ def test_depth(arg, exclude, expected_result):
     assert ittools.depth(arg, exclude) == expected_result
 
 
+@pytest.mark.parametrize(
+    ("arg", "limit", "expected_result"),
+    [
+        ([[2, 2], [2, [3, 3]], 1], 2, 2),
+        ([[2, 2], [2, [3, 3]], 1], 5, 3),
+        ([[2, 2], [2, [3, 3]], 1], 0, 0),
+        ([1, EndlessIterator()], 2, 2),  # test early exit on known depths
+        (EndlessIterator(), 3, 1),
+        (1, 3, 0),
+    ],
+)
+def test_depth_limit(arg, limit, expected_result):
+    """Test correct ittools.depth functionaility when using a limit."""
+    assert ittools.depth(arg, limit=limit) == expected_result
+
+
+def test_depth_limit_early_exit():
+    """Test ittools.depth stopping before exhausting the iterable."""
+    consumed = []
+
+    def generate():
+        for item in ([[1]], [2], [3]):
+            consumed.append(item)
+            yield item
+
+    assert ittools.depth(generate(), limit=3) == 3
+    assert consumed == [[[1]]]
+
+
+def test_depth_deep_nesting():
+    """Test ittools.depth not hitting the recursion limit."""
+    nested = []
+    for _i in range(10000):
+        nested = [nested, 1]
+    assert ittools.depth(nested) == 10000
+
+
+def test_depth_cycles():
+    """Test ittools.depth on self referencing iterables."""
+    cycle = [1, [2]]
+    cycle[1].append(cycle)
+    assert ittools.depth(cycle) == 2
+    assert ittools.depth([cycle, cycle]) == 3
+
+    queue = deque([1])
+    queue.append([queue])
+    assert ittools.depth(queue) == 2
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        np.zeros((3, 4, 5)),
+        np.zeros((3, 0, 5)),
+        np.zeros((0, 4)),
+        np.array(5),
+        np.arange("2020-01", "2020-05", dtype="datetime64[M]"),
+        np.array([["ab", "c"]]),
+        np.array([b"ab"]),
+        np.array([[1, [2, [3]]]], dtype=object),
+        np.ones((2, 3)).view(np.ma.MaskedArray),
+    ],
+)
+@pytest.mark.parametrize("exclude", [None, ()])
+def test_depth_arrays(array, exclude):
+    """Test ittools.depth on arrays matching the depth of nested lists."""
+    assert ittools.depth(array, exclude) == ittools.depth(array.tolist(), exclude)
+    assert ittools.depth([array], exclude) == ittools.depth([array.tolist()], exclude)
+
+
+@pytest.mark.parametrize(
+    ("argument", "expected_result"),
+    [
+        (Series([1.0, 2.0]), 1),
+        (Series([], dtype=float), 0),
+        (Series([[1, 2], [3]]), 2),
+        (Series(["ab", "c"]), 1),
+        (DataFrame({"a": [1, 2], "b": ["x", "y"]}), 2),
+        (DataFrame({"a": []}), 1),
+        (DataFrame(), 0),
+        ([DataFrame({"a": [1]})], 3),
+    ],
+)
+def test_depth_pandas(argument, expected_result):
+    """Test ittools.depth on pandas objects."""
+    assert ittools.depth(argument) == expected_result
+
+
+def test_register_depth():
+    """Test registering depths for ittools.depth."""
+
+    class Leaf(list):
+        """List to be treated as leaf."""
+
+    class Matrix(list):
+        """List of which depth is known."""
+
+    assert ittools.depth([Leaf([[1]]), Matrix([1])]) == 3
+    ittools.register_depth(Leaf, 0)
+    ittools.register_depth(Matrix, lambda obj, exclude: 2 if obj else None)
+    assert ittools.depth([Leaf([[1]]), Matrix([1])]) == 3
+    assert ittools.depth([Leaf([[1]]), Matrix([])]) == 1
+    assert ittools.depth(Leaf([[1]]), exclude=(Leaf,)) == 0
+
+    ittools.register_depth(Leaf, None)
+    assert ittools.depth([Leaf([[1]])]) == 3
+
+
+def test_register_depth_by_name(monkeypatch):
+    """Test registering depths by name without importing the module."""
+    name = "ittools_registered_module"
+    ittools.register_depth(f"{name}.Leaf", 0)
+    assert ittools.depth([[1]]) == 2  # module not imported (yet)
+
+    module = types.ModuleType(name)
+    module.Leaf = type("Leaf", (list,), {})
+    monkeypatch.setitem(sys.modules, name, module)
+    assert ittools.depth([module.Leaf([1])]) == 1
+
+
+def test_register_depth_by_name_threads(monkeypatch):
+    """Test threads resolving a registered name concurrently."""
+    registry = ittools.core._TypeRegistry()  # pylint: disable=protected-access
+    module = types.ModuleType("ittools_concurrent_module")
+    module.Leaf = type("Leaf", (list,), {})
+    registry.register(f"{module.__name__}.Leaf", 0)
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+
+    resolving, resolved = threading.Event(), threading.Event()
+    loaded_types = ittools.core._loaded_types  # pylint: disable=protected-access
+
+    def slow_loaded_types(*args):
+        if not resolving.is_set():
+            resolving.set()
+            resolved.wait(timeout=0.2)  # let the other thread resolve meanwhile
+        return loaded_types(*args)
+
+    def look_up(results):
+        resolving.wait()
+        results.append(registry[module.Leaf])
+        resolved.set()
+
+    monkeypatch.setattr(ittools.core, "_loaded_types", slow_loaded_types)
+    results = []
+    thread = threading.Thread(target=look_up, args=(results,))
+    thread.start()
+    assert registry[module.Leaf] == 0
+    thread.join()
+    assert results == [0]
+
+
+# -------------- ittools.profile ------------------
+@pytest.mark.parametrize(
+    ("argument", "kwargs", "expected_result"),
+    [
+        (5, {}, (0, False, 1, True, (), {int})),
+        ("abc", {}, (0, False, 1, True, (), {str})),
+        ([], {}, (0, True, 0, True, (0,), set())),
+        ([[], []], {}, (1, True, 0, True, (2, 0), set())),
+        ([[[]], []], {}, (2, True, 0, False, None, set())),
+        ([[1, 2.0], [3, 4]], {}, (2, False, 4, True, (2, 2), {int, float})),
+        ([[1, "a"], [2, [3]]], {}, (3, False, 4, False, None, {int, str})),
+        ([[1], 2], {}, (2, False, 2, False, None, {int})),
+        ([(1, 2), (3, 4)], {"exclude": (tuple,)}, (1, False, 2, True, (2,), {tuple})),
+        (["ab", "cd"], {"exclude": ()}, (3, False, 4, True, (2, 2), {str})),
+        ({"a": [1, 2], "b": [3, 4]}, {}, (2, False, 4, True, (2, 2), {int})),
+        ((i for i in range(3)), {}, (1, False, 3, True, (3,), {int})),
+        ([iter([]), iter([1])], {}, (2, False, 1, False, None, {int})),
+        ([deque([1]), deque()], {}, (2, False, 1, False, None, {int})),
+        (np.zeros((2, 3)), {}, (2, False, 1, True, (), {np.ndarray})),
+        ([Series([1, 2])], {}, (2, False, 1, True, (1,), {Series})),
+        ([np.zeros(2), 1], {}, (2, False, 2, False, None, {np.ndarray, int})),
+    ],
+)
+def test_profile(argument, kwargs, expected_result):
+    """Test correct ittools.profile functionaility."""
+    result = ittools.profile(argument, **kwargs)
+    assert tuple(result) == (*expected_result[:-1], frozenset(expected_result[-1]))
+
+
+def test_profile_matches_depth():
+    """Test ittools.profile determining the same depth as ittools.depth."""
+    cycle = [1, [2]]
+    cycle[1].append(cycle)
+    for argument in ([cycle, cycle], [[[[[]]]]], [[2, 2], [2, [3, 3]], 1], cycle):
+        assert ittools.profile(argument).depth == ittools.depth(argument)
+
+    for argument in (
+        DataFrame({"a": [1, 2], "b": [3, 4]}),
+        [DataFrame({"a": [1.0]})],
+        np.zeros((2, 0)),
+        [np.zeros((2, 3)), np.zeros(4)],
+        np.array(["ab", "cd"]),
+        np.array([[1], [2, 3]], dtype=object),
+    ):
+        assert ittools.profile(argument).depth == ittools.depth(argument)
+        assert ittools.profile(argument, exclude=()).depth == ittools.depth(
+            argument, exclude=()
+        )
+
+    result = ittools.profile([cycle, cycle])
+    assert (result.leaves, result.regular) == (6, False)
+    assert list in result.leaf_types  # cyclic references are leafs
+
+
+def test_profile_registered_depth():
+    """Test ittools.profile using depths registered by ittools.register_depth."""
+
+    class Pair(tuple):
+        """Tuple of which depth is known."""
+
+    argument = [Pair((1, 2))]
+    assert ittools.profile(argument).depth == ittools.depth(argument) == 2
+    ittools.register_depth(Pair, 0)
+    try:
+        result = ittools.profile(argument)
+        assert result.depth == ittools.depth(argument) == 1
+        assert result.leaf_types == frozenset({Pair})
+    finally:
+        ittools.register_depth(Pair, None)
+
+
+def test_profile_self_iterating():
+    """Test ittools.profile on objects iterating over themselves."""
+    cycle = []
+    cycle.append(cycle)
+    assert tuple(ittools.profile(cycle))[:4] == (1, False, 1, True)
+
+
+# -------------- ittools.flatten ------------------
+_Point = namedtuple("_Point", ["x", "y"])
+
+
+def _deep(levels):
+    """Return a leafless nesting of levels lists."""
+    nested = []
+    for _ in range(levels):
+        nested = [nested]
+    return nested
+
+
+@pytest.mark.parametrize(
+    "argument",
+    [
+        5,
+        [],
+        [[], []],
+        [[1, 2, 3], [], [4, 5]],
+        [[], [[1.0]], [[2.0, 3.0], []]],
+        ((1, 2), (3,)),
+        [(1, 2), [3]],
+        [_Point(1, 2), _Point(3, 4)],
+        {"a": {"b": [1]}, "c": {}},
+        [{"a": 1}, [2]],
+        ["a", "bc"],
+        [[None, 1], [object]],
+        [10**30, 1],
+        [np.float32(1), np.float32(2)],
+        _deep(100),
+    ],
+)
+def test_flatten(argument):
+    """Test ittools.unflatten rebuilding what ittools.flatten flattened."""
+    flat = ittools.flatten(argument)
+    assert ittools.unflatten(flat) == argument
+    for offsets in flat.offsets:
+        assert offsets.dtype == np.int64
+
+
+@pytest.mark.parametrize(
+    ("argument", "kwargs", "leaves", "offsets"),
+    [
+        (
+            [[1, 2, 3], [], [4, 5]],
+            {},
+            np.array([1, 2, 3, 4, 5]),
+            [[0, 3], [0, 3, 3, 5]],
+        ),
+        (7, {}, np.array([7]), []),
+        ([[None], [1]], {}, [None, 1], [[0, 2], [0, 1, 2]]),
+        ([(1, 2), (3,)], {"containers": list}, [(1, 2), (3,)], [[0, 2]]),
+    ],
+)
+def test_flatten_buffers(argument, kwargs, leaves, offsets):
+    """Test the buffers created by ittools.flatten."""
+    flat = ittools.flatten(argument, **kwargs)
+    assert type(flat.leaves) is type(leaves)  # pylint: disable=unidiomatic-typecheck
+    assert list(flat.leaves) == list(leaves)
+    assert [offs.tolist() for offs in flat.offsets] == offsets
+
+
+@pytest.mark.parametrize(
+    ("argument", "message"),
+    [
+        ([1, [2]], "different depths"),
+        ([[1], {"a": [2]}], "different depths"),
+    ],
+)
+def test_flatten_invalid_arguments(argument, message):
+    """Test ittools.flatten raising on leafs nested at different depths."""
+    with pytest.raises(ValueError, match=message):
+        ittools.flatten(argument)
+
+
+@pytest.mark.parametrize(
+    "argument", [defaultdict(list, a=[1]), [{"a": 1}, defaultdict(int, b=2)]]
+)
+def test_flatten_defaultdict(argument):
+    """Test ittools.flatten raising on defaultdicts."""
+    with pytest.raises(TypeError, match="defaultdicts"):
+        ittools.flatten(argument)
+
+
+def _self_cycle():
+    """Return a list containing itself."""
+    cycle = []
+    cycle.append(cycle)
+    return cycle
+
+
+def _fan_out_cycle():
+    """Return a list containing itself twice, doubling each level."""
+    cycle = []
+    cycle.extend([cycle, cycle])
+    return cycle
+
+
+def _deep_cycle():
+    """Return nested lists containing the outermost one three levels deep."""
+    inner = []
+    outer = [[[], [inner]], [[], []]]
+    inner.append(outer)
+    return outer
+
+
+@pytest.mark.parametrize("factory", [_self_cycle, _fan_out_cycle, _deep_cycle])
+def test_flatten_cycles(factory):
+    """Test ittools.flatten raising on cyclic containers."""
+    with pytest.raises(ValueError, match="containing themselves"):
+        ittools.flatten(factory())
+
+
+def test_flatten_shared():
+    """Test ittools.flatten accepting containers referenced repeatedly."""
+    shared = [1, 2]
+    flat = ittools.flatten([[shared, shared], [shared]])
+    assert ittools.unflatten(flat) == [[[1, 2], [1, 2]], [[1, 2]]]
+
+
+@pytest.mark.parametrize("argument", [[(), [()]], [[()], [[(), (1,)]]]])
+def test_flatten_shared_empty(argument):
+    """Test ittools.flatten accepting empty containers on different levels."""
+    assert ittools.unflatten(ittools.flatten(argument)) == argument
+
+
 # -------------- ittools.nestify ------------------
 @pytest.mark.parametrize(
     ("arguments", "expected_result"),
@@ -43,6 +419,9 @@ def test_depth(arg, exclude, expected_result):
         (([1, 2, 3], 3), [[[1, 2, 3]]]),
         (([1, 2, 3], 3, list), [[[1, 2, 3]]]),
         (([1, 2, 3], 3, tuple), (([1, 2, 3],),)),
+        (([[[1]]], 2), [[[1]]]),
+        (("abc", 2), [["abc"]]),
+        ((1, 0), 1),
     ],
 )
 def test_nestify(arguments, expected_result):
@@ -50,6 +429,12 @@ def test_nestify(arguments, expected_result):
     assert ittools.nestify(*arguments) == expected_result
 
 
+def test_nestify_series():
+    """Test ittools.nestify treating Series as non-nested."""
+    series = Series([1, 2, 3])
+    assert ittools.nestify(series, 2)[0][0] is series
+
+
 def test_nestify_fail_on_unhashable():
     """Test ittools.nestify fail on unhashables."""
     try:
@@ -59,6 +444,127 @@ def test_nestify_fail_on_unhashable():
         assert "unhashable" in str(terror)
 
 
+# -------------- ittools.DepthCache ------------------
+@pytest.mark.parametrize(
+    ("argument", "kwargs"),
+    [
+        (((1, 2), (3, (4, 5))), {}),
+        (frozenset({frozenset({1}), 2}), {}),
+        (np.zeros((2, 3)), {}),
+        ((("ab",),), {"exclude": ()}),
+        (((1, 2), (3, (4, 5))), {"limit": 2}),
+    ],
+)
+def test_depth_cache(argument, kwargs):
+    """Test ittools.DepthCache remembering depths."""
+    cache = ittools.DepthCache()
+    expected_result = ittools.depth(argument, **kwargs)
+    assert cache.depth(argument, **kwargs) == expected_result
+    assert cache.depth(argument, **kwargs) == expected_result
+    assert cache.info() == (1, 1, 128, 1)
+
+
+def test_depth_cache_uncacheable():
+    """Test ittools.DepthCache measuring unhashable objects each time."""
+    cache = ittools.DepthCache()
+    nested = [[1], [2]]
+    assert cache.depth(nested) == cache.depth(nested) == 2
+    assert cache.info() == (0, 2, 128, 0)
+
+
+def test_depth_cache_keys():
+    """Test ittools.DepthCache telling apart arguments."""
+    cache = ittools.DepthCache()
+    assert cache.depth((("ab",),)) == 2
+    assert cache.depth((("ab",),), exclude=()) == 4
+    assert cache.depth((("ab",),), limit=1) == 1
+    sets = frozenset({1}), frozenset({1})  # equal, but not identical
+    assert cache.depth(sets[0]) == cache.depth(sets[1]) == 1
+    assert cache.info() == (0, 5, 128, 5)
+
+
+class _CountingTuple(tuple):
+    """Tuple counting how often it is hashed."""
+
+    hashed = 0
+
+    def __hash__(self):
+        """Count the call and return the tuple's hash."""
+        type(self).hashed += 1
+        return super().__hash__()
+
+
+def test_depth_cache_identity():
+    """Test ittools.DepthCache not hashing remembered tuples again."""
+    cache = ittools.DepthCache(maxsize=1)
+    template = _CountingTuple(((1, 2), (3, 4)))
+    for _ in range(3):
+        assert cache.depth(template) == 2
+    assert (_CountingTuple.hashed, cache.info()) == (1, (2, 1, 1, 1))
+
+    equal = _CountingTuple(((1, 2), (3, 4)))
+    assert cache.depth(equal) == 2  # remembered by value
+    assert (_CountingTuple.hashed, cache.info()) == (2, (3, 1, 1, 1))
+
+    cache.depth((1,))  # forgets template
+    assert cache.depth(template) == 2
+    assert cache.info() == (3, 3, 1, 1)
+    cache.clear()
+    assert cache.depth(template) == 2
+    assert cache.info() == (0, 1, 1, 1)
+
+    sets = frozenset({frozenset({1})})
+    assert cache.depth(sets) == 2  # forgets template
+    assert cache.depth(template) == 2  # forgets sets
+    assert cache.info() == (0, 3, 1, 1)
+
+
+def test_depth_cache_lru():
+    """Test ittools.DepthCache forgetting the least recently used depths."""
+    cache = ittools.DepthCache(maxsize=2)
+    cache.depth((1,))
+    cache.depth(((2,),))
+    cache.depth((1,))
+    cache.depth((((3,),),))  # forgets ((2,),)
+    assert cache.info() == (1, 3, 2, 2)
+    cache.depth((1,))
+    cache.depth(((2,),))
+    assert cache.info() == (2, 4, 2, 2)
+
+    cache = ittools.DepthCache(maxsize=0)
+    cache.depth((1,))
+    cache.depth((1,))
+    assert cache.info() == (0, 2, 0, 0)
+
+    cache = ittools.DepthCache(maxsize=None)
+    for i in range(200):
+        cache.depth((i,))
+    assert cache.info().currsize == 200
+
+
+def test_depth_cache_garbage_collected():
+    """Test ittools.DepthCache forgetting garbage collected objects."""
+    cache = ittools.DepthCache()
+    template = frozenset({frozenset({1, 2})})
+    assert cache.depth(template) == 2
+    assert cache.info().currsize == 1
+    del template
+    gc.collect()
+    assert cache.info().currsize == 0
+
+
+def test_depth_cache_nestify():
+    """Test ittools.DepthCache.nestify matching ittools.nestify."""
+    cache = ittools.DepthCache()
+    template = ((1, 2), (3, 4))
+    for _ in range(3):
+        assert cache.nestify(template, 4, tuple) == ittools.nestify(template, 4, tuple)
+    assert cache.nestify("ab", 1) == ["ab"]
+    assert cache.info() == (2, 2, 128, 2)
+    cache.clear()
+    assert cache.info() == (0, 0, 128, 0)
+
+
 # -------------- ittools.itrify ------------------
 @pytest.mark.parametrize(
     ("arguments", "expected_result"),
@@ -74,6 +580,59 @@ def test_itrify(arguments, expected_result):
     assert ittools.itrify(*arguments) == expected_result
 
 
+_SERIES = Series([1, 2])
+_ARRAY = np.arange(3)
+_DICT = {"a": 1}
+
+
+@pytest.mark.parametrize(
+    "argument",
+    [_ARRAY, _SERIES, memoryview(b"ab"), range(3), _DICT.keys(), _DICT.values(), _DICT],
+)
+def test_itrify_passthrough(argument):
+    """Test ittools.itrify passing iterables through unchanged."""
+    assert ittools.itrify(argument, passthrough=True) is argument
+
+
+@pytest.mark.parametrize(
+    ("argument", "expected_result"),
+    [("ab", ["ab"]), (b"ab", [b"ab"]), (1.5, [1.5]), (None, [None])],
+)
+def test_itrify_passthrough_scalars(argument, expected_result):
+    """Test ittools.itrify containering scalars and strings in passthrough mode."""
+    assert ittools.itrify(argument, passthrough=True) == expected_result
+
+
+def test_itrify_many():
+    """Test ittools.itrify_many matching ittools.itrify."""
+    arguments = ["ab", b"ab", (1, 2), {3}, _ARRAY, 5]
+    results = ittools.itrify_many(arguments, tuple, passthrough=True)
+    assert results[:4] == [("ab",), (b"ab",), (1, 2), {3}]
+    assert results[4] is _ARRAY
+    assert results[5] == (5,)
+    assert ittools.itrify_many(arguments[:4], set) == [
+        ittools.itrify(argument, set) for argument in arguments[:4]
+    ]
+
+
+def test_register_itrify():
+    """Test registering handlers for ittools.itrify."""
+
+    class Record(dict):
+        """Mapping to be treated as single item."""
+
+    assert ittools.itrify(Record(a=1)) == ["a"]
+    ittools.register_itrify(Record, lambda obj, container: container([obj]))
+    assert ittools.itrify(Record(a=1), tuple) == ({"a": 1},)
+    assert ittools.itrify(Record(a=1), passthrough=True) == [{"a": 1}]
+    assert ittools.itrify({"a": 1}) == ["a"]
+
+    class Name(str):
+        """String subclass, itrified as whole as well."""
+
+    assert ittools.itrify(Name("ab"), set) == {"ab"}
+
+
 def test_default_itrify():
     """Test correct default ittools.itrify functionaility."""
     assert ittools.itrify("String") == ["String"]
@@ -92,6 +651,51 @@ def test_is_empty(argument, expected_result):
     assert ittools.is_empty(argument) == expected_result
 
 
+def _nested(levels, innermost):
+    """Nest innermost into levels of lists."""
+    for _ in range(levels):
+        innermost = [innermost]
+    return innermost
+
+
+def _cyclic():
+    """Return a list containing itself."""
+    lst = [[]]
+    lst.append(lst)
+    return lst
+
+
+@pytest.mark.parametrize(
+    ("argument", "containers", "expected_result"),
+    [
+        ([], (list,), None),
+        (5, (list,), ()),
+        ([[], [[], [[], 0]]], (list,), (1, 1, 1)),
+        ([[], None], (list,), (1,)),
+        (([], []), (list,), ()),
+        (([], []), (list, tuple), None),
+        ([(), ((),)], (list, tuple), None),
+        ([{"a": [], "b": []}], (list, dict), None),
+        ([{"a": [], "b": [1]}], (list, dict), (0, "b", 0)),
+        ([set()], (list,), (0,)),
+        ([(i for i in range(0))], (list,), (0,)),
+        ([(i for i in range(0))], (list, Generator), None),
+        ([[], (i for i in range(3))], (list, Generator), (1, 0)),
+        (np.array([], dtype=object), (list, np.ndarray), None),
+        (np.array([1.0, 2.0]), (list, np.ndarray), ((0,),)),
+        ([np.empty((2, 0))], (list, np.ndarray), None),
+        ([np.array([[], [3]], dtype=object)], (list, np.ndarray), (0, (1,), 0)),
+        (_cyclic(), (list,), None),
+        (_nested(10**5, []), (list,), None),
+        (_nested(10**5, "x"), (list,), (0,) * 10**5),
+    ],
+)
+def test_first_nonempty(argument, containers, expected_result):
+    """Test correct ittools.first_nonempty functionaility."""
+    assert ittools.first_nonempty(argument, containers) == expected_result
+    assert ittools.is_empty(argument, containers) == (expected_result is None)
+
+
 # -------------- ittools.Stringcrementor ------------------
 def test_stringcrmentor_next():
     """Test correct ittools.Stringcrementor __next__ functionaility."""
@@ -116,6 +720,260 @@ def test_stringcrmentor_iter():
     )
 
 
+def test_stringcrementor_take():
+    """Test correct ittools.Stringcrementor.take functionaility."""
+    strementor = ittools.Stringcrementor("Number", start=5)
+    labels = strementor.take(3)
+    assert isinstance(labels, ittools.StringRange)
+    assert list(labels) == ["Number5", "Number6", "Number7"]
+    assert next(strementor) == "Number8"
+    assert len(strementor.take(0)) == 0
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [
+        lambda path: ittools.Stringcrementor(),
+        lambda path: ittools.SharedStringcrementor(),
+        ittools.PersistentStringcrementor,
+    ],
+)
+def test_stringcrementor_take_negative(tmp_path, factory):
+    """Test ittools.Stringcrementor.take not rewinding the counter."""
+    strementor = factory(tmp_path / "labels.ckpt")
+    labels = list(strementor.take(5))
+    with pytest.raises(ValueError, match="must not be negative"):
+        strementor.take(-5)
+    assert strementor.value == 5
+    assert next(strementor) not in labels
+
+
+# -------------- ittools.SharedStringcrementor ------------------
+_WORKER_STRINGCREMENTOR = None
+
+
+def _init_worker(strementor):
+    """Share a SharedStringcrementor with a pool's worker process."""
+    global _WORKER_STRINGCREMENTOR  # pylint: disable=global-statement
+    _WORKER_STRINGCREMENTOR = strementor
+
+
+def _draw_labels(count):
+    """Draw labels from the worker's SharedStringcrementor."""
+    return [next(_WORKER_STRINGCREMENTOR) for _i in range(count)]
+
+
+@pytest.mark.parametrize("method", multiprocessing.get_all_start_methods())
+def test_shared_stringcrementor_processes(method):
+    """Test ittools.SharedStringcrementor handing out unique labels."""
+    strementor = ittools.SharedStringcrementor("Id", block_size=7, context=method)
+    labels = [next(strementor)]  # parent holds a partially used block now
+
+    with ProcessPoolExecutor(
+        max_workers=3,
+        mp_context=multiprocessing.get_context(method),
+        initializer=_init_worker,
+        initargs=(strementor,),
+    ) as executor:
+        for drawn in executor.map(_draw_labels, 6 * [20]):
+            labels.extend(drawn)
+
+    labels.extend(next(strementor) for _i in range(10))
+    assert len(labels) == len(set(labels)) == 131
+    assert strementor.value >= 131
+
+
+def test_shared_stringcrementor_threads():
+    """Test ittools.SharedStringcrementor being thread safe."""
+    strementor = ittools.SharedStringcrementor(block_size=3)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(list, islice(strementor, 500)) for _i in range(8)]
+    labels = [label for future in futures for label in future.result()]
+    assert len(labels) == len(set(labels)) == 4000
+
+
+class _InterleavedStringcrementor(ittools.SharedStringcrementor):
+    """SharedStringcrementor with another thread drawing from each new block."""
+
+    @property
+    def _block(self):
+        """Local block of reserved numbers."""
+        return self.__dict__["_block"]
+
+    @_block.setter
+    def _block(self, block):
+        """Share a new block, which the other thread draws from right away."""
+        self.__dict__["_block"] = block
+        self.__dict__.setdefault("drawn", []).extend(islice(block, 1))
+
+
+@pytest.mark.parametrize("block_size", [1, 2])
+def test_shared_stringcrementor_refill_race(block_size):
+    """Test ittools.SharedStringcrementor refilling blocks drained meanwhile."""
+    strementor = _InterleavedStringcrementor("", block_size=block_size)
+    labels = [int(next(strementor)) for _i in range(4)]
+    assert len(labels) == 4
+    assert not set(labels) & set(strementor.drawn)
+
+
+def test_shared_stringcrementor_take():
+    """Test correct ittools.SharedStringcrementor.take functionaility."""
+    strementor = ittools.SharedStringcrementor("Number", start=5, block_size=10)
+    assert next(strementor) == "Number5"
+    assert list(strementor.take(2)) == ["Number15", "Number16"]
+    assert next(strementor) == "Number6"
+    assert isinstance(strementor, ittools.Stringcrementor)
+
+
+def test_shared_stringcrementor_block_inheritance():
+    """Test ittools.SharedStringcrementor copies not sharing local blocks."""
+    strementor = ittools.SharedStringcrementor("Number", block_size=10)
+    assert next(strementor) == "Number0"
+    assert next(copy.copy(strementor)) == "Number10"
+
+    # same as after forking
+    ittools.core._drop_inherited_blocks()  # pylint: disable=protected-access
+    assert next(strementor) == "Number20"
+
+
+def test_shared_stringcrementor_invalid_block_size():
+    """Test ittools.SharedStringcrementor raising on empty blocks."""
+    with pytest.raises(ValueError, match="block_size"):
+        ittools.SharedStringcrementor(block_size=0)
+
+
+# -------------- ittools.PersistentStringcrementor ------------------
+def test_persistent_stringcrementor_resume(tmp_path):
+    """Test ittools.PersistentStringcrementor resuming from its checkpoint."""
+    path = tmp_path / "labels.ckpt"
+    with ittools.PersistentStringcrementor(path, "Id", start=7, block_size=5) as ids:
+        assert [next(ids) for _i in range(6)] == [f"Id{i}" for i in range(7, 13)]
+        assert ids.value == 17
+        assert list(ids.take(2)) == ["Id17", "Id18"]
+        assert next(ids) == "Id13"
+
+    # crash like restart, without closing
+    ids = ittools.PersistentStringcrementor(path, "Id", start=0, block_size=5)
+    assert next(ids) == "Id19"
+    del ids
+    ids = ittools.PersistentStringcrementor(path, "Id", block_size=5)
+    assert next(ids) == "Id24"
+    assert path.stat().st_size == 16
+
+
+def test_persistent_stringcrementor_threads(tmp_path):
+    """Test ittools.PersistentStringcrementor being thread safe."""
+    path = tmp_path / "labels.ckpt"
+    with ittools.PersistentStringcrementor(path, block_size=3) as strementor:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(list, islice(strementor, 500)) for _i in range(8)
+            ]
+        labels = [label for future in futures for label in future.result()]
+    assert len(labels) == len(set(labels)) == 4000
+
+
+def test_persistent_stringcrementor_exclusive(tmp_path):
+    """Test ittools.PersistentStringcrementor locking its checkpoint."""
+    path = tmp_path / "labels.ckpt"
+    ids = ittools.PersistentStringcrementor(path, "Id", block_size=5)
+    assert next(ids) == "Id0"
+    with pytest.raises(RuntimeError, match="is in use"):
+        ittools.PersistentStringcrementor(path, "Id", block_size=5)
+
+    ids.close()
+    ids.close()
+    with ittools.PersistentStringcrementor(path, "Id", block_size=5) as ids:
+        assert next(ids) == "Id5"
+
+
+def _open_checkpoint(path, queue):
+    """Try opening a PersistentStringcrementor's checkpoint in a process."""
+    try:
+        ittools.PersistentStringcrementor(path)
+    except RuntimeError as error:
+        queue.put(str(error))
+
+
+def test_persistent_stringcrementor_exclusive_processes(tmp_path):
+    """Test ittools.PersistentStringcrementor locking out other processes."""
+    path = tmp_path / "labels.ckpt"
+    with ittools.PersistentStringcrementor(path):
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        process = context.Process(target=_open_checkpoint, args=(path, queue))
+        process.start()
+        process.join()
+        assert "is in use" in queue.get(timeout=10)
+
+
+@pytest.mark.parametrize("content", [b"labels", b"not-ittools\x00\x00\x00\x00\x00"])
+def test_persistent_stringcrementor_invalid_file(tmp_path, content):
+    """Test ittools.PersistentStringcrementor refusing foreign files."""
+    path = tmp_path / "labels.txt"
+    path.write_bytes(content)
+    with pytest.raises(ValueError, match="is not a checkpoint file"):
+        ittools.PersistentStringcrementor(path)
+    assert path.read_bytes() == content
+
+
+# -------------- ittools.StringRange ------------------
+@pytest.mark.parametrize(
+    "numbers", [range(10), range(-3, 12, 4), range(20, 5, -3), range(0)]
+)
+def test_string_range(numbers):
+    """Test correct ittools.StringRange sequence functionaility."""
+    labels = ittools.StringRange("Label", numbers)
+    expected_result = [f"Label{number}" for number in numbers]
+    assert len(labels) == len(expected_result)
+    assert list(labels) == expected_result
+    assert list(reversed(labels)) == expected_result[::-1]
+    assert [labels[i] for i in range(len(labels))] == expected_result
+    assert list(labels[1::2]) == expected_result[1::2]
+    assert [labels.index(label) for label in labels] == list(range(len(labels)))
+    assert labels.to_numpy().tolist() == expected_result
+    assert labels.to_index().tolist() == expected_result
+    assert labels.string == "Label"
+    assert labels.numbers == numbers
+
+
+@pytest.mark.parametrize(
+    ("label", "expected_result"),
+    [
+        ("Label3", 3),
+        ("Label-3", -3),
+        ("Label12", None),
+        ("Label4", None),
+        ("Label03", None),
+        ("Label+3", None),
+        ("Label", None),
+        ("Lab3", None),
+        (3, None),
+    ],
+)
+def test_string_range_lookup(label, expected_result):
+    """Test correct ittools.StringRange reverse lookup functionaility."""
+    labels = ittools.StringRange("Label", range(-3, 12, 3))
+    assert labels.number(label) == expected_result
+    assert (label in labels) == (expected_result is not None)
+    assert labels.count(label) == int(expected_result is not None)
+
+
+def test_string_range_index():
+    """Test ittools.StringRange.index respecting start and stop."""
+    labels = ittools.StringRange("Label", range(10))
+    assert labels.index("Label5", 2, 6) == 5
+    for label, start in (("Label5", 6), ("Label10", 0)):
+        with pytest.raises(ValueError, match="is not in StringRange"):
+            labels.index(label, start)
+
+
+def test_string_range_repr():
+    """Test ittools.StringRange representing its compact form."""
+    labels = ittools.StringRange("Label", range(10**9))
+    assert repr(labels) == "StringRange('Label', range(0, 1000000000))"
+
+
 # -------------- ittools.enum_to_2dix ------------------
 @pytest.mark.parametrize(
     ("number", "shape", "expected_result"),
@@ -174,6 +1032,196 @@ def test_index2d(number, shape, expected_result):
     assert idx2d(number) == expected_result
 
 
+def test_index2d_sequence():
+    """Test correct ittools.Index2D sequence functionaility."""
+    idx2d = ittools.Index2D((3, 2))
+    expected_result = [ittools.enum_to_2dix(i, (3, 2)) for i in range(6)]
+    assert len(idx2d) == 6
+    assert list(idx2d) == expected_result
+    assert list(reversed(idx2d)) == expected_result[::-1]
+    assert [idx2d[i] for i in range(-6, 6)] == 2 * expected_result
+    assert isinstance(idx2d, Sequence)
+    assert not hasattr(idx2d, "__dict__")
+
+
+@pytest.mark.parametrize("key", [slice(None), slice(1, None, 2), slice(-2, 0, -1)])
+def test_index2d_slicing(key):
+    """Test correct ittools.Index2D slicing functionaility."""
+    idx2d = ittools.Index2D((3, 2))
+    view = idx2d[key]
+    expected_result = list(idx2d)[key]
+    assert len(view) == len(expected_result)
+    assert list(view) == expected_result
+    assert list(reversed(view)) == expected_result[::-1]
+    assert list(view[::-1]) == expected_result[::-1]
+    assert [view[i] for i in range(len(view))] == expected_result
+
+
+@pytest.mark.parametrize("position", [6, -7])
+def test_index2d_out_of_range(position):
+    """Test ittools.Index2D raising on out of range access."""
+    with pytest.raises(IndexError):
+        ittools.Index2D((3, 2))[position]  # pylint: disable=W0106
+
+
+@pytest.mark.parametrize(
+    ("value", "expected_result"),
+    [
+        ((0, 0), True),
+        ((2, 1), True),
+        ((3, 0), False),
+        ((0, 2), False),
+        ((-1, 0), False),
+        ((1, 1, 1), False),
+        (1, False),
+        ("ab", False),
+        ((1.5, 0), False),
+        ((1, 0.0), False),
+        ((np.int64(1), np.int8(0)), True),
+    ],
+)
+def test_index2d_contains(value, expected_result):
+    """Test correct ittools.Index2D membership functionaility."""
+    idx2d = ittools.Index2D((3, 2))
+    assert (value in idx2d) == expected_result
+    assert idx2d.count(value) == int(expected_result)
+
+
+def test_index2d_index():
+    """Test correct ittools.Index2D.index functionaility."""
+    idx2d = ittools.Index2D((3, 2))
+    assert [idx2d.index(index) for index in idx2d] == list(range(6))
+    assert idx2d.index((2, 0), 3, 5) == 4
+    assert idx2d.index((np.int64(2), 1)) == 5
+    assert isinstance(idx2d.index((np.int64(2), 1)), int)
+    for value, start in (((3, 0), 0), ((1, 0), 3), ((1.5, 0), 0), ((1, 0.0), 0)):
+        with pytest.raises(ValueError, match="is not in Index2D"):
+            idx2d.index(value, start)
+
+
+# -------------- ittools.enum_to_2dix_batch ------------------
+@pytest.mark.parametrize(
+    ("numbers", "shape", "expected_result"),
+    [
+        (range(6), (3, 2), ([0, 0, 1, 1, 2, 2], [0, 1, 0, 1, 0, 1])),
+        (range(5, -3, -3), (2, 2), ([2, 1, -1], [1, 0, 1])),
+        (np.array([0, 7, 12]), (1, 6), ([0, 1, 2], [0, 1, 0])),
+        ([3, 4], (3, 4), ([0, 1], [3, 0])),
+        (slice(None), (2, 2), ([0, 0, 1, 1], [0, 1, 0, 1])),
+        (slice(1, None, 3), (3, 2), ([0, 2], [1, 0])),
+    ],
+)
+def test_enum_to_2dix_batch(numbers, shape, expected_result):
+    """Test correct ittools.enum_to_2dix_batch functionaility."""
+    rows, columns = ittools.enum_to_2dix_batch(numbers, shape)
+    assert (rows.tolist(), columns.tolist()) == expected_result
+
+
+def test_enum_to_2dix_batch_consistency():
+    """Test ittools.enum_to_2dix_batch matching ittools.enum_to_2dix."""
+    numbers = np.arange(-20, 50)
+    rows, columns = ittools.enum_to_2dix_batch(numbers.reshape(7, 10), (4, 7))
+    assert rows.shape == columns.shape == (7, 10)
+    assert list(zip(rows.ravel().tolist(), columns.ravel().tolist())) == [
+        ittools.enum_to_2dix(number, (4, 7)) for number in numbers.tolist()
+    ]
+
+
+def test_index2d_batch():
+    """Test correct ittools.Index2D.batch functionaility."""
+    rows, columns = ittools.Index2D((3, 2)).batch(slice(None, None, -2))
+    assert (rows.tolist(), columns.tolist()) == ([2, 1, 0], [1, 1, 1])
+
+
+# -------------- ittools.IndexND ------------------
+@pytest.mark.parametrize(
+    ("number", "shape", "order", "expected_result"),
+    [
+        (0, (2, 3, 4), "C", (0, 0, 0)),
+        (5, (2, 3, 4), "C", (0, 1, 1)),
+        (23, (2, 3, 4), "C", (1, 2, 3)),
+        (5, (2, 3, 4), "F", (1, 2, 0)),
+        (23, (2, 3, 4), "F", (1, 2, 3)),
+        (7, (3, 1, 5), "F", (1, 0, 2)),
+        (5, (3, 2), "C", (2, 1)),
+        # slowest varying dimension is unbounded, like enum_to_2dix
+        (7, (1, 6), "C", (1, 1)),
+        (-2, (2, 2), "C", (-1, 0)),
+        (7, (6, 1), "F", (1, 1)),
+        # exact for numbers way beyond float precision
+        (2**64 + 2**53 + 1, (2**40, 2**32), "C", (2**32 + 2**21, 1)),
+    ],
+)
+def test_indexnd(number, shape, order, expected_result):
+    """Test correct ittools.IndexND functionaility."""
+    idxnd = ittools.IndexND(shape, order=order)
+    assert idxnd(number) == expected_result
+    assert idxnd.ravel(expected_result) == number
+
+
+def test_indexnd_properties():
+    """Test correct ittools.IndexND properties."""
+    idxnd = ittools.IndexND((2, 3, 4), order="F")
+    assert idxnd.shape == (2, 3, 4)
+    assert idxnd.order == "F"
+    assert idxnd.strides == (1, 2, 6)
+    assert idxnd.size == 24
+
+
+@pytest.mark.parametrize(
+    ("call", "argument"),
+    [
+        ("__call__", 24),
+        ("__call__", -1),
+        ("ravel", (0, 3, 0)),
+        ("ravel", (0, 0)),
+        ("batch", [0, 24]),
+    ],
+)
+def test_indexnd_bounds(call, argument):
+    """Test ittools.IndexND raising on out of bounds access."""
+    idxnd = ittools.IndexND((2, 3, 4), check_bounds=True)
+    with pytest.raises(IndexError):
+        getattr(idxnd, call)(argument)
+
+
+def test_indexnd_invalid_order():
+    """Test ittools.IndexND raising on unknown orders."""
+    with pytest.raises(ValueError, match="order"):
+        ittools.IndexND((2, 3), order="K")
+
+
+@pytest.mark.parametrize(
+    ("shape", "order"), [((3, 0), "C"), ((2, 0, 4), "C"), ((0, 3), "F")]
+)
+def test_indexnd_empty_axes(shape, order):
+    """Test ittools.IndexND rejecting empty axes that are not the slowest."""
+    with pytest.raises(ValueError, match="may be empty"):
+        ittools.IndexND(shape, order=order)
+
+
+@pytest.mark.parametrize(
+    ("shape", "order", "expected_result"),
+    [((0, 3), "C", (1, 1)), ((2, 0), "F", (0, 2))],
+)
+def test_indexnd_empty_slowest_axis(shape, order, expected_result):
+    """Test ittools.IndexND allowing an empty slowest varying axis."""
+    idxnd = ittools.IndexND(shape, order=order)
+    assert idxnd.size == 0
+    assert idxnd(4) == expected_result
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_indexnd_batch(order):
+    """Test correct ittools.IndexND.batch functionaility."""
+    shape = (3, 1, 4, 2)
+    idxnd = ittools.IndexND(shape, order=order, check_bounds=True)
+    expected = np.unravel_index(np.arange(24), shape, order=order)
+    for result, expected_result in zip(idxnd.batch(slice(None)), expected):
+        assert result.tolist() == expected_result.tolist()
+    assert [index.tolist() for index in idxnd.batch([])] == [[], [], [], []]
+
+
 # -------------- ittools.zip_split ------------------
 def test_zip_split():
     """Test correct ittools.zip_split functionaility."""
@@ -181,8 +1229,450 @@ def test_zip_split():
     assert list(ittools.zip_split(10 * ["hi"], 3)) == result
 
 
+@pytest.mark.parametrize(
+    "sequence",
+    [
+        list(range(10)),
+        tuple(range(10)),
+        "abcdefghij",
+        bytes(range(10)),
+        bytearray(range(10)),
+        array("d", range(10)),
+        np.arange(10),
+    ],
+)
+def test_zip_split_no_copy(sequence):
+    """Test ittools.zip_split creating views, if not copying."""
+    chunks = list(ittools.zip_split(sequence, 3, copy=False))
+    expected_result = list(ittools.zip_split(sequence, 3))
+    assert [list(chunk) for chunk in chunks] == [
+        list(chunk) for chunk in expected_result
+    ]
+    assert [len(chunk) for chunk in chunks] == [4, 3, 3]
+    assert list(chunks[0][::-1]) == list(expected_result[0][::-1])
+
+
+@pytest.mark.parametrize("index", [list("abcd"), [3, 2, 1, 0]])
+def test_zip_split_no_copy_series(index):
+    """Test ittools.zip_split splitting series by position, if not copying."""
+    series = Series([10, 20, 30, 40], index=index)
+    chunks = list(ittools.zip_split(series, 2, copy=False))
+    assert [chunk.tolist() for chunk in chunks] == [[10, 30], [20, 40]]
+    assert [chunk.tolist() for chunk in ittools.zip_split(series, 2)] == [
+        chunk.tolist() for chunk in chunks
+    ]
+
+
+def test_zip_split_no_copy_shares_memory():
+    """Test ittools.zip_split views reflecting changes of the sequence."""
+    for sequence in ([0, 1, 2, 3], bytearray(4), array("i", [0, 1, 2, 3])):
+        first, _second = ittools.zip_split(sequence, 2, copy=False)
+        sequence[2] = 42
+        assert first[1] == 42
+
+    sequence = np.arange(4)
+    first, _second = ittools.zip_split(sequence, 2, copy=False)
+    assert np.shares_memory(first, sequence)
+
+
+# -------------- ittools.zip_split_stream ------------------
+@pytest.mark.parametrize(("length", "chunks"), [(10, 3), (9, 3), (2, 4), (0, 2)])
+def test_zip_split_stream(length, chunks):
+    """Test ittools.zip_split_stream matching ittools.zip_split."""
+    outputs = ittools.zip_split_stream((i for i in range(length)), chunks)
+    expected_result = list(ittools.zip_split(list(range(length)), chunks))
+    # consume outputs one after the other, to make use of the buffers
+    assert [list(output) for output in outputs] == expected_result
+
+
+def test_zip_split_stream_unbounded():
+    """Test ittools.zip_split_stream working on endless streams."""
+    outputs = ittools.zip_split_stream(count(), 3, maxsize=1)
+    assert list(islice(zip(*outputs), 3)) == [(0, 1, 2), (3, 4, 5), (6, 7, 8)]
+
+
+def test_zip_split_stream_maxsize(monkeypatch):
+    """Test ittools.zip_split_stream raising on lagging outputs."""
+    monkeypatch.setattr(ittools.core, "_STREAM_GRACE", 0.01)
+    first, _second = ittools.zip_split_stream(count(), 2, maxsize=2)
+    assert [next(first), next(first), next(first)] == [0, 2, 4]
+    with pytest.raises(RuntimeError, match="output 1 lags more than 2 items"):
+        next(first)
+
+
+def _take(iterator, count):
+    """Return a list of the next count items of iterator."""
+    return [next(iterator) for _i in range(count)]
+
+
+def test_zip_split_stream_maxsize_worker(monkeypatch):
+    """Test ittools.zip_split_stream raising on lagging outputs in a thread."""
+    monkeypatch.setattr(ittools.core, "_STREAM_GRACE", 0.01)
+    first, _second = ittools.zip_split_stream(count(), 2, maxsize=2)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(_take, first, 3).result() == [0, 2, 4]
+        future = executor.submit(_take, first, 1)
+        with pytest.raises(RuntimeError, match="output 1 lags more than 2 items"):
+            future.result(timeout=10)
+
+
+def test_zip_split_stream_maxsize_finished_thread():
+    """Test ittools.zip_split_stream raising on outputs of finished threads."""
+    first, second = ittools.zip_split_stream(count(), 2, maxsize=2)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(_take, second, 1).result() == [1]
+    assert _take(first, 4) == [0, 2, 4, 6]
+    with pytest.raises(RuntimeError, match="output 1 lags more than 2 items"):
+        next(first)
+
+
+def test_zip_split_stream_maxsize_late_thread():
+    """Test ittools.zip_split_stream waiting for outputs yet to be read."""
+    first, second = ittools.zip_split_stream(count(), 2, maxsize=2)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(_take, first, 4)
+        time.sleep(0.1)
+        assert _take(second, 3) == [1, 3, 5]
+    assert future.result() == [0, 2, 4, 6]
+
+
+def _slow_list(iterable):
+    """Return a list of the items, sleeping between them."""
+    items = []
+    for item in iterable:
+        items.append(item)
+        time.sleep(1e-4)
+    return items
+
+
+def test_zip_split_stream_maxsize_threads():
+    """Test ittools.zip_split_stream waiting for outputs of other threads."""
+    first, second = ittools.zip_split_stream(iter(range(2000)), 2, maxsize=4)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(list, first), executor.submit(_slow_list, second)]
+    results = [future.result() for future in futures]
+    assert results == list(ittools.zip_split(list(range(2000)), 2))
+
+
+def test_zip_split_stream_threads():
+    """Test ittools.zip_split_stream outputs being consumed by threads."""
+    outputs = ittools.zip_split_stream(iter(range(10000)), 4)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(list, outputs))
+    assert results == list(ittools.zip_split(list(range(10000)), 4))
+
+
+# -------------- ittools.zip_split_into ------------------
+def test_zip_split_into():
+    """Test correct ittools.zip_split_into functionaility."""
+    shards = [[], [], []]
+    sinks = [shard.append for shard in shards]
+    assert ittools.zip_split_into((i for i in range(10)), sinks) == 10
+    assert shards == list(ittools.zip_split(list(range(10)), 3))
+    assert ittools.zip_split_into([], sinks) == 0
+
+
+def test_zip_split_into_queues():
+    """Test ittools.zip_split_into applying backpressure through queues."""
+    queues = [Queue(maxsize=2) for _i in range(2)]
+
+    def consume(queue):
+        return list(iter(queue.get, None))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(consume, queue) for queue in queues]
+        sinks = [queue.put for queue in queues]
+        ittools.zip_split_into(chain(range(100), [None, None]), sinks)
+        results = [future.result() for future in futures]
+
+    assert results == [list(range(0, 100, 2)), list(range(1, 100, 2))]
+
+
 # -------------- ittools.group ------------------
 def test_group():
     """Test correct ittools.group functionaility."""
     result = [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9, None, None)]
     assert list(ittools.group(range(10), chunks=3)) == result
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected_result"),
+    [
+        ({"size": 4}, [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9, None, None)]),
+        ({"size": 4, "pad": False}, [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9)]),
+        ({"size": 5, "pad": False}, [(0, 1, 2, 3, 4), (5, 6, 7, 8, 9)]),
+        ({"chunks": 3, "total": 10}, [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9, None, None)]),
+        (
+            {"chunks": 4, "total": 10, "pad": False},
+            [(0, 1, 2), (3, 4, 5), (6, 7, 8), (9,)],
+        ),
+        (
+            {"chunks": 2, "total": 10, "fillvalue": 0},
+            [(0, 1, 2, 3, 4), (5, 6, 7, 8, 9)],
+        ),
+    ],
+)
+def test_group_stream(kwargs, expected_result):
+    """Test correct ittools.group functionaility on unsized streams."""
+    assert list(ittools.group((i for i in range(10)), **kwargs)) == expected_result
+
+
+@pytest.mark.parametrize(
+    ("iterable", "kwargs", "expected_result"),
+    [
+        (
+            iter(range(10)),
+            {"chunks": 3},
+            [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9, None, None)],
+        ),
+        ([], {"chunks": 3}, []),
+        ([], {"chunks": 3, "pad": False}, []),
+        (range(3), {"size": 1, "fillvalue": 0}, [(0,), (1,), (2,)]),
+    ],
+)
+def test_group_length_hint(iterable, kwargs, expected_result):
+    """Test ittools.group using length hints and empty iterables."""
+    assert list(ittools.group(iterable, **kwargs)) == expected_result
+
+
+def test_group_stream_lazy():
+    """Test ittools.group pulling items from endless streams lazily."""
+    chunks = ittools.group(count(), size=3, pad=False)
+    assert list(islice(chunks, 2)) == [(0, 1, 2), (3, 4, 5)]
+
+
+@pytest.mark.parametrize(
+    ("iterable", "kwargs", "message"),
+    [
+        (range(10), {}, "either chunks or size"),
+        (range(10), {"chunks": 2, "size": 5}, "either chunks or size"),
+        ((i for i in range(10)), {"chunks": 2}, "pass total or size"),
+    ],
+)
+def test_group_invalid_arguments(iterable, kwargs, message):
+    """Test ittools.group raising on invalid arguments."""
+    with pytest.raises(TypeError, match=message):
+        ittools.group(iterable, **kwargs)
+
+
+# -------------- ittools.group_array ------------------
+@pytest.mark.parametrize(
+    ("length", "kwargs"),
+    [
+        (10, {"chunks": 3, "fillvalue": -1}),
+        (10, {"size": 4, "fillvalue": -1}),
+        (12, {"chunks": 3}),
+        (1, {"chunks": 3}),
+        (0, {"chunks": 3}),
+    ],
+)
+def test_group_array(length, kwargs):
+    """Test ittools.group_array matching ittools.group."""
+    result = ittools.group_array(np.arange(length), **kwargs)
+    assert result.dtype == np.arange(length).dtype
+    assert [tuple(row) for row in result.tolist()] == list(
+        ittools.group(range(length), **kwargs)
+    )
+
+
+def test_group_array_view():
+    """Test ittools.group_array not copying, if no padding is needed."""
+    data = np.arange(12)
+    assert np.shares_memory(ittools.group_array(data, size=4), data)
+    assert np.shares_memory(ittools.group_array(data, size=4, masked=True), data)
+
+
+@pytest.mark.parametrize(
+    ("data", "kwargs", "expected_result"),
+    [
+        (np.arange(5.0), {"size": 2}, [[0.0, 1.0], [2.0, 3.0], [4.0, np.nan]]),
+        (range(5), {"size": 2, "dtype": float}, [[0, 1], [2, 3], [4, np.nan]]),
+        ([1, 2, 3], {"size": 2, "fillvalue": 7}, [[1, 2], [3, 7]]),
+        (
+            np.array(["a", "b", "c"], dtype=object),
+            {"size": 2},
+            [["a", "b"], ["c", None]],
+        ),
+    ],
+)
+def test_group_array_padding(data, kwargs, expected_result):
+    """Test ittools.group_array padding with missing values."""
+    result = ittools.group_array(data, **kwargs)
+    np.testing.assert_array_equal(result, np.array(expected_result, dtype=result.dtype))
+
+
+def test_group_array_datetimes():
+    """Test ittools.group_array padding datetimes with NaT."""
+    for unit in ("datetime64[s]", "timedelta64[s]"):
+        result = ittools.group_array(np.arange(3).astype(unit), size=2)
+        assert result.dtype == np.dtype(unit)
+        assert np.isnat(result[1, 1])
+
+
+def test_group_array_masked():
+    """Test ittools.group_array masking the padding."""
+    data = np.arange(10).reshape(5, 2)
+    result = ittools.group_array(data, chunks=2, masked=True)
+    assert result.shape == (2, 3, 2)
+    assert result.dtype == data.dtype
+    assert result.mask[-1].tolist() == [[False, False], [False, False], [True, True]]
+    assert result.sum() == data.sum()
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "error", "message"),
+    [
+        ({}, TypeError, "either chunks or size"),
+        ({"chunks": 2, "size": 2}, TypeError, "either chunks or size"),
+        ({"size": 2}, ValueError, "pass a fillvalue or use masked=True"),
+    ],
+)
+def test_group_array_invalid_arguments(kwargs, error, message):
+    """Test ittools.group_array raising on invalid arguments."""
+    with pytest.raises(error, match=message):
+        ittools.group_array(np.arange(5), **kwargs)
+
+
+# -------------- ittools.window ------------------
+@pytest.mark.parametrize("length", [0, 2, 3, 10, 11])
+@pytest.mark.parametrize(("size", "step"), [(1, 1), (3, 1), (3, 2), (3, 3), (2, 4)])
+def test_window(length, size, step):
+    """Test ittools.window matching slicing of a list."""
+    data = list(range(length))
+    expected_result = [
+        tuple(data[start : start + size]) for start in range(0, length - size + 1, step)
+    ]
+    assert list(ittools.window(data, size, step)) == expected_result
+    assert list(ittools.window(iter(data), size, step)) == expected_result
+
+
+def test_window_lazy():
+    """Test ittools.window windowing unbounded iterators lazily."""
+    windows = ittools.window(count(), 3, step=2)
+    assert list(islice(windows, 3)) == [(0, 1, 2), (2, 3, 4), (4, 5, 6)]
+
+
+@pytest.mark.parametrize("length", [0, 3, 4, 9])
+@pytest.mark.parametrize(("size", "step"), [(1, 1), (4, 1), (4, 3), (2, 5)])
+def test_window_array(length, size, step):
+    """Test ittools.window returning views of arrays."""
+    data = np.arange(length * 2).reshape(length, 2)
+    result = ittools.window(data, size, step)
+    expected_result = [
+        data[start : start + size] for start in range(0, length - size + 1, step)
+    ]
+    assert result.shape == (len(expected_result), size, 2)
+    assert result.dtype == data.dtype
+    np.testing.assert_array_equal(
+        result, np.array(expected_result).reshape(result.shape)
+    )
+    if expected_result:
+        assert np.shares_memory(result, data)
+
+
+@pytest.mark.parametrize(("size", "step"), [(0, 1), (2, 0), (-1, -1)])
+def test_window_invalid(size, step):
+    """Test ittools.window raising on sizes and steps not positive."""
+    with pytest.raises(ValueError, match="must be positive"):
+        ittools.window([1, 2, 3], size, step)
+
+
+# -------------- ittools.Batcher ------------------
+@pytest.mark.parametrize(
+    ("items", "kwargs", "expected_result"),
+    [
+        (range(7), {"size": 3}, [[0, 1, 2], [3, 4, 5], [6]]),
+        (range(6), {"size": 3}, [[0, 1, 2], [3, 4, 5]]),
+        ([], {"size": 3}, []),
+        (
+            ["ab", "cde", "fg", "hijklmn", "o"],
+            {"size": 10, "max_weight": 6},
+            [["ab", "cde"], ["fg"], ["hijklmn"], ["o"]],
+        ),
+        (
+            [2, 2, 2, 2, 5],
+            {"size": 10, "max_weight": 4, "weigher": int},
+            [[2, 2], [2, 2], [5]],
+        ),
+    ],
+)
+def test_batcher(items, kwargs, expected_result):
+    """Test ittools.Batcher flushing by size and weight."""
+    batches = []
+    with ittools.Batcher(batches.append, latency=60, **kwargs) as batcher:
+        for item in items:
+            batcher.add(item)
+    assert batches == expected_result
+
+
+def test_batcher_latency():
+    """Test ittools.Batcher flushing incomplete batches after latency."""
+    batches = Queue()
+    with ittools.Batcher(batches.put, size=100, latency=0.05) as batcher:
+        batcher.add(1)
+        batcher.add(2)
+        assert batches.get(timeout=5) == [1, 2]
+        batcher.add(3)
+        assert batches.get(timeout=5) == [3]
+    assert batches.empty()
+
+
+def test_batcher_flush():
+    """Test ittools.Batcher flushing on demand."""
+    batches = Queue()
+    with ittools.Batcher(batches.put, size=100, latency=60) as batcher:
+        batcher.flush()  # nothing to flush
+        batcher.add(1)
+        batcher.flush()
+        assert batches.get(timeout=5) == [1]
+        batcher.add(2)
+    assert batches.get(timeout=5) == [2]
+
+
+def test_batcher_backpressure():
+    """Test ittools.Batcher blocking add while batches wait for flushing."""
+    release, flushed, added = threading.Event(), [], []
+
+    def slow_flush(batch):
+        release.wait(5)
+        flushed.append(batch)
+
+    batcher = ittools.Batcher(slow_flush, size=1, latency=60, max_pending=1)
+
+    def produce():
+        for item in range(5):
+            batcher.add(item)
+            added.append(item)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    producer.join(0.2)
+    assert producer.is_alive()
+    assert len(added) < 5
+    release.set()
+    producer.join(5)
+    batcher.close()
+    assert flushed == [[0], [1], [2], [3], [4]]
+
+
+def test_batcher_error():
+    """Test ittools.Batcher re-raising errors of flush."""
+
+    def failing(batch):
+        raise KeyError(batch)
+
+    batcher = ittools.Batcher(failing, size=1, latency=60)
+    batcher.add(1)
+    batcher._thread.join(5)  # pylint: disable=protected-access
+    with pytest.raises(KeyError):
+        batcher.add(2)
+    with pytest.raises(KeyError):
+        batcher.close()
+
+
+def test_batcher_closed():
+    """Test ittools.Batcher raising when adding after closing."""
+    batcher = ittools.Batcher(print, size=1, latency=60)
+    batcher.close()
+    with pytest.raises(RuntimeError, match="Batcher is closed"):
+        batcher.add(1)
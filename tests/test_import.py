@@ -0,0 +1,39 @@
+"""Test import related issues, like startup time and optional dependencies."""
+import subprocess  # noqa: S404
+import sys
+
+# generous budget in seconds for ``import ittools`` (pandas alone takes more)
+STARTUP_BUDGET = 0.1
+
+
+def _run(code):
+    """Run code in a fresh interpreter and return its stripped stdout."""
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return process.stdout.strip()
+
+
+def test_no_heavy_imports():
+    """Test ``import ittools`` not importing pandas or numpy."""
+    code = "import sys, ittools; print(sorted({'pandas', 'numpy'} & set(sys.modules)))"
+    assert _run(code) == "[]"
+
+
+def test_import_time():
+    """Test ``import ittools`` staying within the startup budget."""
+    code = (
+        "import time; start = time.perf_counter(); import ittools; "
+        "print(time.perf_counter() - start)"
+    )
+    # best of three, to be robust against hickups of the test machine
+    assert min(float(_run(code)) for _i in range(3)) < STARTUP_BUDGET
+
+
+def test_lazy_version():
+    """Test ``__version__`` being available, although determined lazily."""
+    assert _run("import ittools; print(ittools.__version__)") == "0.1.3"
+    assert _run("import ittools; print(hasattr(ittools, 'nope'))") == "False"
@@ -0,0 +1,134 @@
+"""Test instrumentation."""
+import threading
+
+import numpy as np
+import pytest
+
+import ittools
+from ittools import instrument
+
+
+@pytest.fixture(name="recorded")
+def fixture_recorded():
+    """Enable instrumentation, yielding the calls passed to the callback."""
+    calls = []
+    instrument.reset()
+    instrument.enable(callback=lambda name, record: calls.append((name, record)))
+    yield calls
+    instrument.disable()
+    instrument.reset()
+
+
+def test_disabled():
+    """Test nothing being recorded by default."""
+    instrument.reset()
+    ittools.depth([[1]])
+    list(ittools.group(range(4), size=2))
+    assert not instrument.snapshot()
+
+
+@pytest.mark.parametrize(
+    ("call", "name", "nodes"),
+    [
+        (lambda: ittools.depth([[1, 2], [3, [4]]]), "depth", 4),
+        (lambda: ittools.depth([[1, 2], [3, [4]]], limit=2), "depth", 2),
+        (lambda: ittools.depth([1, 2], limit=1), "depth", 1),
+        (lambda: ittools.depth(5), "depth", 0),
+        (lambda: ittools.nestify([[1], [2]], 4), "nestify", 3),
+        (lambda: ittools.is_empty([[], [[]], [[], [1]]]), "is_empty", 4),
+        (lambda: ittools.is_empty([[], [[]]]), "is_empty", 2),
+        (lambda: ittools.is_empty("no list"), "is_empty", 0),
+    ],
+)
+def test_nodes(recorded, call, name, nodes):
+    """Test recording the containers visited."""
+    call()
+    assert [call_name for call_name, _record in recorded] == [name]
+    assert recorded[0][1]["nodes"] == nodes
+    assert recorded[0][1]["seconds"] >= 0
+
+    stats = instrument.snapshot()
+    assert stats[name]["calls"] == 1
+    assert stats[name]["nodes"] == nodes
+
+
+@pytest.mark.parametrize(
+    ("call", "name", "items"),
+    [
+        (lambda: ittools.group(range(10), size=3), "group", 4),
+        (lambda: ittools.group(iter(range(10)), size=3, pad=False), "group", 4),
+        (lambda: ittools.window(range(10), size=3, step=2), "window", 4),
+        (lambda: ittools.zip_split(list(range(10)), 3), "zip_split", 3),
+        (lambda: ittools.zip_split(np.arange(10), 2, copy=False), "zip_split", 2),
+    ],
+)
+def test_items(recorded, call, name, items):
+    """Test recording the items produced by iterators once exhausted."""
+    iterator = call()
+    assert not recorded
+    list(iterator)
+    assert recorded == [(name, {"items": items, "seconds": recorded[0][1]["seconds"]})]
+
+    stats = instrument.snapshot()[name]
+    assert stats["items"] == items
+    assert stats["items_per_second"] > 0
+
+
+def test_items_closed(recorded):
+    """Test recording iterators that are closed before being exhausted."""
+    chunks = ittools.group(range(10), size=2)
+    next(chunks)
+    chunks.close()
+    assert recorded[0][1]["items"] == 1
+
+
+def test_snapshot_totals(recorded):
+    """Test summing up the metrics of several calls."""
+    ittools.depth([[1]])
+    ittools.depth([[[1]]])
+    assert len(recorded) == 2
+    stats = instrument.snapshot()
+    assert stats["depth"]["calls"] == 2
+    assert stats["depth"]["nodes"] == 5
+    assert stats["depth"]["seconds"] == sum(rec["seconds"] for _, rec in recorded)
+
+    stats["depth"]["calls"] = 0  # snapshots are copies
+    assert instrument.snapshot()["depth"]["calls"] == 2
+
+    instrument.reset()
+    assert not instrument.snapshot()
+
+
+def test_no_callback():
+    """Test recording without callback and keeping metrics when disabled."""
+    instrument.reset()
+    instrument.enable()
+    try:
+        ittools.depth([1])
+    finally:
+        instrument.disable()
+    ittools.depth([1])
+    assert instrument.snapshot()["depth"]["calls"] == 1
+    instrument.reset()
+
+
+def test_exceptions(recorded):
+    """Test recording calls raising exceptions."""
+    with pytest.raises(TypeError):
+        ittools.nestify([1, 2], 3, set)
+    assert recorded[0][0] == "nestify"
+
+
+def test_threads(recorded):
+    """Test recording calls from several threads."""
+
+    def measure():
+        for _ in range(100):
+            ittools.depth([[1]])
+
+    threads = [threading.Thread(target=measure) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert instrument.snapshot()["depth"]["calls"] == len(recorded) == 400
@@ -0,0 +1,106 @@
+"""Test parallel chunk execution."""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import ittools
+from ittools.parallel import parallel_map_chunks
+
+
+def _double(chunk):
+    """Double each element of a chunk."""
+    return [2 * element for element in chunk]
+
+
+def _identity(chunk):
+    """Return the chunk itself (a view, if shared)."""
+    return chunk
+
+
+def _first(chunk):
+    """Return only the first element of a chunk."""
+    return list(chunk[:1])
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+@pytest.mark.parametrize("split", ["group", "zip"])
+@pytest.mark.parametrize("length", [0, 1, 10, 11])
+def test_parallel_map_chunks(executor, split, length):
+    """Test ittools.parallel_map_chunks keeping the element order."""
+    result = parallel_map_chunks(
+        _double, list(range(length)), 3, executor=executor, split=split
+    )
+    assert result == [2 * i for i in range(length)]
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+@pytest.mark.parametrize("split", ["group", "zip"])
+@pytest.mark.parametrize("func", [np.negative, _identity])
+def test_parallel_map_chunks_arrays(executor, split, func):
+    """Test ittools.parallel_map_chunks on arrays (using shared memory)."""
+    data = np.arange(22, dtype=float).reshape(11, 2)
+    result = parallel_map_chunks(func, data, 4, executor=executor, split=split)
+    assert isinstance(result, np.ndarray)
+    np.testing.assert_array_equal(result, func(data))
+    assert not np.shares_memory(result, data) or executor == "thread"
+
+
+def test_parallel_map_chunks_object_arrays():
+    """Test ittools.parallel_map_chunks pickling object arrays."""
+    data = np.array(["a", "b", "c"], dtype=object)
+    assert parallel_map_chunks(_double, data, 2) == ["aa", "bb", "cc"]
+
+
+def test_parallel_map_chunks_iterables():
+    """Test ittools.parallel_map_chunks materializing plain iterables."""
+    data = (i for i in range(7))
+    assert parallel_map_chunks(_double, data, 3, "thread", "zip") == _double(range(7))
+
+
+def test_parallel_map_chunks_executor():
+    """Test ittools.parallel_map_chunks using an existing executor."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert parallel_map_chunks(_double, [1, 2, 3], 2, executor) == [2, 4, 6]
+        assert executor.submit(int, "1").result() == 1  # still usable
+
+
+def test_parallel_map_chunks_exported():
+    """Test ittools.parallel_map_chunks being exported."""
+    assert ittools.parallel_map_chunks is parallel_map_chunks
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"split": "round-robin"}, "split must be one of"),
+        ({"executor": "gpu"}, "executor must be one of"),
+        ({"split": "zip", "executor": "thread"}, "don't match the chunk lengths"),
+        ({"executor": "thread"}, "don't match the chunk lengths"),
+    ],
+)
+def test_parallel_map_chunks_invalid(kwargs, message):
+    """Test ittools.parallel_map_chunks raising on invalid arguments."""
+    with pytest.raises(ValueError, match=message):
+        parallel_map_chunks(_first, list(range(10)), 2, **kwargs)
+
+
+def test_map_shared_chunk():
+    """Test workers reading their chunk from shared memory."""
+    # pylint: disable=import-outside-toplevel,protected-access
+    from multiprocessing.shared_memory import SharedMemory
+
+    from ittools.parallel import _map_shared_chunk
+
+    data = np.arange(10)
+    memory = SharedMemory(create=True, size=data.nbytes)
+    try:
+        np.ndarray(data.shape, data.dtype, buffer=memory.buf)[...] = data
+        args = (memory.name, data.shape, data.dtype, slice(1, None, 3))
+        assert _map_shared_chunk(_double, *args) == [2, 8, 14]
+        assert _map_shared_chunk(_identity, *args).tolist() == [1, 4, 7]
+        with pytest.raises(ZeroDivisionError):
+            _map_shared_chunk(lambda chunk: 1 / 0, *args)
+    finally:
+        memory.close()
+        memory.unlink()